@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Backend Benchmark (raw sqlite3 vs SQLAlchemy vs peewee)
+
+Measures what each layer in lesson9_backends.py costs on top of the raw
+sqlite3 driver:
+
+    - Per-call overhead: median microseconds for common lesson 9 calls
+    - Memory: peak Python allocations (tracemalloc) for one call
+    - Batch writes: characters per second through add_multiple_characters()
+
+Every backend runs against its own temporary copy of the database, so the
+benchmark never changes database/starwars.db.
+
+Usage:
+    python solutions/lesson9_backend_benchmark.py
+    python solutions/lesson9_backend_benchmark.py --backends raw orm --repeat 500
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from lesson9_backends import BACKENDS, get_backend
+
+
+def pick_sample_character(db_path: str) -> str:
+    """Use the character with the most vehicles so the report has joins to do."""
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute(
+            """
+            SELECT c.name
+            FROM characters c
+            LEFT JOIN character_vehicles cv ON cv.character_id = c.id
+            GROUP BY c.id
+            ORDER BY COUNT(cv.vehicle_id) DESC, c.id
+            LIMIT 1
+        """
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else "Luke Skywalker"
+
+
+def time_call(function: Callable, repeat: int) -> float:
+    """Median microseconds per call (after one warm-up call)."""
+    function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1_000_000
+
+
+def peak_memory(function: Callable) -> int:
+    """Peak bytes allocated by Python while running one call."""
+    function()  # warm caches (compiled statements, reflected models...)
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def batch_throughput(backend, rows: int, batches: int) -> float:
+    """Characters inserted per second through add_multiple_characters()."""
+    total = 0.0
+    for batch in range(batches):
+        characters = [
+            (f"Bench-{backend.name}-{batch}-{n}", "Human", "Tatooine", 170, "Neutral")
+            for n in range(rows)
+        ]
+        started = time.perf_counter()
+        backend.add_multiple_characters(characters)
+        total += time.perf_counter() - started
+        backend.delete_characters_by_affiliation("Neutral")
+    return rows * batches / total
+
+
+def benchmark_backend(name: str, db_path: str, repeat: int, rows: int) -> Dict:
+    """
+    Run every measurement for one backend on a private copy of the database.
+
+    Returns:
+        Dictionary of results for the report table
+    """
+    workdir = tempfile.mkdtemp(prefix=f"lesson9_{name}_")
+    copy = os.path.join(workdir, "starwars.db")
+    shutil.copyfile(db_path, copy)
+    character = pick_sample_character(copy)
+
+    started = time.perf_counter()
+    backend = get_backend(name, copy)
+    setup_ms = (time.perf_counter() - started) * 1000
+
+    calls = {
+        "by_name": lambda: backend.get_character_by_name(character),
+        "search": lambda: backend.search_characters(species="Human"),
+        "vehicles": lambda: backend.get_character_vehicles(character),
+        "report": lambda: backend.challenge_character_report(character),
+    }
+
+    try:
+        # The raw lesson 9 helpers print ✓ messages on every write
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = {"backend": name, "setup_ms": setup_ms}
+            for label, function in calls.items():
+                result[f"{label}_us"] = time_call(function, repeat)
+            result["report_kib"] = peak_memory(calls["report"]) / 1024
+            result["writes_per_s"] = batch_throughput(backend, rows, batches=3)
+    finally:
+        backend.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return result
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print a comparison table, with each call also shown relative to raw."""
+    raw = next((r for r in results if r["backend"] == "raw"), None)
+    columns = ["by_name_us", "search_us", "vehicles_us", "report_us"]
+
+    print("\n⏱️  Median time per call (µs), x = slower than raw sqlite3")
+    print(
+        f"{'Backend':<8} {'Setup ms':>9} "
+        + " ".join(f"{c[:-3]:>16}" for c in columns)
+        + f" {'Report KiB':>11} {'Writes/s':>10}"
+    )
+    for r in results:
+        cells = []
+        for column in columns:
+            ratio = f"(x{r[column] / raw[column]:.1f})" if raw else ""
+            cells.append(f"{r[column]:>8.1f} {ratio:>7}")
+        print(
+            f"{r['backend']:<8} {r['setup_ms']:>9.1f} "
+            + " ".join(cells)
+            + f" {r['report_kib']:>11.1f} {r['writes_per_s']:>10,.0f}"
+        )
+
+
+def main():
+    """Handle command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare lesson 9 backends against the raw sqlite3 driver"
+    )
+    parser.add_argument("--db", default="database/starwars.db", help="Database path")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=BACKENDS,
+        default=list(BACKENDS),
+        help="Backends to compare (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls each")
+    parser.add_argument(
+        "--rows", type=int, default=2000, help="Characters per write batch"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"✗ Database not found: {args.db}")
+        sys.exit(1)
+
+    results = []
+    for name in args.backends:
+        try:
+            results.append(benchmark_backend(name, args.db, args.repeat, args.rows))
+            print(f"✓ {name} done")
+        except ImportError as e:
+            print(f"✗ Skipping {name}: {e}")
+
+    if results:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
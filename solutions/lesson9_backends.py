@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Pluggable Backends (raw sqlite3, SQLAlchemy, peewee)
+
+Lesson 10 compares SQL with ORMs. This module makes that comparison
+concrete: the SAME lesson 9 functions implemented four ways.
+
+    raw       the original functions from lesson9_database.py (sqlite3)
+    core      SQLAlchemy Core - SQL expressions, no objects
+    orm       SQLAlchemy ORM - mapped classes, identity map and eager loading
+    peewee    peewee models generated from the existing tables
+
+Every backend has the same methods (the lesson 9 names, without the conn
+argument) and returns the same shapes - tuples for rows and a dictionary
+for challenge_character_report() - so they can be swapped freely:
+
+    backend = get_backend("orm", "database/starwars.db")
+    print(backend.challenge_character_report("Luke Skywalker"))
+    backend.close()
+
+The tables are REFLECTED from the database rather than declared here, so
+extra columns added during the lessons (height_category, planet_id...) are
+picked up automatically.
+
+See lesson9_backend_benchmark.py to measure the cost of each layer.
+"""
+
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import lesson9_database
+
+BACKENDS = ("raw", "core", "orm", "peewee")
+
+CHARACTER_INSERT_COLUMNS = ("name", "species", "homeworld", "height", "affiliation")
+
+
+# ============================================
+# Raw sqlite3 (the original lesson 9 functions)
+# ============================================
+
+
+class RawBackend:
+    """Calls the lesson9_database.py functions on one sqlite3 connection."""
+
+    name = "raw"
+
+    def __init__(self, db_path: str):
+        self.conn = sqlite3.connect(db_path)
+
+    def __getattr__(self, attribute: str):
+        function = getattr(lesson9_database, attribute)
+        return lambda *args, **kwargs: function(self.conn, *args, **kwargs)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ============================================
+# SQLAlchemy Core
+# ============================================
+
+
+class CoreBackend:
+    """The lesson 9 functions written with SQLAlchemy Core expressions."""
+
+    name = "core"
+
+    def __init__(self, db_path: str):
+        from sqlalchemy import Column, Integer, MetaData, Table, create_engine
+
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        self.metadata = MetaData()
+        # SQLite reports the INTEGER PRIMARY KEY as nullable, which stops the
+        # ORM batching inserts - declare it, reflect everything else
+        Table(
+            "characters",
+            self.metadata,
+            Column("id", Integer, primary_key=True),
+            autoload_with=self.engine,
+        )
+        self.metadata.reflect(self.engine)
+        tables = self.metadata.tables
+        self.characters = tables["characters"]
+        self.planets = tables.get("planets")
+        self.vehicles = tables.get("vehicles")
+        self.character_vehicles = tables.get("character_vehicles")
+
+    def _fetch(self, statement) -> List[Tuple]:
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(statement)]
+
+    def get_all_characters(self) -> List[Tuple]:
+        from sqlalchemy import select
+
+        return self._fetch(select(self.characters))
+
+    def get_character_by_name(self, name: str) -> Optional[Tuple]:
+        from sqlalchemy import select
+
+        rows = self._fetch(
+            select(self.characters).where(self.characters.c.name == name).limit(1)
+        )
+        return rows[0] if rows else None
+
+    def get_characters_by_species(self, species: str) -> List[Tuple]:
+        from sqlalchemy import select
+
+        return self._fetch(
+            select(self.characters).where(self.characters.c.species == species)
+        )
+
+    def search_characters(
+        self,
+        species: Optional[str] = None,
+        affiliation: Optional[str] = None,
+        min_height: Optional[int] = None,
+    ) -> List[Tuple]:
+        from sqlalchemy import select
+
+        c = self.characters.c
+        statement = select(self.characters)
+        if species:
+            statement = statement.where(c.species == species)
+        if affiliation:
+            statement = statement.where(c.affiliation == affiliation)
+        if min_height:
+            statement = statement.where(c.height >= min_height)
+        return self._fetch(statement)
+
+    def get_tall_characters(self, min_height: int) -> List[Tuple]:
+        from sqlalchemy import select
+
+        c = self.characters.c
+        return self._fetch(
+            select(c.name, c.species, c.height)
+            .where(c.height >= min_height)
+            .order_by(c.height.desc())
+        )
+
+    def add_character(
+        self,
+        name: str,
+        species: str,
+        homeworld: str,
+        height: Optional[int] = None,
+        affiliation: Optional[str] = None,
+    ) -> int:
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                self.characters.insert().values(
+                    name=name,
+                    species=species,
+                    homeworld=homeworld,
+                    height=height,
+                    affiliation=affiliation,
+                )
+            )
+            return result.inserted_primary_key[0]
+
+    def add_multiple_characters(self, characters: List[Tuple]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                self.characters.insert(),
+                [dict(zip(CHARACTER_INSERT_COLUMNS, row)) for row in characters],
+            )
+
+    def _update(self, name: str, **values) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                self.characters.update()
+                .where(self.characters.c.name == name)
+                .values(**values)
+            )
+
+    def update_character_affiliation(self, name: str, new_affiliation: str) -> None:
+        self._update(name, affiliation=new_affiliation)
+
+    def update_character_height(self, name: str, new_height: int) -> None:
+        self._update(name, height=new_height)
+
+    def delete_character(self, name: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(self.characters.delete().where(self.characters.c.name == name))
+
+    def delete_characters_by_affiliation(self, affiliation: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                self.characters.delete().where(
+                    self.characters.c.affiliation == affiliation
+                )
+            )
+
+    def get_characters_with_planets(self) -> List[Tuple]:
+        from sqlalchemy import select
+
+        c, p = self.characters.c, self.planets.c
+        return self._fetch(
+            select(c.name, c.species, p.name, p.climate)
+            .join_from(self.characters, self.planets, c.planet_id == p.id)
+            .order_by(c.name)
+        )
+
+    def _vehicles_statement(self, character_name: str, *columns):
+        from sqlalchemy import select
+
+        c, v, cv = self.characters.c, self.vehicles.c, self.character_vehicles.c
+        return (
+            select(*columns)
+            .join_from(self.vehicles, self.character_vehicles, v.id == cv.vehicle_id)
+            .join(self.characters, cv.character_id == c.id)
+            .where(c.name == character_name)
+        )
+
+    def get_character_vehicles(self, character_name: str) -> List[Tuple]:
+        v = self.vehicles.c
+        return self._fetch(
+            self._vehicles_statement(
+                character_name, v.name, v.vehicle_class, v.cost_in_credits
+            ).order_by(v.name)
+        )
+
+    def get_species_statistics(self) -> List[Tuple]:
+        from sqlalchemy import func, select
+
+        c = self.characters.c
+        count = func.count().label("count")
+        return self._fetch(
+            select(c.species, count, func.round(func.avg(c.height), 1))
+            .where(c.height.is_not(None))
+            .group_by(c.species)
+            .order_by(count.desc())
+        )
+
+    def get_affiliation_summary(self) -> List[Tuple]:
+        from sqlalchemy import func, select
+
+        c = self.characters.c
+        count = func.count().label("member_count")
+        return self._fetch(
+            select(c.affiliation, count)
+            .where(c.affiliation.is_not(None))
+            .group_by(c.affiliation)
+            .order_by(count.desc())
+        )
+
+    def challenge_character_report(self, character_name: str) -> dict:
+        from sqlalchemy import func, select
+
+        c, p, v = self.characters.c, self.planets.c, self.vehicles.c
+        with self.engine.connect() as conn:
+            basic_info = conn.execute(
+                select(
+                    c.name,
+                    c.species,
+                    c.height,
+                    c.affiliation,
+                    p.name,
+                    p.climate,
+                    p.terrain,
+                    p.population,
+                )
+                .join_from(
+                    self.characters, self.planets, c.planet_id == p.id, isouter=True
+                )
+                .where(c.name == character_name)
+                .limit(1)
+            ).first()
+            if not basic_info:
+                return {"error": f"Character '{character_name}' not found"}
+
+            vehicles = conn.execute(
+                self._vehicles_statement(
+                    character_name, v.name, v.model, v.vehicle_class, v.cost_in_credits
+                ).order_by(v.name)
+            ).all()
+            species_stats = conn.execute(
+                select(
+                    func.count(),
+                    func.avg(c.height),
+                    func.max(c.height),
+                    func.min(c.height),
+                ).where(c.species == basic_info[1], c.height.is_not(None))
+            ).one()
+
+        return lesson9_database.build_report(
+            tuple(basic_info), [tuple(r) for r in vehicles], species_stats
+        )
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+# ============================================
+# SQLAlchemy ORM
+# ============================================
+
+
+class OrmBackend(CoreBackend):
+    """
+    The lesson 9 functions written with SQLAlchemy ORM classes.
+
+    Reads go through mapped Character objects (then back to tuples, so the
+    results match the other backends). challenge_character_report() eager
+    loads the planet and vehicles in the same round trip.
+    """
+
+    name = "orm"
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        from sqlalchemy.orm import (
+            declarative_base,
+            foreign,
+            relationship,
+            sessionmaker,
+        )
+
+        Base = declarative_base()
+        # Not named "vehicles": the class body below assigns that name
+        characters, planets = self.characters, self.planets
+        vehicle_table, character_vehicles = self.vehicles, self.character_vehicles
+
+        class Planet(Base):
+            __table__ = planets
+
+        class Vehicle(Base):
+            __table__ = vehicle_table
+
+        class Character(Base):
+            __table__ = characters
+            # planet_id was added with ALTER TABLE, so it has no FOREIGN KEY -
+            # the join condition is spelled out instead
+            planet = relationship(
+                Planet,
+                primaryjoin=foreign(characters.c.planet_id) == planets.c.id,
+                viewonly=True,
+            )
+            vehicles = relationship(
+                Vehicle,
+                secondary=character_vehicles,
+                primaryjoin=characters.c.id == character_vehicles.c.character_id,
+                secondaryjoin=vehicle_table.c.id == character_vehicles.c.vehicle_id,
+                order_by=vehicle_table.c.name,
+                viewonly=True,
+            )
+
+        self.Character, self.Planet, self.Vehicle = Character, Planet, Vehicle
+        self.Session = sessionmaker(self.engine, expire_on_commit=False)
+        self.column_names = [column.key for column in characters.columns]
+
+    def _as_tuple(self, character) -> Tuple:
+        return tuple(getattr(character, name) for name in self.column_names)
+
+    def _characters(self, *criteria, order_by=None) -> List[Tuple]:
+        from sqlalchemy import select
+
+        statement = select(self.Character).where(*criteria)
+        if order_by is not None:
+            statement = statement.order_by(order_by)
+        with self.Session() as session:
+            return [self._as_tuple(c) for c in session.scalars(statement)]
+
+    def get_all_characters(self) -> List[Tuple]:
+        return self._characters()
+
+    def get_character_by_name(self, name: str) -> Optional[Tuple]:
+        rows = self._characters(self.Character.name == name)
+        return rows[0] if rows else None
+
+    def get_characters_by_species(self, species: str) -> List[Tuple]:
+        return self._characters(self.Character.species == species)
+
+    def search_characters(
+        self,
+        species: Optional[str] = None,
+        affiliation: Optional[str] = None,
+        min_height: Optional[int] = None,
+    ) -> List[Tuple]:
+        Character = self.Character
+        criteria = []
+        if species:
+            criteria.append(Character.species == species)
+        if affiliation:
+            criteria.append(Character.affiliation == affiliation)
+        if min_height:
+            criteria.append(Character.height >= min_height)
+        return self._characters(*criteria)
+
+    def add_character(
+        self,
+        name: str,
+        species: str,
+        homeworld: str,
+        height: Optional[int] = None,
+        affiliation: Optional[str] = None,
+    ) -> int:
+        with self.Session.begin() as session:
+            character = self.Character(
+                name=name,
+                species=species,
+                homeworld=homeworld,
+                height=height,
+                affiliation=affiliation,
+            )
+            session.add(character)
+            session.flush()
+            return character.id
+
+    def add_multiple_characters(self, characters: List[Tuple]) -> None:
+        with self.Session.begin() as session:
+            session.add_all(
+                self.Character(**dict(zip(CHARACTER_INSERT_COLUMNS, row)))
+                for row in characters
+            )
+
+    def _update(self, name: str, **values) -> None:
+        from sqlalchemy import select
+
+        with self.Session.begin() as session:
+            for character in session.scalars(
+                select(self.Character).where(self.Character.name == name)
+            ):
+                for key, value in values.items():
+                    setattr(character, key, value)
+
+    def delete_character(self, name: str) -> None:
+        from sqlalchemy import select
+
+        with self.Session.begin() as session:
+            for character in session.scalars(
+                select(self.Character).where(self.Character.name == name)
+            ):
+                session.delete(character)
+
+    def challenge_character_report(self, character_name: str) -> dict:
+        from sqlalchemy import func, select
+        from sqlalchemy.orm import joinedload, selectinload
+
+        Character = self.Character
+        with self.Session() as session:
+            character = session.scalars(
+                select(Character)
+                .options(joinedload(Character.planet), selectinload(Character.vehicles))
+                .where(Character.name == character_name)
+                .limit(1)
+            ).first()
+            if character is None:
+                return {"error": f"Character '{character_name}' not found"}
+
+            species_stats = session.execute(
+                select(
+                    func.count(),
+                    func.avg(Character.height),
+                    func.max(Character.height),
+                    func.min(Character.height),
+                ).where(
+                    Character.species == character.species,
+                    Character.height.is_not(None),
+                )
+            ).one()
+
+            planet = character.planet
+            basic_info = (
+                character.name,
+                character.species,
+                character.height,
+                character.affiliation,
+                planet.name if planet else None,
+                planet.climate if planet else None,
+                planet.terrain if planet else None,
+                planet.population if planet else None,
+            )
+            vehicles = [
+                (v.name, v.model, v.vehicle_class, v.cost_in_credits)
+                for v in character.vehicles
+            ]
+
+        return lesson9_database.build_report(basic_info, vehicles, species_stats)
+
+
+# ============================================
+# peewee
+# ============================================
+
+
+class PeeweeBackend:
+    """The lesson 9 functions written with peewee models."""
+
+    name = "peewee"
+
+    def __init__(self, db_path: str):
+        from peewee import SqliteDatabase
+        from playhouse.reflection import generate_models
+
+        self.db = SqliteDatabase(db_path)
+        self.db.connect()
+        models = generate_models(self.db)
+        self.Character = models["characters"]
+        self.Planet = models.get("planets")
+        self.Vehicle = models.get("vehicles")
+        self.CharacterVehicle = models.get("character_vehicles")
+
+    def _vehicle_query(self, character_name: str, *fields):
+        Character, Vehicle, CharacterVehicle = (
+            self.Character,
+            self.Vehicle,
+            self.CharacterVehicle,
+        )
+        # Junction columns may be reflected as foreign keys or plain integers
+        link_vehicle = getattr(CharacterVehicle, "vehicle_id", None) or getattr(
+            CharacterVehicle, "vehicle"
+        )
+        link_character = getattr(CharacterVehicle, "character_id", None) or getattr(
+            CharacterVehicle, "character"
+        )
+        return (
+            Vehicle.select(*fields)
+            .join(CharacterVehicle, on=(Vehicle.id == link_vehicle))
+            .join(Character, on=(link_character == Character.id))
+            .where(Character.name == character_name)
+        )
+
+    def get_all_characters(self) -> List[Tuple]:
+        return list(self.Character.select().tuples())
+
+    def get_character_by_name(self, name: str) -> Optional[Tuple]:
+        return (
+            self.Character.select().where(self.Character.name == name).tuples().first()
+        )
+
+    def get_characters_by_species(self, species: str) -> List[Tuple]:
+        return list(
+            self.Character.select().where(self.Character.species == species).tuples()
+        )
+
+    def search_characters(
+        self,
+        species: Optional[str] = None,
+        affiliation: Optional[str] = None,
+        min_height: Optional[int] = None,
+    ) -> List[Tuple]:
+        Character = self.Character
+        query = Character.select()
+        if species:
+            query = query.where(Character.species == species)
+        if affiliation:
+            query = query.where(Character.affiliation == affiliation)
+        if min_height:
+            query = query.where(Character.height >= min_height)
+        return list(query.tuples())
+
+    def get_tall_characters(self, min_height: int) -> List[Tuple]:
+        Character = self.Character
+        return list(
+            Character.select(Character.name, Character.species, Character.height)
+            .where(Character.height >= min_height)
+            .order_by(Character.height.desc())
+            .tuples()
+        )
+
+    def add_character(
+        self,
+        name: str,
+        species: str,
+        homeworld: str,
+        height: Optional[int] = None,
+        affiliation: Optional[str] = None,
+    ) -> int:
+        with self.db.atomic():
+            return self.Character.insert(
+                name=name,
+                species=species,
+                homeworld=homeworld,
+                height=height,
+                affiliation=affiliation,
+            ).execute()
+
+    def add_multiple_characters(self, characters: List[Tuple]) -> None:
+        with self.db.atomic():
+            self.Character.insert_many(
+                characters,
+                fields=[getattr(self.Character, c) for c in CHARACTER_INSERT_COLUMNS],
+            ).execute()
+
+    def update_character_affiliation(self, name: str, new_affiliation: str) -> None:
+        with self.db.atomic():
+            self.Character.update(affiliation=new_affiliation).where(
+                self.Character.name == name
+            ).execute()
+
+    def update_character_height(self, name: str, new_height: int) -> None:
+        with self.db.atomic():
+            self.Character.update(height=new_height).where(
+                self.Character.name == name
+            ).execute()
+
+    def delete_character(self, name: str) -> None:
+        with self.db.atomic():
+            self.Character.delete().where(self.Character.name == name).execute()
+
+    def delete_characters_by_affiliation(self, affiliation: str) -> None:
+        with self.db.atomic():
+            self.Character.delete().where(
+                self.Character.affiliation == affiliation
+            ).execute()
+
+    def get_characters_with_planets(self) -> List[Tuple]:
+        Character, Planet = self.Character, self.Planet
+        return list(
+            Character.select(
+                Character.name, Character.species, Planet.name, Planet.climate
+            )
+            .join(Planet, on=(Character.planet_id == Planet.id))
+            .order_by(Character.name)
+            .tuples()
+        )
+
+    def get_character_vehicles(self, character_name: str) -> List[Tuple]:
+        Vehicle = self.Vehicle
+        return list(
+            self._vehicle_query(
+                character_name,
+                Vehicle.name,
+                Vehicle.vehicle_class,
+                Vehicle.cost_in_credits,
+            )
+            .order_by(Vehicle.name)
+            .tuples()
+        )
+
+    def get_species_statistics(self) -> List[Tuple]:
+        from peewee import SQL, fn
+
+        Character = self.Character
+        return list(
+            Character.select(
+                Character.species,
+                fn.COUNT(SQL("*")).alias("count"),
+                fn.ROUND(fn.AVG(Character.height), 1),
+            )
+            .where(Character.height.is_null(False))
+            .group_by(Character.species)
+            .order_by(SQL("count").desc())
+            .tuples()
+        )
+
+    def get_affiliation_summary(self) -> List[Tuple]:
+        from peewee import SQL, fn
+
+        Character = self.Character
+        return list(
+            Character.select(
+                Character.affiliation, fn.COUNT(SQL("*")).alias("member_count")
+            )
+            .where(Character.affiliation.is_null(False))
+            .group_by(Character.affiliation)
+            .order_by(SQL("member_count").desc())
+            .tuples()
+        )
+
+    def challenge_character_report(self, character_name: str) -> dict:
+        from peewee import JOIN, fn
+
+        Character, Planet, Vehicle = self.Character, self.Planet, self.Vehicle
+        basic_info = (
+            Character.select(
+                Character.name,
+                Character.species,
+                Character.height,
+                Character.affiliation,
+                Planet.name,
+                Planet.climate,
+                Planet.terrain,
+                Planet.population,
+            )
+            .join(Planet, JOIN.LEFT_OUTER, on=(Character.planet_id == Planet.id))
+            .where(Character.name == character_name)
+            .tuples()
+            .first()
+        )
+        if not basic_info:
+            return {"error": f"Character '{character_name}' not found"}
+
+        vehicles = list(
+            self._vehicle_query(
+                character_name,
+                Vehicle.name,
+                Vehicle.model,
+                Vehicle.vehicle_class,
+                Vehicle.cost_in_credits,
+            )
+            .order_by(Vehicle.name)
+            .tuples()
+        )
+        species_stats = (
+            Character.select(
+                fn.COUNT(Character.id),
+                fn.AVG(Character.height),
+                fn.MAX(Character.height),
+                fn.MIN(Character.height),
+            )
+            .where(
+                (Character.species == basic_info[1]) & Character.height.is_null(False)
+            )
+            .tuples()
+            .first()
+        )
+        return lesson9_database.build_report(basic_info, vehicles, species_stats)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def get_backend(name: str, db_path: str = "database/starwars.db"):
+    """
+    Create a backend by name.
+
+    Args:
+        name: One of "raw", "core", "orm" or "peewee"
+        db_path: Path to the database file
+
+    Returns:
+        Backend object with the lesson 9 functions as methods
+    """
+    classes: Dict[str, type] = {
+        "raw": RawBackend,
+        "core": CoreBackend,
+        "orm": OrmBackend,
+        "peewee": PeeweeBackend,
+    }
+    if name not in classes:
+        raise ValueError(f"Unknown backend {name!r}; choose from {BACKENDS}")
+    return classes[name](db_path)
@@ -600,6 +600,7 @@ def challenge_character_report(conn: sqlite3.Connection, character_name: str) ->
         INNER JOIN character_vehicles cv ON v.id = cv.vehicle_id
         INNER JOIN characters c ON cv.character_id = c.id
         WHERE c.name = ?
+        ORDER BY v.name
     """,
         (character_name,),
     )
@@ -647,6 +648,38 @@ def challenge_character_report(conn: sqlite3.Connection, character_name: str) ->
     return report
 
 
+def _species_statistics(row: Tuple) -> dict:
+    """Shape a (count, avg, max, min) row like challenge_character_report()."""
+    return {
+        "total_members": row[0],
+        "average_height": round(row[1], 1) if row[1] else None,
+        "tallest": row[2],
+        "shortest": row[3],
+    }
+
+
+def build_report(
+    basic_info: Tuple, vehicles: List[Tuple], species_stats: Tuple
+) -> dict:
+    """Build the report dictionary exactly as challenge_character_report() does."""
+    return {
+        "name": basic_info[0],
+        "species": basic_info[1],
+        "height": basic_info[2],
+        "affiliation": basic_info[3],
+        "homeworld": {
+            "name": basic_info[4],
+            "climate": basic_info[5],
+            "terrain": basic_info[6],
+            "population": basic_info[7],
+        },
+        "vehicles": [
+            {"name": v[0], "model": v[1], "class": v[2], "cost": v[3]} for v in vehicles
+        ],
+        "species_statistics": _species_statistics(species_stats),
+    }
+
+
 def print_character_report(report: dict) -> None:
     """Print the character report in a readable format."""
     if "error" in report:
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Dimension-Table Cache (Join Elimination)
+
+planets and vehicles are small "dimension" tables that hardly ever change,
+yet get_characters_with_planets(), get_character_vehicles() and
+challenge_character_report() JOIN them on every call.
+
+This module loads both tables into dictionaries once. The functions below
+then read only character rows and foreign keys (planet_id, vehicle_id) from
+SQLite and fill in the planet and vehicle details with a dictionary lookup
+- the JOIN is eliminated.
+
+The cache reloads itself when the database changes (PRAGMA data_version
+for other connections' commits, total_changes for this connection's).
+Reloading is cheap precisely because the tables are small. Checking costs
+about as much as the lookups save, so group calls in a batch to check once:
+
+    with cache.batch():
+        reports = [challenge_character_report(conn, n, cache) for n in names]
+
+Each function returns exactly what the lesson9_database.py version does.
+Pass cache=None, or set cache.enabled = False, to use the SQL JOIN instead:
+
+    cache = DimensionCache(conn)
+    get_characters_with_planets(conn, cache)      # dictionary lookups
+    cache.enabled = False
+    get_characters_with_planets(conn, cache)      # original JOIN query
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import lesson9_database
+
+
+class DimensionCache:
+    """In-process copy of the planets and vehicles tables, keyed by id."""
+
+    def __init__(self, conn: sqlite3.Connection, enabled: bool = True):
+        """
+        Load the dimension tables.
+
+        Args:
+            conn: Database connection (kept for change checks)
+            enabled: False sends every call down the SQL JOIN path
+        """
+        self.conn = conn
+        self.enabled = enabled
+        self.loads = 0
+        self._version: Optional[Tuple[int, int]] = None
+        self._batch_depth = 0
+        self.load()
+
+    def _database_version(self) -> Tuple[int, int]:
+        """Change marker: other connections' commits plus this connection's changes."""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.conn.total_changes
+
+    def load(self) -> None:
+        """(Re)read both dimension tables."""
+        # id -> (name, climate, terrain, population)
+        self.planets: Dict[int, Tuple] = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT id, name, climate, terrain, population FROM planets"
+            )
+        }
+        # id -> (name, model, vehicle_class, cost_in_credits)
+        self.vehicles: Dict[int, Tuple] = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT id, name, model, vehicle_class, cost_in_credits FROM vehicles"
+            )
+        }
+        self._version = self._database_version()
+        self.loads += 1
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Reload the tables if the database changed since they were read.
+
+        Returns:
+            True if the cache was reloaded
+        """
+        if self._database_version() == self._version:
+            return False
+        self.load()
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Check for changes once for a group of calls.
+
+        Inside the with block the tables are used as they were at the start,
+        so writes made during the batch are not seen until the next one.
+        """
+        if self.enabled and not self._batch_depth:
+            self.refresh_if_changed()
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+
+    def active(self) -> bool:
+        """True if calls should use the cache (refreshing it first if needed)."""
+        if not self.enabled:
+            return False
+        if not self._batch_depth:
+            self.refresh_if_changed()
+        return True
+
+
+# ============================================
+# Cached Versions of the JOIN Queries
+# ============================================
+
+
+def get_characters_with_planets(
+    conn: sqlite3.Connection, cache: Optional[DimensionCache] = None
+) -> List[Tuple]:
+    """
+    Get characters with their homeworld planet information.
+
+    Args:
+        conn: Database connection
+        cache: Dimension cache; None or disabled uses the SQL JOIN
+
+    Returns:
+        List of (character_name, species, planet_name, climate) tuples
+    """
+    if cache is None or not cache.active():
+        return lesson9_database.get_characters_with_planets(conn)
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT name, species, planet_id
+        FROM characters
+        WHERE planet_id IS NOT NULL
+        ORDER BY name
+    """
+    )
+    planets = cache.planets
+    results = []
+    for name, species, planet_id in cursor.fetchall():
+        planet = planets.get(planet_id)
+        if planet is not None:  # INNER JOIN: no planet, no row
+            results.append((name, species, planet[0], planet[1]))
+    return results
+
+
+def _vehicles(
+    conn: sqlite3.Connection, cache: DimensionCache, character_name: str
+) -> List[Tuple]:
+    """
+    (name, model, vehicle_class, cost) of the vehicles linked to every
+    character with this name, ordered by vehicle name like the JOIN queries.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT cv.vehicle_id
+        FROM character_vehicles cv
+        INNER JOIN characters c ON cv.character_id = c.id
+        WHERE c.name = ?
+    """,
+        (character_name,),
+    )
+    vehicles = cache.vehicles
+    rows = [vehicles[row[0]] for row in cursor.fetchall() if row[0] in vehicles]
+    rows.sort(key=lambda vehicle: vehicle[0])  # ORDER BY v.name
+    return rows
+
+
+def get_character_vehicles(
+    conn: sqlite3.Connection,
+    character_name: str,
+    cache: Optional[DimensionCache] = None,
+) -> List[Tuple]:
+    """
+    Get all vehicles piloted by a character.
+
+    Args:
+        conn: Database connection
+        character_name: Name of the character
+        cache: Dimension cache; None or disabled uses the SQL JOIN
+
+    Returns:
+        List of (vehicle_name, vehicle_class, cost) tuples
+    """
+    if cache is None or not cache.active():
+        return lesson9_database.get_character_vehicles(conn, character_name)
+
+    return [
+        (name, vehicle_class, cost)
+        for name, _, vehicle_class, cost in _vehicles(conn, cache, character_name)
+    ]
+
+
+def challenge_character_report(
+    conn: sqlite3.Connection,
+    character_name: str,
+    cache: Optional[DimensionCache] = None,
+) -> dict:
+    """
+    Create a complete report for a character (see lesson9_database.py).
+
+    Args:
+        conn: Database connection
+        character_name: Name of the character
+        cache: Dimension cache; None or disabled uses the SQL JOINs
+
+    Returns:
+        Dictionary containing all character information
+    """
+    if cache is None or not cache.active():
+        return lesson9_database.challenge_character_report(conn, character_name)
+
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT name, species, height, affiliation, planet_id
+        FROM characters
+        WHERE name = ?
+    """,
+        (character_name,),
+    )
+    character = cursor.fetchone()
+    if not character:
+        return {"error": f"Character '{character_name}' not found"}
+
+    # LEFT JOIN: a missing planet gives empty planet details
+    planet = cache.planets.get(character[4], (None, None, None, None))
+    vehicles = _vehicles(conn, cache, character_name)
+
+    cursor.execute(
+        """
+        SELECT
+            COUNT(*) as species_count,
+            AVG(height) as avg_height,
+            MAX(height) as max_height,
+            MIN(height) as min_height
+        FROM characters
+        WHERE species = ?
+        AND height IS NOT NULL
+    """,
+        (character[1],),
+    )
+    return lesson9_database.build_report(
+        character[:4] + planet, vehicles, cursor.fetchone()
+    )
+
+
+# ============================================
+# Demonstration and Benchmark
+# ============================================
+
+
+def benchmark(conn: sqlite3.Connection, repeats: int = 200) -> Dict[str, dict]:
+    """
+    Time each function with the cache and with the SQL JOINs.
+
+    The cached calls are timed in one batch, so changes are checked once.
+    Also checks that both paths return the same result.
+
+    Returns:
+        Dictionary of function name -> join_ms, cache_ms (per call) and match
+    """
+    row = conn.execute(
+        """
+        SELECT c.name
+        FROM characters c
+        JOIN character_vehicles cv ON cv.character_id = c.id
+        LIMIT 1
+    """
+    ).fetchone()
+    name = row[0] if row else "Luke Skywalker"
+    cache = DimensionCache(conn)
+
+    calls = {
+        "get_characters_with_planets": (get_characters_with_planets, ()),
+        "get_character_vehicles": (get_character_vehicles, (name,)),
+        "challenge_character_report": (challenge_character_report, (name,)),
+    }
+    results = {}
+    for label, (function, args) in calls.items():
+        timings = {}
+        outputs = {}
+        for enabled in (False, True):
+            cache.enabled = enabled
+            outputs[enabled] = function(conn, *args, cache=cache)
+            started = time.perf_counter()
+            with cache.batch():
+                for _ in range(repeats):
+                    function(conn, *args, cache=cache)
+            timings[enabled] = (time.perf_counter() - started) * 1000 / repeats
+        results[label] = {
+            "join_ms": round(timings[False], 4),
+            "cache_ms": round(timings[True], 4),
+            "match": outputs[False] == outputs[True],
+        }
+    return results
+
+
+def main():
+    """Compare the cached lookups with the original JOIN queries."""
+    conn = lesson9_database.connect_to_database("database/starwars.db")
+    try:
+        results = benchmark(conn)
+        lesson9_database.display_statistics(
+            [
+                (
+                    name,
+                    r["join_ms"],
+                    r["cache_ms"],
+                    f"{r['join_ms'] / r['cache_ms']:.1f}x" if r["cache_ms"] else "-",
+                    "✓" if r["match"] else "✗",
+                )
+                for name, r in results.items()
+            ],
+            ["Function", "JOIN ms", "Cache ms", "Speed-up", "Same result"],
+        )
+    except sqlite3.OperationalError as e:
+        print(f"✗ This database is missing the lesson 5 tables: {e}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Streaming Export of Character Reports
+
+challenge_character_report() builds one dictionary per character. Exporting
+EVERY character that way - then calling json.dumps() on the whole list -
+keeps the entire export in memory and runs three queries per character.
+
+This module streams the same report records straight from the database
+cursor to a file (or stdout), one record at a time:
+
+    - "python" engine: three set-based queries (characters, vehicles,
+      species statistics) merged row-by-row in Python
+    - "sqlite" engine: SQLite builds each record itself with json_object()
+      and json_group_array(), so Python only copies text to the output
+
+Output is either NDJSON (one JSON object per line) or a single JSON array
+that is written element by element. --check compares every record with
+challenge_character_report() instead of exporting.
+
+Example:
+    python solutions/lesson9_export.py --format ndjson --output reports.ndjson
+    python solutions/lesson9_export.py --engine sqlite --format json
+    python solutions/lesson9_export.py --check
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from typing import Iterator, List, TextIO
+
+import lesson9_database
+
+# ============================================
+# Python Engine: Set-Based Queries + Merge
+# ============================================
+
+
+def iter_character_reports(conn: sqlite3.Connection) -> Iterator[dict]:
+    """
+    Yield one challenge_character_report()-style dictionary per character.
+
+    Characters and their vehicles are read from two cursors that are both
+    ordered by character ID, then merged - so memory stays bounded no matter
+    how many characters there are. Species statistics are small (one row per
+    species) and are loaded once up front.
+
+    Args:
+        conn: Database connection
+
+    Yields:
+        Character report dictionaries, in character ID order
+    """
+    species_stats = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            """
+            SELECT species, COUNT(*), AVG(height), MAX(height), MIN(height)
+            FROM characters
+            WHERE height IS NOT NULL AND species IS NOT NULL
+            GROUP BY species
+        """
+        )
+    }
+
+    characters = conn.execute(
+        """
+        SELECT
+            c.id, c.name, c.species, c.height, c.affiliation,
+            p.name, p.climate, p.terrain, p.population
+        FROM characters c
+        LEFT JOIN planets p ON c.planet_id = p.id
+        ORDER BY c.id
+    """
+    )
+
+    vehicles = conn.execute(
+        """
+        SELECT cv.character_id, v.name, v.model, v.vehicle_class, v.cost_in_credits
+        FROM character_vehicles cv
+        INNER JOIN vehicles v ON v.id = cv.vehicle_id
+        ORDER BY cv.character_id, v.name
+    """
+    )
+    pending_vehicle = vehicles.fetchone()
+
+    for row in characters:
+        character_id = row[0]
+
+        # Skip vehicles belonging to characters that no longer exist
+        while pending_vehicle is not None and pending_vehicle[0] < character_id:
+            pending_vehicle = vehicles.fetchone()
+
+        character_vehicles = []
+        while pending_vehicle is not None and pending_vehicle[0] == character_id:
+            character_vehicles.append(
+                {
+                    "name": pending_vehicle[1],
+                    "model": pending_vehicle[2],
+                    "class": pending_vehicle[3],
+                    "cost": pending_vehicle[4],
+                }
+            )
+            pending_vehicle = vehicles.fetchone()
+
+        # Species with no recorded heights still get a zero count
+        count, avg_height, tallest, shortest = species_stats.get(
+            row[2], (0, None, None, None)
+        )
+
+        yield {
+            "name": row[1],
+            "species": row[2],
+            "height": row[3],
+            "affiliation": row[4],
+            "homeworld": {
+                "name": row[5],
+                "climate": row[6],
+                "terrain": row[7],
+                "population": row[8],
+            },
+            "vehicles": character_vehicles,
+            "species_statistics": {
+                "total_members": count,
+                "average_height": round(avg_height, 1) if avg_height else None,
+                "tallest": tallest,
+                "shortest": shortest,
+            },
+        }
+
+
+def check_against_reports(conn: sqlite3.Connection) -> List[str]:
+    """
+    Compare iter_character_reports() with challenge_character_report().
+
+    Characters that share a name with another are skipped, because
+    challenge_character_report() looks characters up by name.
+
+    Returns:
+        Names of the characters whose records differ (empty if all match)
+    """
+    shared = {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM characters GROUP BY name HAVING COUNT(*) > 1"
+        )
+    }
+    return [
+        report["name"]
+        for report in iter_character_reports(conn)
+        if report["name"] not in shared
+        and report != lesson9_database.challenge_character_report(conn, report["name"])
+    ]
+
+
+def iter_report_json_python(conn: sqlite3.Connection) -> Iterator[str]:
+    """Yield each report as a JSON string, built in Python."""
+    for report in iter_character_reports(conn):
+        yield json.dumps(report, ensure_ascii=False)
+
+
+# ============================================
+# SQLite Engine: JSON Built Inside the Database
+# ============================================
+
+REPORT_JSON_SQL = """
+    WITH species_stats AS (
+        SELECT
+            species,
+            COUNT(*) AS total_members,
+            -- Like challenge_character_report(), an average of 0 is reported as null
+            CASE WHEN AVG(height) <> 0 THEN ROUND(AVG(height), 1) END AS average_height,
+            MAX(height) AS tallest,
+            MIN(height) AS shortest
+        FROM characters
+        WHERE height IS NOT NULL
+        GROUP BY species
+    )
+    SELECT json_object(
+        'name', c.name,
+        'species', c.species,
+        'height', c.height,
+        'affiliation', c.affiliation,
+        'homeworld', json_object(
+            'name', p.name,
+            'climate', p.climate,
+            'terrain', p.terrain,
+            'population', p.population
+        ),
+        'vehicles', json((
+            SELECT json_group_array(json_object(
+                'name', v.name,
+                'model', v.model,
+                'class', v.vehicle_class,
+                'cost', v.cost_in_credits
+            ))
+            FROM (
+                SELECT v.*
+                FROM character_vehicles cv
+                INNER JOIN vehicles v ON v.id = cv.vehicle_id
+                WHERE cv.character_id = c.id
+                ORDER BY v.name
+            ) AS v
+        )),
+        'species_statistics', json_object(
+            'total_members', COALESCE(s.total_members, 0),
+            'average_height', s.average_height,
+            'tallest', s.tallest,
+            'shortest', s.shortest
+        )
+    )
+    FROM characters c
+    LEFT JOIN planets p ON c.planet_id = p.id
+    LEFT JOIN species_stats s ON s.species = c.species
+    ORDER BY c.id
+"""
+
+
+def iter_report_json_sqlite(conn: sqlite3.Connection) -> Iterator[str]:
+    """Yield each report as a JSON string, built by SQLite's json_object()."""
+    for (document,) in conn.execute(REPORT_JSON_SQL):
+        yield document
+
+
+# ============================================
+# Writers
+# ============================================
+
+
+def write_ndjson(documents: Iterator[str], output: TextIO) -> int:
+    """
+    Write one JSON document per line.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for document in documents:
+        output.write(document)
+        output.write("\n")
+        count += 1
+    return count
+
+
+def write_json_array(documents: Iterator[str], output: TextIO) -> int:
+    """
+    Write the documents as a JSON array, one element at a time.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    output.write("[")
+    for document in documents:
+        if count:
+            output.write(",\n")
+        else:
+            output.write("\n")
+        output.write(document)
+        count += 1
+    output.write("\n]\n" if count else "]\n")
+    return count
+
+
+def export_character_reports(
+    conn: sqlite3.Connection,
+    output: TextIO,
+    output_format: str = "ndjson",
+    engine: str = "python",
+) -> int:
+    """
+    Stream a report for every character to an open text file.
+
+    Args:
+        conn: Database connection
+        output: File (or sys.stdout) to write to
+        output_format: "ndjson" or "json"
+        engine: "python" (merge in Python) or "sqlite" (json_object in SQL)
+
+    Returns:
+        Number of records written
+    """
+    engines = {"python": iter_report_json_python, "sqlite": iter_report_json_sqlite}
+    writers = {"ndjson": write_ndjson, "json": write_json_array}
+
+    if engine not in engines:
+        raise ValueError("engine must be 'python' or 'sqlite'")
+    if output_format not in writers:
+        raise ValueError("output_format must be 'ndjson' or 'json'")
+
+    return writers[output_format](engines[engine](conn), output)
+
+
+def main():
+    """Handle command line arguments and run the export."""
+    parser = argparse.ArgumentParser(
+        description="Stream a character report for every character as JSON"
+    )
+    parser.add_argument(
+        "--db", default="database/starwars.db", help="Path to the database file"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "json"],
+        default="ndjson",
+        help="NDJSON (one record per line) or a streamed JSON array",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "sqlite"],
+        default="python",
+        help="Build records in Python or inside SQLite with json_object()",
+    )
+    parser.add_argument(
+        "--output", help="Output file (default: write to standard output)"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Compare every record with challenge_character_report() instead",
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.check:
+            mismatches = check_against_reports(conn)
+            if mismatches:
+                print(f"✗ Records differ for: {', '.join(mismatches)}")
+                sys.exit(1)
+            print("✓ Every record matches challenge_character_report()")
+        elif args.output:
+            with open(args.output, "w", encoding="utf-8") as output:
+                count = export_character_reports(conn, output, args.format, args.engine)
+            print(f"✓ Exported {count} character reports to {args.output}")
+        else:
+            count = export_character_reports(conn, sys.stdout, args.format, args.engine)
+            print(f"✓ Exported {count} character reports", file=sys.stderr)
+    except sqlite3.Error as e:
+        print(f"✗ Database error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
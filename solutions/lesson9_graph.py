@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Relationship Graph Index
+
+get_character_vehicles() joins three tables for every lookup. Questions like
+"who shares a vehicle or starship with Luke, up to 2 hops away?" would need
+the same joins over character_vehicles and character_starships again and
+again.
+
+This module reads both junction tables ONCE and stores them as a graph in
+"CSR" (compressed sparse row) form - two flat integer arrays per direction:
+
+    offsets[i] .. offsets[i + 1]   is the slice of targets belonging to row i
+    targets[...]                   holds the neighbours, back to back
+
+Characters link to assets (vehicles and starships), and assets link back to
+characters, so "shares an asset with" is two steps through the graph.
+
+A recursive CTE version of the k-hop query is included so the two approaches
+can be compared in benchmarks.
+
+Example:
+    graph = RelationshipGraph(conn)
+    luke = graph.character_ids("Luke Skywalker")[0]
+    print(graph.neighbours(luke))
+    print(graph.k_hop(luke, 2))
+"""
+
+import sqlite3
+import time
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# (table, asset column, asset kind) for each junction table in the graph
+JUNCTION_TABLES = [
+    ("character_vehicles", "vehicle_id", "vehicle"),
+    ("character_starships", "starship_id", "starship"),
+]
+
+Asset = Tuple[str, int]
+
+
+def _build_csr(edges: List[Tuple[int, int]], rows: int) -> Tuple[array, array]:
+    """
+    Build CSR arrays from (row, target) pairs using a counting sort.
+
+    Returns:
+        (offsets, targets) arrays
+    """
+    counts = [0] * (rows + 1)
+    for row, _ in edges:
+        counts[row + 1] += 1
+    for i in range(rows):
+        counts[i + 1] += counts[i]
+
+    offsets = array("l", counts)
+    targets = array("l", bytes(offsets.itemsize * len(edges)))
+    cursor = list(counts[:-1])
+    for row, target in edges:
+        targets[cursor[row]] = target
+        cursor[row] += 1
+    return offsets, targets
+
+
+class RelationshipGraph:
+    """In-memory character-asset graph built from the junction tables."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Build the index.
+
+        Args:
+            conn: Database connection (kept for refresh checks)
+        """
+        self.conn = conn
+        self._version: Optional[Tuple[int, int]] = None
+        self.load()
+
+    # ============================================
+    # Loading and Refreshing
+    # ============================================
+
+    def _database_version(self) -> Tuple[int, int]:
+        """Change marker: other connections' commits plus this connection's changes."""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.conn.total_changes
+
+    def load(self) -> None:
+        """Read the junction tables and rebuild the CSR arrays."""
+        self.character_list: List[int] = []
+        self.character_index: Dict[int, int] = {}
+        self.names: Dict[int, str] = {}
+        for character_id, name in self.conn.execute(
+            "SELECT id, name FROM characters ORDER BY id"
+        ):
+            self.character_index[character_id] = len(self.character_list)
+            self.character_list.append(character_id)
+            self.names[character_id] = name
+
+        self.asset_list: List[Asset] = []
+        asset_index: Dict[Asset, int] = {}
+        edges: List[Tuple[int, int]] = []
+
+        for table, column, kind in JUNCTION_TABLES:
+            try:
+                rows = self.conn.execute(
+                    f"SELECT character_id, {column} FROM {table}"
+                ).fetchall()
+            except sqlite3.OperationalError:
+                # Table not created yet (e.g. starships is a bonus exercise)
+                continue
+            for character_id, asset_id in rows:
+                character = self.character_index.get(character_id)
+                if character is None:
+                    continue
+                asset = (kind, asset_id)
+                if asset not in asset_index:
+                    asset_index[asset] = len(self.asset_list)
+                    self.asset_list.append(asset)
+                edges.append((character, asset_index[asset]))
+
+        self.asset_index = asset_index
+        self.char_offsets, self.char_targets = _build_csr(
+            edges, len(self.character_list)
+        )
+        self.asset_offsets, self.asset_targets = _build_csr(
+            [(asset, character) for character, asset in edges], len(self.asset_list)
+        )
+
+        self._version = self._database_version()
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Rebuild the index if the database changed since it was built.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        if self._database_version() == self._version:
+            return False
+        self.load()
+        return True
+
+    # ============================================
+    # Queries
+    # ============================================
+
+    def character_ids(self, name: str) -> List[int]:
+        """Return the IDs of all characters with this name."""
+        return [cid for cid, cname in self.names.items() if cname == name]
+
+    def _assets_of(self, character: int) -> array:
+        return self.char_targets[
+            self.char_offsets[character] : self.char_offsets[character + 1]
+        ]
+
+    def _holders_of(self, asset: int) -> array:
+        return self.asset_targets[
+            self.asset_offsets[asset] : self.asset_offsets[asset + 1]
+        ]
+
+    def assets(self, character_id: int) -> List[Asset]:
+        """
+        List the vehicles and starships linked to a character.
+
+        Returns:
+            List of (kind, asset_id) tuples, e.g. ("vehicle", 2)
+        """
+        character = self.character_index.get(character_id)
+        if character is None:
+            return []
+        return [self.asset_list[asset] for asset in self._assets_of(character)]
+
+    def neighbours(self, character_id: int) -> List[int]:
+        """
+        Characters who share at least one vehicle or starship with this one.
+
+        Returns:
+            Sorted list of character IDs (not including the character itself)
+        """
+        return sorted(
+            cid for cid, hops in self.k_hop(character_id, 1).items() if hops == 1
+        )
+
+    def k_hop(self, character_id: int, hops: int) -> Dict[int, int]:
+        """
+        Breadth-first search over "shares an asset with" links.
+
+        Args:
+            character_id: Starting character
+            hops: Largest number of links to follow
+
+        Returns:
+            Dictionary of character ID -> distance (the start is distance 0)
+        """
+        start = self.character_index.get(character_id)
+        if start is None:
+            return {}
+
+        distance = {start: 0}
+        seen_assets = set()
+        frontier = deque([start])
+
+        while frontier:
+            character = frontier.popleft()
+            depth = distance[character]
+            if depth == hops:
+                continue
+            for asset in self._assets_of(character):
+                if asset in seen_assets:
+                    continue
+                seen_assets.add(asset)
+                for other in self._holders_of(asset):
+                    if other not in distance:
+                        distance[other] = depth + 1
+                        frontier.append(other)
+
+        return {self.character_list[c]: d for c, d in distance.items()}
+
+    def shared_assets(self, first_id: int, second_id: int) -> List[Asset]:
+        """
+        Vehicles and starships linked to BOTH characters.
+
+        Returns:
+            Sorted list of (kind, asset_id) tuples
+        """
+        return sorted(set(self.assets(first_id)) & set(self.assets(second_id)))
+
+
+# ============================================
+# Recursive CTE Fallback (for comparison)
+# ============================================
+
+K_HOP_SQL = """
+    WITH RECURSIVE
+    links(character_id, asset) AS (
+        {links}
+    ),
+    reach(character_id, depth) AS (
+        SELECT ?, 0
+        UNION
+        SELECT b.character_id, r.depth + 1
+        FROM reach r
+        JOIN links a ON a.character_id = r.character_id
+        JOIN links b ON b.asset = a.asset
+        WHERE r.depth < ?
+    )
+    SELECT character_id, MIN(depth)
+    FROM reach
+    WHERE character_id IN (SELECT id FROM characters)
+    GROUP BY character_id
+"""
+
+# Junction rows of deleted characters are left out, as RelationshipGraph does
+LINK_SQL = """SELECT j.character_id, '{kind}:' || j.{column}
+        FROM {table} j
+        JOIN characters c ON c.id = j.character_id"""
+
+
+def k_hop_query(conn: sqlite3.Connection) -> str:
+    """
+    Build K_HOP_SQL over the junction tables that exist in the database.
+
+    Returns:
+        SQL taking (character_id, hops) parameters
+    """
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    links = [
+        LINK_SQL.format(kind=kind, column=column, table=table)
+        for table, column, kind in JUNCTION_TABLES
+        if table in existing
+    ]
+    # No junction tables yet: nobody is linked to anybody
+    return K_HOP_SQL.format(
+        links="\n        UNION ALL\n        ".join(links) or "SELECT NULL, NULL WHERE 0"
+    )
+
+
+def k_hop_sql(
+    conn: sqlite3.Connection,
+    character_id: int,
+    hops: int,
+    query: Optional[str] = None,
+) -> Dict[int, int]:
+    """
+    Same result as RelationshipGraph.k_hop(), computed with a recursive CTE.
+
+    Args:
+        conn: Database connection
+        character_id: Starting character
+        hops: Largest number of links to follow
+        query: SQL from k_hop_query() (built on each call if not given)
+
+    Returns:
+        Dictionary of character ID -> distance
+    """
+    cursor = conn.cursor()
+    cursor.execute(query or k_hop_query(conn), (character_id, hops))
+    return dict(cursor.fetchall())
+
+
+# ============================================
+# Demonstration and Benchmark
+# ============================================
+
+
+def benchmark(conn: sqlite3.Connection, hops: int = 2, repeats: int = 50) -> dict:
+    """
+    Time k-hop queries from every character with the index and with the CTE.
+
+    Returns:
+        Dictionary of build time and per-query average times (milliseconds)
+    """
+    started = time.perf_counter()
+    graph = RelationshipGraph(conn)
+    build = time.perf_counter() - started
+
+    starts = graph.character_list[:repeats]
+
+    started = time.perf_counter()
+    for character_id in starts:
+        graph.k_hop(character_id, hops)
+    index_time = time.perf_counter() - started
+
+    query = k_hop_query(conn)
+    started = time.perf_counter()
+    for character_id in starts:
+        k_hop_sql(conn, character_id, hops, query)
+    sql_time = time.perf_counter() - started
+
+    queries = max(len(starts), 1)
+    return {
+        "build_ms": round(build * 1000, 3),
+        "index_query_ms": round(index_time * 1000 / queries, 3),
+        "cte_query_ms": round(sql_time * 1000 / queries, 3),
+    }
+
+
+def main():
+    """Show the graph queries and compare them with the recursive CTE."""
+    from lesson9_database import connect_to_database
+
+    conn = connect_to_database("database/starwars.db")
+    try:
+        graph = RelationshipGraph(conn)
+        luke_ids = graph.character_ids("Luke Skywalker")
+        if luke_ids:
+            luke = luke_ids[0]
+            print(f"Luke's vehicles and starships: {graph.assets(luke)}")
+            print(
+                "Shares an asset with Luke: "
+                f"{[graph.names[cid] for cid in graph.neighbours(luke)]}"
+            )
+            print(f"Within 2 hops: {len(graph.k_hop(luke, 2)) - 1} characters")
+
+        print(f"\nBenchmark (2 hops): {benchmark(conn)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
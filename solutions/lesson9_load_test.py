@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Load Generator for the HTTP Service
+
+Sends a mix of requests to lesson9_service.py from several client threads
+and reports requests per second and latency percentiles at each
+concurrency level.
+
+Each client thread keeps one keep-alive connection open, the way a real
+client library would, so the numbers measure the service rather than TCP
+connection setup.
+
+Each DELETE removes a character the same client created with an earlier
+POST, and any still left when the run ends are deleted afterwards, so the
+database is left as it was. --spawn serves a temporary copy of the
+database, never the original.
+
+Usage:
+    python solutions/lesson9_service.py --quiet &
+    python solutions/lesson9_load_test.py --concurrency 1 4 16 --duration 5
+
+    # Or start a service in-process for a quick self-contained run
+    python solutions/lesson9_load_test.py --spawn
+"""
+
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import quote
+
+# (weight, method, path template, JSON body template)
+# {temp} is a new character's name; {created} is one this client created
+DEFAULT_MIX = [
+    (40, "GET", "/characters/search?species=Human", None),
+    (20, "GET", "/characters/{name}/vehicles", None),
+    (20, "GET", "/characters/{name}/report", None),
+    (10, "GET", "/characters/{name}", None),
+    (
+        5,
+        "POST",
+        "/characters",
+        {"name": "{temp}", "species": "Human", "homeworld": "Kamino"},
+    ),
+    (5, "DELETE", "/characters/{created}", None),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+def run_client(
+    host: str,
+    port: int,
+    names: List[str],
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+    client_id: int,
+) -> None:
+    """One client thread: send weighted random requests until the deadline."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    weights = [entry[0] for entry in DEFAULT_MIX]
+    counter = 0
+    created: List[str] = []  # temporary characters not yet deleted
+
+    while time.perf_counter() < deadline:
+        _, method, template, body = random.choices(DEFAULT_MIX, weights)[0]
+        if "{created}" in template and not created:
+            continue
+        counter += 1
+        # Temporary characters are per-client so clients never collide
+        values = {
+            "name": quote(random.choice(names)),
+            "temp": f"LoadTest-{client_id}-{counter}",
+            "created": quote(created.pop()) if "{created}" in template else "",
+        }
+        path = template.format(**values)
+        payload = None
+        if body is not None:
+            payload = json.dumps(
+                {
+                    k: v.format(**values) if isinstance(v, str) else v
+                    for k, v in body.items()
+                }
+            )
+
+        if method == "POST":
+            # Recorded up front: a POST that errors may still have been applied
+            created.append(values["temp"])
+
+        started = time.perf_counter()
+        try:
+            conn.request(
+                method, path, body=payload, headers={"Content-Type": "application/json"}
+            )
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    # Delete this client's leftover characters (not timed)
+    for name in created:
+        try:
+            conn.request("DELETE", f"/characters/{quote(name)}")
+            conn.getresponse().read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.close()
+
+
+def run_level(
+    host: str, port: int, names: List[str], concurrency: int, duration: float
+) -> Dict[str, float]:
+    """
+    Run the request mix at one concurrency level.
+
+    Returns:
+        Dictionary with requests/sec, latency percentiles (ms) and errors
+    """
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(host, port, names, deadline, latencies, errors, n),
+        )
+        for n in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "errors": len(errors),
+    }
+
+
+def fetch_names(host: str, port: int, limit: int = 50) -> List[str]:
+    """Ask the service for some character names to use in requests."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request("GET", "/characters/search")
+        rows = json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+    # Row layout follows SELECT * FROM characters: (id, name, ...)
+    return [row[1] for row in rows[:limit]] or ["Luke Skywalker"]
+
+
+def main():
+    """Handle command line arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="Load test the lesson 9 HTTP service")
+    parser.add_argument("--host", default="127.0.0.1", help="Service address")
+    parser.add_argument("--port", type=int, default=8009, help="Service port")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Client thread counts to test (default: 1 4 16)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Seconds per concurrency level"
+    )
+    parser.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start a quiet service in this process first",
+    )
+    parser.add_argument(
+        "--db",
+        default="database/starwars.db",
+        help="Database --spawn serves a temporary copy of",
+    )
+    args = parser.parse_args()
+
+    server = None
+    scratch = None
+    output = sys.stdout
+    with contextlib.ExitStack() as stack:
+        if args.spawn:
+            from lesson9_service import make_server
+
+            # Serve a throwaway copy so the run cannot change the teaching database
+            scratch = tempfile.TemporaryDirectory(prefix="lesson9_load_test_")
+            db_copy = os.path.join(scratch.name, os.path.basename(args.db))
+            shutil.copyfile(args.db, db_copy)
+            server = make_server(db_copy, args.host, args.port, quiet=True, wal=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            # Silence the ✓/✗ messages the lesson 9 helpers print on every write
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+
+        try:
+            names = fetch_names(args.host, args.port)
+            print(
+                f"{'Clients':>8} {'Requests':>9} {'Req/s':>9} {'p50 ms':>8} "
+                f"{'p95 ms':>8} {'p99 ms':>8} {'Errors':>7}",
+                file=output,
+            )
+            for level in args.concurrency:
+                r = run_level(args.host, args.port, names, level, args.duration)
+                print(
+                    f"{r['concurrency']:>8} {r['requests']:>9} {r['rps']:>9} "
+                    f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} "
+                    f"{r['errors']:>7}",
+                    file=output,
+                )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+                server.pool.close()
+            if scratch is not None:
+                scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
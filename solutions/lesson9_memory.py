@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Memory Profiling for the Data Helpers
+
+get_all_characters() and get_characters_with_planets() build one Python
+tuple per row, so on a big table they can use a lot of memory at once.
+This module measures that with tracemalloc - but only when you ask for it.
+
+For every helper it records:
+
+    - Peak memory: the most allocated at any moment during the call
+    - Retained memory: what is still allocated when the call returns
+      (usually the result you were handed)
+
+and splits each call into three phases by watching the connection:
+
+    fetch    cursor.execute() - SQLite runs the query
+    rows     fetchone() / fetchall() - rows are converted to Python tuples
+    report   everything after that - e.g. the dictionary built by
+             challenge_character_report()
+
+Example:
+    profiler = MemoryProfiler()
+    db = profile_functions(profiler)
+
+    conn = sqlite3.connect("database/starwars.db")
+    db.get_all_characters(conn)
+    db.challenge_character_report(conn, "Luke Skywalker")
+
+    display_memory_stats(profiler)
+    profiler.write_summary("memory_profile.json")
+
+The summary is JSON, and --history appends one line per run to a .jsonl
+file, so a benchmark job can track the numbers over time.
+
+NOTE: tracemalloc slows Python down considerably and measures the whole
+process, so profiled calls are run one at a time.
+"""
+
+import argparse
+import functools
+import json
+import platform
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import lesson9_database
+from lesson9_retry import DATA_FUNCTIONS
+
+PHASES = ["fetch", "rows", "report"]
+
+# ============================================
+# Phase Tracking
+# ============================================
+
+
+class _PhaseTracker:
+    """Measures memory for each phase of one call."""
+
+    def __init__(self):
+        self.base = tracemalloc.get_traced_memory()[0]
+        self.phase = "report"  # Python work before the first query counts here
+        self.phase_start = self.base
+        self.phases = {p: {"peak_bytes": 0, "allocated_bytes": 0} for p in PHASES}
+        self.peak = 0
+        tracemalloc.reset_peak()
+
+    def switch(self, phase: str) -> None:
+        """Close the current phase and start another."""
+        current, peak = tracemalloc.get_traced_memory()
+        stats = self.phases[self.phase]
+        # A phase's peak is measured from where that phase started, so memory
+        # held over from earlier phases is not counted twice
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak - self.phase_start)
+        stats["allocated_bytes"] += current - self.phase_start
+        self.peak = max(self.peak, peak - self.base)
+        self.phase = phase
+        self.phase_start = current
+        tracemalloc.reset_peak()
+
+    def finish(self) -> int:
+        """Close the last phase; returns bytes still allocated since the start."""
+        self.switch(self.phase)
+        return tracemalloc.get_traced_memory()[0] - self.base
+
+
+class _ProfilingCursor:
+    """Cursor proxy that tells the tracker which phase the call is in."""
+
+    def __init__(self, cursor: sqlite3.Cursor, tracker: _PhaseTracker):
+        self._cursor = cursor
+        self._tracker = tracker
+
+    def _run(self, phase: str, method: str, *args):
+        self._tracker.switch(phase)
+        result = getattr(self._cursor, method)(*args)
+        self._tracker.switch("report")
+        return self if result is self._cursor else result
+
+    def execute(self, *args):
+        return self._run("fetch", "execute", *args)
+
+    def executemany(self, *args):
+        return self._run("fetch", "executemany", *args)
+
+    def fetchone(self):
+        return self._run("rows", "fetchone")
+
+    def fetchmany(self, *args):
+        return self._run("rows", "fetchmany", *args)
+
+    def fetchall(self):
+        return self._run("rows", "fetchall")
+
+    def __iter__(self):
+        # Rows are converted lazily, so the rest of the loop counts as "rows"
+        self._tracker.switch("rows")
+        return iter(self._cursor)
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._cursor, attribute)
+
+
+class _ProfilingConnection:
+    """Connection proxy that hands out profiling cursors."""
+
+    def __init__(self, conn: sqlite3.Connection, tracker: _PhaseTracker):
+        self._conn = conn
+        self._tracker = tracker
+
+    def cursor(self, *args):
+        return _ProfilingCursor(self._conn.cursor(*args), self._tracker)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._conn, attribute)
+
+
+# ============================================
+# Profiler
+# ============================================
+
+
+class MemoryProfiler:
+    """Collects per-function memory statistics across many calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._functions: Dict[str, dict] = {}
+
+    def record(self, name: str, peak: int, retained: int, phases: Dict) -> None:
+        """Add the measurements from one call."""
+        stats = self._functions.setdefault(
+            name,
+            {
+                "calls": 0,
+                "peak_bytes": 0,
+                "retained_bytes": 0,
+                "phases": {p: {"peak_bytes": 0, "allocated_bytes": 0} for p in PHASES},
+            },
+        )
+        stats["calls"] += 1
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak)
+        stats["retained_bytes"] = max(stats["retained_bytes"], retained)
+        for phase, values in phases.items():
+            totals = stats["phases"][phase]
+            totals["peak_bytes"] = max(totals["peak_bytes"], values["peak_bytes"])
+            totals["allocated_bytes"] = max(
+                totals["allocated_bytes"], values["allocated_bytes"]
+            )
+
+    def profile(self, function: Callable, name: Optional[str] = None) -> Callable:
+        """
+        Wrap a helper so each call is measured.
+
+        The helper must take the connection as its first argument.
+        """
+        name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(conn, *args, **kwargs):
+            # tracemalloc is process-wide, so measure one call at a time
+            with self._lock:
+                started_tracing = not tracemalloc.is_tracing()
+                if started_tracing:
+                    tracemalloc.start()
+                try:
+                    tracker = _PhaseTracker()
+                    result = function(
+                        _ProfilingConnection(conn, tracker), *args, **kwargs
+                    )
+                    retained = tracker.finish()
+                    self.record(name, tracker.peak, retained, tracker.phases)
+                    return result
+                finally:
+                    if started_tracing:
+                        tracemalloc.stop()
+
+        return wrapper
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Return a copy of the statistics, largest peak first.
+
+        Returns:
+            Dictionary of function name -> calls, peak_bytes, retained_bytes
+            and per-phase peak_bytes / allocated_bytes (largest single call)
+        """
+        with self._lock:
+            rows = json.loads(json.dumps(self._functions))
+        return dict(
+            sorted(rows.items(), key=lambda item: item[1]["peak_bytes"], reverse=True)
+        )
+
+    def summary(self, **details) -> dict:
+        """
+        Build a summary that can be saved and compared between runs.
+
+        Args:
+            details: Extra fields to include (database path, row counts...)
+        """
+        return {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            **details,
+            "functions": self.report(),
+        }
+
+    def write_summary(
+        self, path: str, history: Optional[str] = None, **details
+    ) -> dict:
+        """
+        Save the summary as JSON, and optionally append it to a history file.
+
+        Args:
+            path: JSON file to write
+            history: Optional .jsonl file that gets one line per run
+            details: Extra fields for summary()
+        """
+        summary = self.summary(**details)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        if history:
+            with open(history, "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary) + "\n")
+        return summary
+
+    def reset(self) -> None:
+        """Clear all statistics."""
+        with self._lock:
+            self._functions.clear()
+
+
+def display_memory_stats(profiler: MemoryProfiler) -> None:
+    """Print the memory statistics as a table (KiB)."""
+
+    def kib(value: int) -> str:
+        return f"{value / 1024:,.1f}"
+
+    lesson9_database.display_statistics(
+        [
+            (
+                name,
+                s["calls"],
+                kib(s["peak_bytes"]),
+                kib(s["retained_bytes"]),
+                kib(s["phases"]["fetch"]["peak_bytes"]),
+                kib(s["phases"]["rows"]["peak_bytes"]),
+                kib(s["phases"]["report"]["peak_bytes"]),
+            )
+            for name, s in profiler.report().items()
+        ],
+        [
+            "Function",
+            "Calls",
+            "Peak KiB",
+            "Retained KiB",
+            "Fetch peak",
+            "Rows peak",
+            "Report peak",
+        ],
+    )
+
+
+def profile_functions(profiler: Optional[MemoryProfiler] = None) -> SimpleNamespace:
+    """
+    Wrap every data helper in lesson9_database.py with memory profiling.
+
+    Args:
+        profiler: Profiler to record into (default: a new MemoryProfiler)
+
+    Returns:
+        Namespace of wrapped helpers plus .profiler
+    """
+    profiler = profiler if profiler is not None else MemoryProfiler()
+    wrapped = {
+        name: profiler.profile(getattr(lesson9_database, name))
+        for name in DATA_FUNCTIONS
+    }
+    return SimpleNamespace(profiler=profiler, **wrapped)
+
+
+# ============================================
+# Demonstration
+# ============================================
+
+
+def main():
+    """Profile the read helpers and save a summary."""
+    parser = argparse.ArgumentParser(
+        description="Measure memory used by the lesson 9 read helpers"
+    )
+    parser.add_argument("--db", default="database/starwars.db", help="Database path")
+    parser.add_argument(
+        "--output", default="memory_profile.json", help="Summary JSON file"
+    )
+    parser.add_argument("--history", help="Append the summary to this .jsonl file")
+    parser.add_argument("--repeat", type=int, default=3, help="Calls per helper")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        character = conn.execute("SELECT name FROM characters LIMIT 1").fetchone()
+        characters = conn.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"✗ Cannot read {args.db}: {e}")
+        sys.exit(1)
+
+    name = character[0] if character else "Luke Skywalker"
+    db = profile_functions()
+    calls: List[tuple] = [
+        ("get_all_characters",),
+        ("get_character_by_name", name),
+        ("search_characters", "Human"),
+        ("get_tall_characters", 0),
+        ("get_characters_with_planets",),
+        ("get_character_vehicles", name),
+        ("get_species_statistics",),
+        ("get_affiliation_summary",),
+        ("challenge_character_report", name),
+    ]
+    for function_name, *arguments in calls:
+        for _ in range(args.repeat):
+            try:
+                getattr(db, function_name)(conn, *arguments)
+            except sqlite3.Error as e:
+                # Older databases may be missing the lesson 5 tables
+                print(f"✗ {function_name}: {e}")
+                break
+    conn.close()
+
+    print(f"\nMemory by function ({characters:,} characters):")
+    display_memory_stats(db.profiler)
+    db.profiler.write_summary(
+        args.output, args.history, database=args.db, characters=characters
+    )
+    print(f"\n✓ Summary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
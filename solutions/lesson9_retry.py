@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Retrying "database is locked" Errors
+
+When another connection holds the write lock, SQLite raises
+sqlite3.OperationalError("database is locked"). None of the helpers in
+lesson9_database.py handle this - the error simply bubbles up.
+
+This module adds a retry layer that can wrap ANY of those helpers:
+
+    - Jittered exponential backoff between attempts
+    - A deadline per operation, so callers never wait forever
+    - Per-function counters for retries, lock-wait time and give-ups,
+      so you can see where the contention is
+
+Example:
+    policy = RetryPolicy(max_attempts=10, deadline=2.0)
+    db = apply_retry_policy(policy)
+
+    conn = sqlite3.connect("database/starwars.db", timeout=0)
+    db.add_character(conn, "Jyn Erso", "Human", "Vallt", 160)
+    print(db.stats.report())
+
+TIP: Connect with timeout=0 so SQLite reports a busy database straight away
+and this layer (not the driver's built-in busy handler) controls the waiting.
+"""
+
+import functools
+import random
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, Optional
+
+import lesson9_database
+
+# Helpers in lesson9_database.py that take a connection as their first argument
+DATA_FUNCTIONS = [
+    "get_all_characters",
+    "get_character_by_name",
+    "get_characters_by_species",
+    "search_characters",
+    "get_tall_characters",
+    "add_character",
+    "add_multiple_characters",
+    "update_character_affiliation",
+    "update_character_height",
+    "delete_character",
+    "delete_characters_by_affiliation",
+    "get_characters_with_planets",
+    "get_character_vehicles",
+    "get_species_statistics",
+    "get_affiliation_summary",
+    "challenge_character_report",
+]
+
+
+def is_busy_error(error: Exception) -> bool:
+    """Return True if the error means another connection holds a lock."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    message = str(error).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+# ============================================
+# Retry Policy
+# ============================================
+
+
+class RetryPolicy:
+    """Describes how long and how often to retry a busy database."""
+
+    def __init__(
+        self,
+        max_attempts: int = 8,
+        base_delay: float = 0.005,
+        max_delay: float = 0.25,
+        deadline: float = 5.0,
+        deadlines: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            max_attempts: Most attempts per call (including the first)
+            base_delay: Backoff ceiling (seconds) before the first retry
+            max_delay: Largest backoff ceiling between attempts
+            deadline: Default time budget (seconds) for one call
+            deadlines: Optional per-function deadlines, keyed by function name
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.deadlines = dict(deadlines or {})
+
+    def deadline_for(self, name: str) -> float:
+        """Return the time budget for the named function."""
+        return self.deadlines.get(name, self.deadline)
+
+    def backoff(self) -> Iterator[float]:
+        """
+        Yield the sleep before each retry.
+
+        Uses "full jitter": a random delay between zero and an exponentially
+        growing ceiling, so competing threads do not retry in lock-step.
+        """
+        for attempt in range(self.max_attempts - 1):
+            ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+            yield random.uniform(0, ceiling)
+
+
+# ============================================
+# Contention Metrics
+# ============================================
+
+
+class RetryStats:
+    """Thread-safe retry counters, kept per function name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, dict] = {}
+
+    def record(self, name: str, retries: int, lock_wait: float, gave_up: bool) -> None:
+        """Add the outcome of one call to the counters."""
+        with self._lock:
+            counter = self._counters.setdefault(
+                name, {"calls": 0, "retries": 0, "lock_wait": 0.0, "give_ups": 0}
+            )
+            counter["calls"] += 1
+            counter["retries"] += retries
+            counter["lock_wait"] += lock_wait
+            counter["give_ups"] += int(gave_up)
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Return a copy of the counters, worst contention first.
+
+        Returns:
+            Dictionary of function name -> calls, retries, lock_wait, give_ups
+        """
+        with self._lock:
+            rows = {name: dict(counter) for name, counter in self._counters.items()}
+        return dict(
+            sorted(rows.items(), key=lambda item: item[1]["lock_wait"], reverse=True)
+        )
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._counters.clear()
+
+
+def display_retry_stats(stats: RetryStats) -> None:
+    """Print the contention hot spots as a table."""
+    lesson9_database.display_statistics(
+        [
+            (
+                name,
+                c["calls"],
+                c["retries"],
+                f"{c['lock_wait'] * 1000:.1f}",
+                c["give_ups"],
+            )
+            for name, c in stats.report().items()
+        ],
+        ["Function", "Calls", "Retries", "Lock wait (ms)", "Give-ups"],
+    )
+
+
+# ============================================
+# Applying the Policy
+# ============================================
+
+
+def retry_on_busy(
+    function: Callable,
+    policy: RetryPolicy,
+    stats: Optional[RetryStats] = None,
+    name: Optional[str] = None,
+) -> Callable:
+    """
+    Wrap a helper so busy errors are retried according to the policy.
+
+    The wrapped helper must take the connection as its first argument. A
+    busy error is only retried when the call started its own transaction:
+    that transaction is rolled back before the retry, so a write that failed
+    at commit time is never applied twice. If the caller already had a
+    transaction open, the error is re-raised and the rollback (which would
+    also undo the caller's earlier work) is left to the caller.
+
+    Args:
+        function: Helper to wrap
+        policy: Retry policy to apply
+        stats: Optional counters to record retries into
+        name: Name used for the deadline and counters (default: function name)
+
+    Returns:
+        Wrapped function with the same signature
+    """
+    name = name or function.__name__
+
+    @functools.wraps(function)
+    def wrapper(conn: sqlite3.Connection, *args, **kwargs):
+        started = time.perf_counter()
+        deadline = started + policy.deadline_for(name)
+        delays = policy.backoff()
+        retries = 0
+        lock_wait = 0.0
+
+        while True:
+            attempt_started = time.perf_counter()
+            caller_transaction = conn.in_transaction
+            try:
+                result = function(conn, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                lock_wait += time.perf_counter() - attempt_started
+                if caller_transaction:
+                    # Retrying would replay only this call, not the caller's work
+                    if stats is not None:
+                        stats.record(name, retries, lock_wait, gave_up=True)
+                    raise
+                if conn.in_transaction:
+                    conn.rollback()
+
+                delay = next(delays, None)
+                if delay is None or time.perf_counter() + delay > deadline:
+                    if stats is not None:
+                        stats.record(name, retries, lock_wait, gave_up=True)
+                    raise
+
+                time.sleep(delay)
+                lock_wait += delay
+                retries += 1
+            else:
+                if stats is not None:
+                    stats.record(name, retries, lock_wait, gave_up=False)
+                return result
+
+    return wrapper
+
+
+def apply_retry_policy(
+    policy: Optional[RetryPolicy] = None, stats: Optional[RetryStats] = None
+) -> SimpleNamespace:
+    """
+    Wrap every data helper in lesson9_database.py with the same policy.
+
+    Args:
+        policy: Retry policy (default: RetryPolicy())
+        stats: Counters to share (default: a new RetryStats)
+
+    Returns:
+        Namespace of wrapped helpers plus .policy and .stats
+    """
+    policy = policy or RetryPolicy()
+    stats = stats if stats is not None else RetryStats()
+
+    wrapped = {
+        name: retry_on_busy(getattr(lesson9_database, name), policy, stats)
+        for name in DATA_FUNCTIONS
+    }
+    return SimpleNamespace(policy=policy, stats=stats, **wrapped)
+
+
+# ============================================
+# Demonstration
+# ============================================
+
+
+def main():
+    """Create lock contention on purpose and show the retry counters."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    db_path = "database/starwars.db"
+    db = apply_retry_policy(RetryPolicy(max_attempts=20, deadline=5.0))
+
+    def worker(n: int) -> None:
+        conn = sqlite3.connect(db_path, timeout=0)
+        try:
+            name = f"Clone Trooper {n}"
+            db.get_character_by_name(conn, "Luke Skywalker")
+            db.add_character(conn, name, "Human", "Kamino", 183, "Galactic Republic")
+            db.update_character_height(conn, name, 180)
+            db.delete_character(conn, name)
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(40)))
+
+    print("\nLock contention by function:")
+    display_retry_stats(db.stats)
+
+
+if __name__ == "__main__":
+    main()
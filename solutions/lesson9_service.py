@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Local HTTP/JSON Query Service
+
+Other programs can call the lesson 9 functions over HTTP instead of starting
+a new Python process (and a new database connection) for every call.
+
+The service uses only the standard library:
+
+    - ThreadingHTTPServer handles each request on its own thread
+    - A small connection pool hands every request an already-open
+      connection, so nobody pays the connect cost per call
+    - HTTP/1.1 keep-alive lets clients reuse one socket for many requests
+
+Endpoints (all responses are JSON):
+
+    GET    /characters/search?species=&affiliation=&min_height=
+    GET    /characters/<name>
+    GET    /characters/<name>/vehicles
+    GET    /characters/<name>/report
+    POST   /characters                {"name", "species", "homeworld", ...}
+    PATCH  /characters/<name>         {"height": 180} or {"affiliation": "..."}
+    DELETE /characters/<name>
+    DELETE /characters?affiliation=<affiliation>
+
+Usage:
+    python solutions/lesson9_service.py --port 8009
+    curl "http://127.0.0.1:8009/characters/Luke%20Skywalker/report"
+
+See lesson9_load_test.py for a load generator.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import lesson9_database as db
+from lesson9_retry import is_busy_error
+
+# ============================================
+# Connection Pool
+# ============================================
+
+
+class ConnectionPool:
+    """A fixed set of open connections shared by the request threads."""
+
+    def __init__(
+        self, db_path: str, size: int = 8, timeout: float = 5.0, wal: bool = False
+    ):
+        """
+        Open all connections up front.
+
+        Args:
+            db_path: Path to the database file
+            size: Number of connections
+            timeout: Seconds SQLite waits for a lock before "database is locked"
+            wal: Switch the database to WAL mode. This is stored in the file,
+                 so it stays switched after the service stops.
+        """
+        self._connections: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+            if wal:
+                # WAL lets readers keep going while a write is in progress
+                conn.execute("PRAGMA journal_mode = WAL")
+            self._connections.put(conn)
+        self.size = size
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a with block."""
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._connections.put(conn)
+
+    def close(self) -> None:
+        """Close every connection."""
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+# ============================================
+# Request Handling
+# ============================================
+
+
+class ApiError(Exception):
+    """An error that becomes a JSON error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LessonRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the lesson 9 functions."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body are written separately; without TCP_NODELAY the
+    # client's delayed ACK adds ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+    pool: ConnectionPool  # set by make_server()
+    quiet = False
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    # ----- helpers -----
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return payload
+
+    def _route(self) -> Tuple[list, dict]:
+        """Split the URL into path parts and single-valued query parameters."""
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if not parts or parts[0] != "characters":
+            raise ApiError(404, "Unknown endpoint")
+        return parts[1:], params
+
+    def _handle(self, method: str) -> None:
+        try:
+            parts, params = self._route()
+            with self.pool.connection() as conn:
+                status, payload = self._dispatch(conn, method, parts, params)
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except sqlite3.OperationalError as e:
+            if is_busy_error(e):
+                status, payload = 503, {"error": f"Database busy: {e}"}
+            else:
+                status, payload = 500, {"error": f"Database error: {e}"}
+        except sqlite3.Error as e:
+            status, payload = 400, {"error": f"Database error: {e}"}
+        except (TypeError, ValueError) as e:
+            status, payload = 400, {"error": f"Invalid request: {e}"}
+        self._send_json(status, payload)
+
+    def _dispatch(
+        self, conn: sqlite3.Connection, method: str, parts: list, params: dict
+    ) -> Tuple[int, object]:
+        """Call the lesson 9 function that matches the request."""
+        if method == "GET" and parts == ["search"]:
+            min_height = params.get("min_height")
+            try:
+                min_height = int(min_height) if min_height else None
+            except ValueError:
+                raise ApiError(400, "min_height must be a whole number")
+            return 200, db.search_characters(
+                conn, params.get("species"), params.get("affiliation"), min_height
+            )
+
+        if method == "POST" and not parts:
+            body = self._read_json()
+            missing = [f for f in ("name", "species", "homeworld") if f not in body]
+            if missing:
+                raise ApiError(400, f"Missing fields: {', '.join(missing)}")
+            character_id = db.add_character(
+                conn,
+                body["name"],
+                body["species"],
+                body["homeworld"],
+                body.get("height"),
+                body.get("affiliation"),
+            )
+            return 201, {"id": character_id}
+
+        if method == "DELETE" and not parts:
+            if "affiliation" not in params:
+                raise ApiError(400, "DELETE /characters needs ?affiliation=")
+            db.delete_characters_by_affiliation(conn, params["affiliation"])
+            return 200, {"deleted_affiliation": params["affiliation"]}
+
+        if not parts or len(parts) > 2:
+            raise ApiError(404, "Unknown endpoint")
+
+        name = parts[0]
+        action = parts[1] if len(parts) == 2 else None
+
+        if method == "GET" and action == "vehicles":
+            return 200, db.get_character_vehicles(conn, name)
+
+        if method == "GET" and action == "report":
+            report = db.challenge_character_report(conn, name)
+            return (404 if "error" in report else 200), report
+
+        if action is not None:
+            raise ApiError(404, "Unknown endpoint")
+
+        character = db.get_character_by_name(conn, name)
+        if character is None:
+            raise ApiError(404, f"Character '{name}' not found")
+
+        if method == "GET":
+            return 200, character
+
+        if method == "PATCH":
+            body = self._read_json()
+            if "height" in body:
+                db.update_character_height(conn, name, body["height"])
+            if "affiliation" in body:
+                db.update_character_affiliation(conn, name, body["affiliation"])
+            return 200, db.get_character_by_name(conn, name)
+
+        if method == "DELETE":
+            db.delete_character(conn, name)
+            return 200, {"deleted": name}
+
+        raise ApiError(405, f"{method} not supported here")
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+def make_server(
+    db_path: str = "database/starwars.db",
+    host: str = "127.0.0.1",
+    port: int = 8009,
+    pool_size: int = 8,
+    quiet: bool = False,
+    wal: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    Build (but do not start) the service.
+
+    Returns:
+        Server - call serve_forever() to run it
+    """
+    pool = ConnectionPool(db_path, pool_size, wal=wal)
+    handler = type(
+        "BoundLessonRequestHandler",
+        (LessonRequestHandler,),
+        {"pool": pool, "quiet": quiet},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.pool = pool
+    return server
+
+
+def main():
+    """Handle command line arguments and run the service."""
+    parser = argparse.ArgumentParser(
+        description="Serve the lesson 9 functions over HTTP"
+    )
+    parser.add_argument("--db", default="database/starwars.db", help="Database path")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8009, help="Port to listen on")
+    parser.add_argument("--pool-size", type=int, default=8, help="Pooled connections")
+    parser.add_argument(
+        "--wal",
+        action="store_true",
+        help="Switch the database to WAL mode (permanent; reads go on during writes)",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Hide request logs")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"✗ Database not found: {args.db}")
+        sys.exit(1)
+
+    server = make_server(
+        args.db, args.host, args.port, args.pool_size, args.quiet, args.wal
+    )
+    print(f"✓ Serving lesson 9 API on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.close()
+
+
+if __name__ == "__main__":
+    main()
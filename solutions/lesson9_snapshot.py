@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Columnar NumPy Snapshot for Height Analytics
+
+get_species_statistics() and exercise3_average_height_by_affiliation() let
+SQL do the maths with GROUP BY. That is perfect for one question, but every
+new question (a percentile, a histogram, a "what if we ignore droids?")
+means another trip to the database.
+
+A columnar snapshot loads the columns we analyse ONCE into NumPy arrays:
+
+    heights      float array, NaN where height is NULL
+    species      integer codes + a list of labels ("dictionary encoding")
+    affiliation  integer codes + labels (-1 where affiliation is NULL)
+    population   float array of each character's homeworld population
+
+Grouped statistics, percentiles and histograms are then vectorised array
+operations. refresh_if_changed() reloads the arrays only when the database
+has been modified since the snapshot was taken.
+
+Example:
+    conn = sqlite3.connect("database/starwars.db")
+    snapshot = CharacterSnapshot(conn)
+    print(snapshot.group_statistics("species"))
+    print(snapshot.percentiles([25, 50, 75], by="affiliation"))
+"""
+
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+GROUP_COLUMNS = ("species", "affiliation")
+
+
+def _encode(values: List[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Dictionary-encode a column of text values.
+
+    Returns:
+        (codes, labels) where codes[i] indexes labels, or -1 for NULL
+    """
+    labels = sorted({value for value in values if value is not None})
+    lookup = {label: code for code, label in enumerate(labels)}
+    codes = np.fromiter(
+        (lookup.get(value, -1) if value is not None else -1 for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, labels
+
+
+class CharacterSnapshot:
+    """In-memory columnar copy of the character columns used for analytics."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Load the snapshot.
+
+        Args:
+            conn: Database connection (kept for refresh checks)
+        """
+        self.conn = conn
+        self._version: Optional[Tuple[int, int]] = None
+        self.load()
+
+    # ============================================
+    # Loading and Refreshing
+    # ============================================
+
+    def _database_version(self) -> Tuple[int, int]:
+        """
+        Identify the current state of the database.
+
+        PRAGMA data_version changes when OTHER connections commit;
+        total_changes counts changes made through THIS connection.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.conn.total_changes
+
+    def load(self) -> None:
+        """Read the columns from the database into NumPy arrays."""
+        rows = self.conn.execute(
+            """
+            SELECT c.id, c.height, c.species, c.affiliation, p.population
+            FROM characters c
+            LEFT JOIN planets p ON c.planet_id = p.id
+            ORDER BY c.id
+        """
+        ).fetchall()
+
+        ids, heights, species, affiliations, populations = (
+            zip(*rows) if rows else ((), (), (), (), ())
+        )
+
+        self.ids = np.array(ids, dtype=np.int64)
+        # None becomes NaN, so missing values drop out of nan-aware maths
+        self.heights = np.array(heights, dtype=np.float64)
+        self.population = np.array(populations, dtype=np.float64)
+        self.codes: Dict[str, np.ndarray] = {}
+        self.labels: Dict[str, List[str]] = {}
+        self.codes["species"], self.labels["species"] = _encode(list(species))
+        self.codes["affiliation"], self.labels["affiliation"] = _encode(
+            list(affiliations)
+        )
+
+        self._version = self._database_version()
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Reload the snapshot if the database changed since it was loaded.
+
+        Returns:
+            True if the snapshot was reloaded
+        """
+        if self._database_version() == self._version:
+            return False
+        self.load()
+        return True
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ============================================
+    # Filtering ("what-if" slices)
+    # ============================================
+
+    def mask(
+        self,
+        species: Optional[str] = None,
+        affiliation: Optional[str] = None,
+        min_height: Optional[float] = None,
+        exclude_species: Sequence[str] = (),
+    ) -> np.ndarray:
+        """
+        Build a boolean mask selecting characters, like search_characters().
+
+        Args:
+            species: Keep only this species
+            affiliation: Keep only this affiliation
+            min_height: Keep only characters at least this tall
+            exclude_species: Species to leave out
+
+        Returns:
+            Boolean array with one entry per character
+        """
+        selected = np.ones(len(self), dtype=bool)
+
+        for column, value in (("species", species), ("affiliation", affiliation)):
+            if value is not None:
+                selected &= self.codes[column] == self._code(column, value)
+
+        if min_height is not None:
+            selected &= self.heights >= min_height
+
+        for value in exclude_species:
+            selected &= self.codes["species"] != self._code("species", value)
+
+        return selected
+
+    def _code(self, column: str, label: str) -> int:
+        """Return the integer code for a label (-2 if it never occurs)."""
+        try:
+            return self.labels[column].index(label)
+        except ValueError:
+            return -2
+
+    # ============================================
+    # Vectorised Statistics
+    # ============================================
+
+    def group_statistics(
+        self, by: str = "species", where: Optional[np.ndarray] = None
+    ) -> List[Tuple]:
+        """
+        Count, average, tallest and shortest height per group.
+
+        Matches get_species_statistics(): only characters with a height are
+        counted, characters with no group form a None group (as GROUP BY
+        returns them), and groups are ordered by count (largest first).
+
+        Args:
+            by: "species" or "affiliation"
+            where: Optional mask from mask()
+
+        Returns:
+            List of (group, count, avg_height, max_height, min_height) tuples
+        """
+        codes, heights = self._grouped(by, where, include_null=True)
+        labels = self.labels[by] + [None]  # code len(labels) is the NULL group
+        size = len(labels)
+
+        counts = np.bincount(codes, minlength=size)
+        sums = np.bincount(codes, weights=heights, minlength=size)
+        tallest = np.full(size, -np.inf)
+        shortest = np.full(size, np.inf)
+        np.maximum.at(tallest, codes, heights)
+        np.minimum.at(shortest, codes, heights)
+
+        results = [
+            (
+                labels[code],
+                int(counts[code]),
+                round(float(sums[code] / counts[code]), 1),
+                float(tallest[code]),
+                float(shortest[code]),
+            )
+            for code in np.flatnonzero(counts)
+        ]
+        return sorted(results, key=lambda row: row[1], reverse=True)
+
+    def percentiles(
+        self,
+        q: Sequence[float],
+        by: Optional[str] = None,
+        where: Optional[np.ndarray] = None,
+    ) -> Dict[str, List[float]]:
+        """
+        Height percentiles, overall or per group.
+
+        Characters with no group form a None group, as in group_statistics().
+
+        Args:
+            q: Percentiles to compute, e.g. [25, 50, 75]
+            by: Optional "species" or "affiliation"
+            where: Optional mask from mask()
+
+        Returns:
+            Dictionary of group -> list of percentile values ("all" if by is None)
+        """
+        if by is None:
+            heights = self._heights(where)
+            return {"all": np.percentile(heights, q).tolist() if heights.size else []}
+
+        codes, heights = self._grouped(by, where, include_null=True)
+        labels = self.labels[by] + [None]  # code len(labels) is the NULL group
+        # Sort once by group so each group is a contiguous slice
+        order = np.lexsort((heights, codes))
+        codes, heights = codes[order], heights[order]
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+
+        results = {}
+        for group in np.split(np.arange(codes.size), boundaries):
+            if group.size:
+                label = labels[codes[group[0]]]
+                results[label] = np.percentile(heights[group], q).tolist()
+        return results
+
+    def histogram(
+        self, bins: int = 10, where: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of known heights.
+
+        Returns:
+            (counts, bin_edges) as returned by numpy.histogram
+        """
+        return np.histogram(self._heights(where), bins=bins)
+
+    def z_scores(self, by: Optional[str] = None) -> np.ndarray:
+        """
+        Standardised height of every character.
+
+        Unknown heights score NaN. A group whose known heights are all equal
+        (including a group of one) has no spread, so its members score 0.
+        Characters with no group form a None group, as in group_statistics().
+
+        Args:
+            by: Optional "species" or "affiliation" to standardise within groups
+
+        Returns:
+            Float array with one z-score per character
+        """
+        if by is None:
+            codes = np.zeros(len(self), dtype=np.int32)
+            size = 1
+        else:
+            codes = self._group_codes(by)
+            size = len(self.labels[by]) + 1
+
+        known = ~np.isnan(self.heights)
+        codes, heights = codes[known], self.heights[known]
+        counts = np.bincount(codes, minlength=size)
+        tallest = np.full(size, -np.inf)
+        shortest = np.full(size, np.inf)
+        np.maximum.at(tallest, codes, heights)
+        np.minimum.at(shortest, codes, heights)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.bincount(codes, weights=heights, minlength=size) / counts
+            deviations = heights - means[codes]
+            stds = np.sqrt(
+                np.bincount(codes, weights=deviations**2, minlength=size) / counts
+            )
+            # Compare extremes rather than std, which rounding can leave above 0
+            flat = (tallest == shortest)[codes]
+            scores = np.full(len(self), np.nan)
+            scores[known] = np.where(flat, 0.0, deviations / stds[codes])
+        return scores
+
+    def population_by(self, by: str = "affiliation") -> List[Tuple]:
+        """
+        Total homeworld population of the characters in each group.
+
+        Characters with no group form a None group, as in group_statistics().
+
+        Returns:
+            List of (group, total_population) tuples, largest first
+        """
+        codes = self._group_codes(by)
+        labels = self.labels[by] + [None]  # code len(labels) is the NULL group
+        known = ~np.isnan(self.population)
+        totals = np.bincount(
+            codes[known], weights=self.population[known], minlength=len(labels)
+        )
+        members = np.bincount(codes, minlength=len(labels))
+        results = [
+            (labels[code], float(totals[code])) for code in np.flatnonzero(members)
+        ]
+        return sorted(results, key=lambda row: row[1], reverse=True)
+
+    # ============================================
+    # Internal Helpers
+    # ============================================
+
+    def _heights(self, where: Optional[np.ndarray]) -> np.ndarray:
+        """Known heights, optionally filtered by a mask."""
+        known = ~np.isnan(self.heights)
+        if where is not None:
+            known &= where
+        return self.heights[known]
+
+    def _group_codes(self, by: str) -> np.ndarray:
+        """Group code of every character, with len(self.labels[by]) for NULL."""
+        if by not in GROUP_COLUMNS:
+            raise ValueError(
+                f"Unknown group column {by!r}; expected one of: "
+                + ", ".join(GROUP_COLUMNS)
+            )
+        codes = self.codes[by]
+        return np.where(codes >= 0, codes, len(self.labels[by]))
+
+    def _grouped(
+        self, by: str, where: Optional[np.ndarray], include_null: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group codes and heights for rows with both a height and a group.
+
+        With include_null, rows with no group are kept too, with the code
+        len(self.labels[by]).
+        """
+        codes = self._group_codes(by)
+        known = ~np.isnan(self.heights)
+        if not include_null:
+            known &= codes < len(self.labels[by])
+        if where is not None:
+            known &= where
+        return codes[known], self.heights[known]
+
+
+# ============================================
+# Demonstration
+# ============================================
+
+
+def main():
+    """Show the snapshot answering several questions from one load."""
+    from lesson9_database import connect_to_database, display_statistics
+
+    conn = connect_to_database("database/starwars.db")
+    try:
+        snapshot = CharacterSnapshot(conn)
+        print(f"Loaded {len(snapshot)} characters into the snapshot\n")
+
+        display_statistics(
+            snapshot.group_statistics("species"),
+            ["Species", "Count", "Avg Height", "Tallest", "Shortest"],
+        )
+
+        print("\nHeight quartiles by affiliation:")
+        for affiliation, values in snapshot.percentiles(
+            [25, 50, 75], by="affiliation"
+        ).items():
+            print(f"  {affiliation}: {values}")
+
+        print("\nWhat if we ignore droids?")
+        no_droids = snapshot.mask(exclude_species=["Droid"])
+        display_statistics(
+            snapshot.group_statistics("affiliation", where=no_droids),
+            ["Affiliation", "Count", "Avg Height", "Tallest", "Shortest"],
+        )
+
+        counts, edges = snapshot.histogram(bins=5)
+        print("\nHeight histogram:")
+        for count, low, high in zip(counts, edges[:-1], edges[1:]):
+            print(f"  {low:6.1f} - {high:6.1f} cm: {'#' * int(count)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
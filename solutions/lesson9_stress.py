@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Read/Write Concurrency Stress Test
+
+Reproduces lock contention by running a weighted mix of lesson 9 calls from
+many threads or processes at once against a scaled-up copy of the database:
+
+    get_character_by_name, search_characters, get_species_statistics  (reads)
+    add_character, update_character_height, delete_character          (writes)
+
+For each journal mode it reports:
+
+    - Throughput (operations per second), overall and per interval
+    - Latency percentiles per operation
+    - "database is locked" errors per operation
+    - Size of the -wal file over time (WAL mode only)
+
+Threads share one Python interpreter (and its GIL); processes do not, so
+running both shows how much of the contention is SQLite and how much is
+Python.
+
+Usage:
+    python solutions/lesson9_stress.py --workers 8 --duration 10
+    python solutions/lesson9_stress.py --mode process --journal-mode wal delete
+    python solutions/lesson9_stress.py --scale 50 --mix read=95,write=5
+
+The original database is never changed - every run uses a fresh copy.
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import lesson9_database as db
+from lesson9_load_test import percentile
+from lesson9_retry import is_busy_error
+
+READ_OPERATIONS = [
+    "get_character_by_name",
+    "search_characters",
+    "get_species_statistics",
+]
+WRITE_OPERATIONS = ["add_character", "update_character_height", "delete_character"]
+
+# Relative weight of each operation inside the read or write share
+DEFAULT_WEIGHTS = {
+    "get_character_by_name": 50,
+    "search_characters": 35,
+    "get_species_statistics": 15,
+    "add_character": 40,
+    "update_character_height": 40,
+    "delete_character": 20,
+}
+
+JOURNAL_MODES = ["wal", "delete", "truncate", "persist", "memory"]
+
+# ============================================
+# Database Setup
+# ============================================
+
+
+def scale_database(source: str, target: str, factor: int) -> int:
+    """
+    Copy a database and multiply its characters table.
+
+    Each extra copy of a character gets a " #n" suffix so names stay unique.
+
+    Args:
+        source: Database to copy
+        target: Path of the new, scaled database
+        factor: How many times larger the characters table should be
+
+    Returns:
+        Number of characters in the scaled database
+    """
+    shutil.copyfile(source, target)
+    conn = sqlite3.connect(target)
+    try:
+        columns = [
+            row[1]
+            for row in conn.execute("PRAGMA table_info(characters)")
+            if row[1] not in ("id", "name")
+        ]
+        column_list = ", ".join(columns)
+        for n in range(2, factor + 1):
+            conn.execute(
+                f"""
+                INSERT INTO characters (name, {column_list})
+                SELECT name || ' #{n}', {column_list}
+                FROM characters
+                WHERE name NOT LIKE '% #%'
+            """
+            )
+        conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def connect(
+    db_path: str, journal_mode: str, busy_timeout: float, wal_autocheckpoint: int = 1000
+) -> sqlite3.Connection:
+    """Open a connection configured the way every worker uses it."""
+    conn = sqlite3.connect(db_path, timeout=busy_timeout)
+    # WAL is stored in the file; the other modes are per connection
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    # Also per connection: any connection that commits may run the checkpoint
+    conn.execute(f"PRAGMA wal_autocheckpoint = {int(wal_autocheckpoint)}")
+    return conn
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Turn "read=80,write=20" (or per-operation weights such as
+    "get_character_by_name=10,add_character=1") into operation weights.
+    """
+    weights = dict.fromkeys(DEFAULT_WEIGHTS, 0.0)
+    for item in text.split(","):
+        key, _, value = item.partition("=")
+        key, value = key.strip(), float(value)
+        if key in ("read", "write"):
+            group = READ_OPERATIONS if key == "read" else WRITE_OPERATIONS
+            group_total = sum(DEFAULT_WEIGHTS[op] for op in group)
+            for op in group:
+                weights[op] = value * DEFAULT_WEIGHTS[op] / group_total
+        elif key in weights:
+            weights[key] = value
+        else:
+            raise ValueError(f"Unknown operation in mix: {key}")
+    if not any(weights.values()):
+        raise ValueError("The mix needs at least one operation with weight > 0")
+    return weights
+
+
+# ============================================
+# Workers
+# ============================================
+
+
+def run_quiet_worker(*args) -> Dict:
+    """Process pool entry point: run_worker without the helpers' ✓/✗ messages."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return run_worker(*args)
+
+
+def run_worker(
+    worker_id: int,
+    db_path: str,
+    journal_mode: str,
+    busy_timeout: float,
+    weights: Dict[str, float],
+    names: List[str],
+    species: List[str],
+    start_at: float,
+    duration: float,
+    wal_autocheckpoint: int = 1000,
+) -> Dict:
+    """
+    One worker (thread or process): run the mix until the time is up.
+
+    Timestamps use time.monotonic(), which on Linux is the same clock in
+    every process, so results from different processes line up.
+
+    Returns:
+        Dictionary with per-operation latencies, busy error counts and
+        completion times (seconds since the run started)
+    """
+    rng = random.Random(worker_id)
+    operations = [op for op in weights if weights[op] > 0]
+    op_weights = [weights[op] for op in operations]
+    conn = connect(db_path, journal_mode, busy_timeout, wal_autocheckpoint)
+
+    latencies: Dict[str, List[float]] = {op: [] for op in operations}
+    busy: Dict[str, int] = dict.fromkeys(operations, 0)
+    other_errors: Dict[str, int] = dict.fromkeys(operations, 0)
+    completed_at: List[float] = []
+    added: List[str] = []
+    counter = 0
+
+    while time.monotonic() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + duration
+
+    while time.monotonic() < deadline:
+        op = rng.choices(operations, op_weights)[0]
+        if op == "get_character_by_name":
+            call = (db.get_character_by_name, rng.choice(names))
+        elif op == "search_characters":
+            call = (db.search_characters, rng.choice(species), None, 150)
+        elif op == "get_species_statistics":
+            call = (db.get_species_statistics,)
+        elif op == "add_character":
+            counter += 1
+            name = f"Stress-{worker_id}-{counter}"
+            added.append(name)
+            call = (db.add_character, name, "Human", "Coruscant", 170, "Stress")
+        elif op == "update_character_height":
+            call = (db.update_character_height, rng.choice(names), rng.randint(60, 260))
+        else:
+            # Delete our own additions so the table size stays steady
+            name = added.pop() if added else f"Stress-{worker_id}-missing"
+            call = (db.delete_character, name)
+
+        started = time.monotonic()
+        try:
+            call[0](conn, *call[1:])
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.rollback()
+            if is_busy_error(e):
+                busy[op] += 1
+            else:
+                other_errors[op] += 1
+            continue
+        finished = time.monotonic()
+        latencies[op].append(finished - started)
+        completed_at.append(finished - start_at)
+
+    conn.close()
+    return {
+        "latencies": latencies,
+        "busy": busy,
+        "errors": other_errors,
+        "completed_at": completed_at,
+    }
+
+
+def watch_wal(
+    wal_path: str, start_at: float, duration: float, interval: float
+) -> List[Tuple[float, int]]:
+    """Sample the size of the -wal file every interval until the run ends."""
+    samples = []
+    deadline = start_at + duration
+    while time.monotonic() < start_at:
+        time.sleep(0.001)
+    while True:
+        now = time.monotonic()
+        size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+        samples.append((now - start_at, size))
+        if now >= deadline:
+            return samples
+        time.sleep(min(interval, max(0.0, deadline - now)))
+
+
+# ============================================
+# Running a Scenario
+# ============================================
+
+
+def run_stress(
+    db_path: str,
+    journal_mode: str = "wal",
+    mode: str = "thread",
+    workers: int = 8,
+    duration: float = 10.0,
+    weights: Dict[str, float] = None,
+    busy_timeout: float = 1.0,
+    interval: float = 1.0,
+    wal_autocheckpoint: int = 1000,
+) -> Dict:
+    """
+    Run one stress scenario and gather the results.
+
+    Args:
+        db_path: Database to hammer (it WILL be changed - pass a copy)
+        journal_mode: SQLite journal mode for every connection
+        mode: "thread" or "process"
+        workers: Number of concurrent workers
+        duration: Seconds to run
+        weights: Operation weights (see parse_mix)
+        busy_timeout: Seconds SQLite waits on a lock before raising
+        interval: Seconds per throughput / WAL sample
+        wal_autocheckpoint: Pages before an automatic checkpoint (0 = never)
+
+    Returns:
+        Dictionary with throughput, per-operation statistics and timelines
+    """
+    weights = weights or dict(DEFAULT_WEIGHTS)
+
+    conn = connect(db_path, journal_mode, busy_timeout, wal_autocheckpoint)
+    names = [row[0] for row in conn.execute("SELECT name FROM characters")]
+    species = [
+        row[0]
+        for row in conn.execute(
+            "SELECT DISTINCT species FROM characters WHERE species IS NOT NULL"
+        )
+    ] or ["Human"]
+    size_before = os.path.getsize(db_path)
+
+    # Give every worker time to start before the clock begins
+    start_at = time.monotonic() + (1.0 if mode == "process" else 0.2)
+    wal_samples: List[Tuple[float, int]] = []
+    watcher = threading.Thread(
+        target=lambda: wal_samples.extend(
+            watch_wal(db_path + "-wal", start_at, duration, interval)
+        )
+    )
+    watcher.start()
+
+    if mode == "process":
+        pool = ProcessPoolExecutor(max_workers=workers)
+        target = run_quiet_worker
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        target = run_worker
+
+    # The lesson 9 helpers print ✓/✗ on every write. stdout is shared by all
+    # threads, so it is redirected once here rather than inside each worker.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), pool:
+        futures = [
+            pool.submit(
+                target,
+                n,
+                db_path,
+                journal_mode,
+                busy_timeout,
+                weights,
+                names,
+                species,
+                start_at,
+                duration,
+                wal_autocheckpoint,
+            )
+            for n in range(workers)
+        ]
+        results = [future.result() for future in futures]
+    watcher.join()
+    conn.close()
+
+    operations: Dict[str, Dict] = {}
+    completed_at: List[float] = []
+    for op in weights:
+        if not weights[op]:
+            continue
+        times = sorted(t for r in results for t in r["latencies"].get(op, []))
+        operations[op] = {
+            "count": len(times),
+            "p50_ms": percentile(times, 50) * 1000,
+            "p95_ms": percentile(times, 95) * 1000,
+            "p99_ms": percentile(times, 99) * 1000,
+            "max_ms": (times[-1] if times else 0.0) * 1000,
+            "busy": sum(r["busy"].get(op, 0) for r in results),
+            "errors": sum(r["errors"].get(op, 0) for r in results),
+        }
+    for r in results:
+        completed_at.extend(r["completed_at"])
+
+    buckets = [0] * max(1, int(duration / interval + 0.999))
+    for t in completed_at:
+        buckets[min(len(buckets) - 1, int(t / interval))] += 1
+
+    return {
+        "journal_mode": journal_mode,
+        "mode": mode,
+        "workers": workers,
+        "ops_per_second": len(completed_at) / duration,
+        "busy_errors": sum(o["busy"] for o in operations.values()),
+        "operations": operations,
+        "throughput_timeline": [count / interval for count in buckets],
+        "wal_timeline": wal_samples,
+        "size_before": size_before,
+        "size_after": os.path.getsize(db_path),
+    }
+
+
+def print_results(result: Dict, interval: float) -> None:
+    """Print one scenario's results as tables."""
+    print(
+        f"\n📊 journal_mode={result['journal_mode']}  {result['workers']} "
+        f"{result['mode']} workers  {result['ops_per_second']:,.0f} ops/s  "
+        f"{result['busy_errors']} busy errors"
+    )
+    print(
+        f"{'Operation':<26} {'Count':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8} {'Busy':>6} {'Other':>6}"
+    )
+    for op, s in result["operations"].items():
+        print(
+            f"{op:<26} {s['count']:>8} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} "
+            f"{s['p99_ms']:>8.2f} {s['max_ms']:>8.2f} {s['busy']:>6} {s['errors']:>6}"
+        )
+
+    print(f"\n{'Time s':>7} {'Ops/s':>9} {'WAL KiB':>9}")
+    wal = result["wal_timeline"]
+    for n, rate in enumerate(result["throughput_timeline"]):
+        end = (n + 1) * interval
+        # Largest WAL sample taken during this interval
+        sizes = [size for t, size in wal if n * interval <= t <= end]
+        wal_kib = "-"
+        if sizes and result["journal_mode"] == "wal":
+            wal_kib = f"{max(sizes) / 1024:,.0f}"
+        print(f"{end:>7.1f} {rate:>9,.0f} {wal_kib:>9}")
+    print(
+        f"Database file: {result['size_before'] / 1024:,.0f} KiB -> "
+        f"{result['size_after'] / 1024:,.0f} KiB"
+    )
+
+
+def main():
+    """Handle command line arguments and run the scenarios."""
+    parser = argparse.ArgumentParser(
+        description="Stress test the lesson 9 functions with concurrent reads and writes"
+    )
+    parser.add_argument("--db", default="database/starwars.db", help="Base database")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=20,
+        help="Multiply the characters table (default: 20)",
+    )
+    parser.add_argument(
+        "--mode", choices=["thread", "process"], nargs="+", default=["thread"]
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent workers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument(
+        "--journal-mode",
+        nargs="+",
+        choices=JOURNAL_MODES,
+        default=["wal"],
+        help="Journal modes to compare (default: wal)",
+    )
+    parser.add_argument(
+        "--mix",
+        default="read=80,write=20",
+        help='Operation weights, e.g. "read=80,write=20" or "add_character=5,..."',
+    )
+    parser.add_argument(
+        "--busy-timeout",
+        type=float,
+        default=1.0,
+        help="Seconds to wait for a lock before 'database is locked'",
+    )
+    parser.add_argument("--interval", type=float, default=1.0, help="Sample seconds")
+    parser.add_argument(
+        "--wal-autocheckpoint",
+        type=int,
+        default=1000,
+        help="Pages between automatic checkpoints, 0 disables (default: 1000)",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"✗ Database not found: {args.db}")
+        sys.exit(1)
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    workdir = tempfile.mkdtemp(prefix="lesson9_stress_")
+    try:
+        scaled = os.path.join(workdir, "scaled.db")
+        rows = scale_database(args.db, scaled, args.scale)
+        print(f"✓ Scaled database: {rows:,} characters")
+
+        for journal_mode in args.journal_mode:
+            for mode in args.mode:
+                # Every scenario starts from the same scaled database
+                run_path = os.path.join(workdir, f"{journal_mode}_{mode}.db")
+                shutil.copyfile(scaled, run_path)
+                result = run_stress(
+                    run_path,
+                    journal_mode,
+                    mode,
+                    args.workers,
+                    args.duration,
+                    weights,
+                    args.busy_timeout,
+                    args.interval,
+                    args.wal_autocheckpoint,
+                )
+                print_results(result, args.interval)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
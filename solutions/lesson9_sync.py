@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Idempotent Bulk Sync with UPSERT
+
+Syncing an external roster with add_character() and delete_character()
+means a read-compare-write round trip for every record. An UPSERT lets
+SQLite decide for us:
+
+    INSERT INTO characters (...) VALUES (...)
+    ON CONFLICT(name) DO UPDATE SET ...
+
+Records are streamed in batches. Each batch is loaded into a temporary
+staging table, counted (new / changed / unchanged) and merged with ONE
+INSERT ... SELECT ... ON CONFLICT statement, inside one transaction. Running
+the same sync twice changes nothing the second time - it is idempotent.
+
+ON CONFLICT(name) needs a UNIQUE index on characters.name; it is created
+on first use if it does not exist yet.
+
+Example:
+    roster = [
+        ("Luke Skywalker", "Human", "Tatooine", 172, "Rebel Alliance"),
+        ("Jyn Erso", "Human", "Vallt", 160, "Rebel Alliance"),
+    ]
+    print(sync_characters(conn, roster))
+    # {'inserted': 1, 'updated': 1, 'unchanged': 0}
+"""
+
+import sqlite3
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# Column order for tuple records - the same order add_multiple_characters() uses
+SYNC_COLUMNS = ("name", "species", "homeworld", "height", "affiliation")
+
+Record = Union[Tuple, Dict[str, object]]
+
+
+def ensure_unique_name_index(conn: sqlite3.Connection) -> None:
+    """
+    Create a UNIQUE index on characters.name if it is missing.
+
+    Raises:
+        sqlite3.IntegrityError: If characters already contains duplicate names
+    """
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_characters_name_unique "
+        "ON characters(name)"
+    )
+    conn.commit()
+
+
+def _as_row(record: Record) -> Tuple:
+    """Convert a tuple or dictionary record to a tuple in SYNC_COLUMNS order."""
+    if isinstance(record, dict):
+        return tuple(record.get(column) for column in SYNC_COLUMNS)
+    if len(record) != len(SYNC_COLUMNS):
+        raise ValueError(
+            f"Expected {len(SYNC_COLUMNS)} values {SYNC_COLUMNS}, got {record!r}"
+        )
+    return tuple(record)
+
+
+def _batches(records: Iterable[Record], batch_size: int) -> Iterator[List[Tuple]]:
+    """Split a stream of records into lists of at most batch_size rows."""
+    rows = map(_as_row, records)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _sync_batch(cursor: sqlite3.Cursor, batch: List[Tuple]) -> Dict[str, int]:
+    """Stage, count and merge one batch. Must run inside a transaction."""
+    cursor.execute("DELETE FROM temp.character_sync")
+    # INSERT OR REPLACE: if a name repeats within a batch, the last record wins
+    cursor.executemany(
+        """
+        INSERT OR REPLACE INTO temp.character_sync
+            (name, species, homeworld, height, affiliation)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+        batch,
+    )
+
+    cursor.execute(
+        """
+        SELECT
+            SUM(c.id IS NULL),
+            SUM(c.id IS NOT NULL AND
+                (c.species, c.homeworld, c.height, c.affiliation) IS NOT
+                (s.species, s.homeworld, s.height, s.affiliation)),
+            COUNT(*)
+        FROM temp.character_sync s
+        LEFT JOIN characters c ON c.name = s.name
+    """
+    )
+    inserted, updated, staged = (value or 0 for value in cursor.fetchone())
+
+    # "WHERE true" is required so SQLite does not read ON as a join clause
+    cursor.execute(
+        """
+        INSERT INTO characters (name, species, homeworld, height, affiliation)
+        SELECT name, species, homeworld, height, affiliation
+        FROM temp.character_sync
+        WHERE true
+        ON CONFLICT(name) DO UPDATE SET
+            species = excluded.species,
+            homeworld = excluded.homeworld,
+            height = excluded.height,
+            affiliation = excluded.affiliation
+        WHERE (species, homeworld, height, affiliation) IS NOT
+              (excluded.species, excluded.homeworld, excluded.height,
+               excluded.affiliation)
+    """
+    )
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": staged - inserted - updated,
+    }
+
+
+def sync_characters(
+    conn: sqlite3.Connection,
+    records: Iterable[Record],
+    batch_size: int = 5000,
+) -> Dict[str, int]:
+    """
+    Insert new characters and update changed ones, keyed by name.
+
+    Args:
+        conn: Database connection
+        records: Tuples (name, species, homeworld, height, affiliation) or
+            dictionaries with those keys - any iterable, including generators
+        batch_size: Records merged per transaction
+
+    Returns:
+        Dictionary with inserted, updated and unchanged counts
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    ensure_unique_name_index(conn)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS character_sync (
+            name TEXT PRIMARY KEY,
+            species TEXT,
+            homeworld TEXT,
+            height INTEGER,
+            affiliation TEXT
+        )
+    """
+    )
+
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for batch in _batches(records, batch_size):
+        try:
+            counts = _sync_batch(cursor, batch)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        for key, value in counts.items():
+            totals[key] += value
+
+    cursor.execute("DROP TABLE IF EXISTS temp.character_sync")
+    print(
+        f"✓ Synced characters: {totals['inserted']} inserted, "
+        f"{totals['updated']} updated, {totals['unchanged']} unchanged"
+    )
+    return totals
+
+
+# ============================================
+# Demonstration
+# ============================================
+
+
+def main():
+    """Sync a small roster twice to show the upsert is idempotent."""
+    from lesson9_database import connect_to_database
+
+    roster = [
+        ("Luke Skywalker", "Human", "Tatooine", 172, "Rebel Alliance"),
+        ("Jyn Erso", "Human", "Vallt", 160, "Rebel Alliance"),
+        ("Cassian Andor", "Human", "Fest", 178, "Rebel Alliance"),
+    ]
+
+    conn = connect_to_database("database/starwars.db")
+    try:
+        print("\nFirst sync:")
+        sync_characters(conn, roster)
+        print("\nSecond sync (nothing should change):")
+        sync_characters(conn, roster)
+    except sqlite3.IntegrityError as e:
+        print(f"✗ Cannot sync by name - characters has duplicate names: {e}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Lesson 9 Extension: Single-Writer Queue with Group Commit
+
+SQLite allows only one writer at a time. When many threads call helpers like
+add_character() or update_character_height() on their own connections, they
+fight over the write lock ("database is locked") and every call pays for its
+own commit (and fsync).
+
+This module routes all writes through ONE dedicated writer thread:
+
+    1. Callers submit a write request and immediately get a Future back
+    2. The writer thread drains the queue and runs requests in a single
+       transaction (a "group commit"), bounded by batch size and time
+    3. Each request runs inside its own SAVEPOINT, so one failing request
+       does not undo the rest of the batch
+
+Example:
+    with WriteQueue("database/starwars.db") as queue:
+        future = queue.add_character("Jyn Erso", "Human", "Vallt", 160)
+        print(f"New ID: {future.result()}")
+        print(queue.stats())
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+# A write operation receives the writer's cursor and returns the caller's result
+WriteOperation = Callable[[sqlite3.Cursor], Any]
+
+# Sentinel placed on the queue to tell the writer thread to finish
+_STOP = object()
+
+# Commit latencies kept for the percentiles in stats() (the most recent ones)
+LATENCY_WINDOW = 10000
+
+
+class WriteQueue:
+    """Serialises writes through one thread and commits them in groups."""
+
+    def __init__(
+        self,
+        db_path: str = "database/starwars.db",
+        max_batch_size: int = 100,
+        max_batch_delay: float = 0.005,
+    ):
+        """
+        Create the queue and start the writer thread.
+
+        Args:
+            db_path: Path to the database file
+            max_batch_size: Most write requests committed in one transaction
+            max_batch_delay: Longest time (seconds) to wait for a batch to fill
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+
+        self._requests: "queue.Queue" = queue.Queue()
+        self._closed = False
+        # Held while checking _closed and queueing, so nothing lands after _STOP
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._batched_requests = 0
+        self._largest_batch = 0
+        self._commit_latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._completed = 0
+        self._failed = 0
+
+        self._writer = threading.Thread(
+            target=self._run, name="sqlite-writer", daemon=True
+        )
+        self._writer.start()
+
+    # ============================================
+    # Submitting Work
+    # ============================================
+
+    def submit(self, operation: WriteOperation) -> Future:
+        """
+        Queue a write operation for the writer thread.
+
+        The operation must NOT call commit() - the writer thread commits
+        each batch as a whole.
+
+        Args:
+            operation: Function that receives a cursor and performs the write
+
+        Returns:
+            Future that resolves to the operation's return value
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("WriteQueue is closed")
+            self._requests.put((operation, future))
+        return future
+
+    def execute(self, sql: str, params: Tuple = ()) -> Future:
+        """
+        Queue a single parameterised statement.
+
+        Returns:
+            Future that resolves to the number of rows changed
+        """
+
+        def operation(cursor: sqlite3.Cursor) -> int:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+        return self.submit(operation)
+
+    def add_character(
+        self,
+        name: str,
+        species: str,
+        homeworld: str,
+        height: Optional[int] = None,
+        affiliation: Optional[str] = None,
+    ) -> Future:
+        """Queue an INSERT; the Future resolves to the new character's ID."""
+
+        def operation(cursor: sqlite3.Cursor) -> int:
+            cursor.execute(
+                """
+                INSERT INTO characters (name, species, homeworld, height, affiliation)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (name, species, homeworld, height, affiliation),
+            )
+            return cursor.lastrowid
+
+        return self.submit(operation)
+
+    def update_character_height(self, name: str, new_height: int) -> Future:
+        """Queue a height UPDATE; the Future resolves to rows changed."""
+        return self.execute(
+            "UPDATE characters SET height = ? WHERE name = ?", (new_height, name)
+        )
+
+    def update_character_affiliation(self, name: str, new_affiliation: str) -> Future:
+        """Queue an affiliation UPDATE; the Future resolves to rows changed."""
+        return self.execute(
+            "UPDATE characters SET affiliation = ? WHERE name = ?",
+            (new_affiliation, name),
+        )
+
+    def delete_character(self, name: str) -> Future:
+        """Queue a DELETE by name; the Future resolves to rows deleted."""
+        return self.execute("DELETE FROM characters WHERE name = ?", (name,))
+
+    def delete_characters_by_affiliation(self, affiliation: str) -> Future:
+        """Queue a DELETE by affiliation; the Future resolves to rows deleted."""
+        return self.execute(
+            "DELETE FROM characters WHERE affiliation = ?", (affiliation,)
+        )
+
+    # ============================================
+    # Writer Thread
+    # ============================================
+
+    def _next_batch(self) -> Tuple[list, bool]:
+        """Block for the first request, then gather more until full or timed out."""
+        batch = []
+        stop = False
+
+        item = self._requests.get()
+        if item is _STOP:
+            return batch, True
+        batch.append(item)
+
+        deadline = time.perf_counter() + self.max_batch_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = (
+                    self._requests.get(timeout=remaining)
+                    if remaining > 0
+                    else self._requests.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+
+        return batch, stop
+
+    def _run_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        """Run one batch inside a single transaction and settle its futures."""
+        cursor = conn.cursor()
+        results = []
+
+        cursor.execute("BEGIN IMMEDIATE")
+        for operation, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            cursor.execute("SAVEPOINT write_request")
+            try:
+                value = operation(cursor)
+            except Exception as e:
+                cursor.execute("ROLLBACK TO write_request")
+                cursor.execute("RELEASE write_request")
+                results.append((future, None, e))
+            else:
+                cursor.execute("RELEASE write_request")
+                results.append((future, value, None))
+
+        started = time.perf_counter()
+        try:
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            results = [(future, None, e) for future, _, _ in results]
+        latency = time.perf_counter() - started
+
+        failed = 0
+        for future, value, error in results:
+            if error is None:
+                future.set_result(value)
+            else:
+                failed += 1
+                future.set_exception(error)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._batched_requests += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
+            self._commit_latencies.append(latency)
+            self._completed += len(results) - failed
+            self._failed += failed
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        # isolation_level=None: transactions are controlled explicitly above
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    try:
+                        self._run_batch(conn, batch)
+                    except BaseException as e:
+                        # BEGIN or a savepoint failed, or an operation raised
+                        # something that is not an Exception (KeyboardInterrupt,
+                        # SystemExit): undo the open transaction and fail the
+                        # requests the batch had not settled yet
+                        if conn.in_transaction:
+                            conn.rollback()
+                        for _, future in batch:
+                            if not future.done():
+                                future.set_exception(e)
+                        if not isinstance(e, sqlite3.Error):
+                            raise
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    # ============================================
+    # Metrics and Shutdown
+    # ============================================
+
+    def stats(self) -> dict:
+        """
+        Report queue and commit metrics.
+
+        Commit latency percentiles cover the last LATENCY_WINDOW batches.
+
+        Returns:
+            Dictionary with queue depth, batch size and commit latency figures
+        """
+        with self._stats_lock:
+            batches = self._batches
+            batched_requests = self._batched_requests
+            largest_batch = self._largest_batch
+            latencies = sorted(self._commit_latencies)
+            completed = self._completed
+            failed = self._failed
+
+        def percentile(values: List[float], pct: float) -> Optional[float]:
+            if not values:
+                return None
+            index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+            return values[index]
+
+        return {
+            "queue_depth": self._requests.qsize(),
+            "batches": batches,
+            "completed": completed,
+            "failed": failed,
+            "average_batch_size": (
+                round(batched_requests / batches, 2) if batches else 0
+            ),
+            "max_batch_size": largest_batch,
+            "commit_latency_ms": {
+                "p50": _to_ms(percentile(latencies, 50)),
+                "p95": _to_ms(percentile(latencies, 95)),
+                "max": _to_ms(latencies[-1] if latencies else None),
+            },
+        }
+
+    def close(self) -> None:
+        """Finish all queued writes and stop the writer thread."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._requests.put(_STOP)
+        self._writer.join()
+
+    def __enter__(self) -> "WriteQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[float]:
+    """Convert seconds to milliseconds, rounded for display."""
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+# ============================================
+# Demonstration
+# ============================================
+
+
+def main():
+    """Hammer the queue from several threads and show the group-commit stats."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("=" * 60)
+    print("LESSON 9 EXTENSION: Single-Writer Queue with Group Commit")
+    print("=" * 60)
+
+    with WriteQueue("database/starwars.db") as writes:
+
+        def worker(n: int) -> None:
+            name = f"Clone Trooper {n}"
+            writes.add_character(name, "Human", "Kamino", 183, "Galactic Republic")
+            writes.update_character_height(name, 180).result()
+            writes.delete_character(name).result()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(worker, range(200)))
+
+        stats = writes.stats()
+
+    print(f"✓ Completed {stats['completed']} writes in {stats['batches']} commits")
+    print(f"  Average batch size: {stats['average_batch_size']}")
+    print(f"  Commit latency (ms): {stats['commit_latency_ms']}")
+    if stats["failed"]:
+        print(f"✗ {stats['failed']} writes failed")
+
+
+if __name__ == "__main__":
+    main()
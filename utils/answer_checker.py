@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Bulk SQL Answer Checker - Result-Set Fingerprinting
+
+Checks submitted .sql answer files against the solutions/*.sql scripts
+without keeping full result sets in memory.
+
+Each query result is reduced to a fingerprint WHILE the rows come off the
+cursor:
+
+    - order-insensitive: every row is hashed and the hashes are ADDED
+      together (mod 2^128), so the same rows in any order - including
+      duplicate rows - give the same fingerprint
+    - order-sensitive: rows are fed into one running hash, so order matters
+
+Solution fingerprints are computed once per lesson and cached in a JSON
+file. A submission only needs a full row-by-row comparison when its
+fingerprint does not match, to explain WHAT is different.
+
+Submissions are compared query by query: the Nth statement that returns
+rows in the submission is checked against the Nth one in the solution.
+Every statement (including INSERT / UPDATE / DELETE) runs in order on a
+private clone, so later queries see the same changes as the solution did.
+
+Usage:
+    python utils/answer_checker.py --lesson lesson2_queries submissions/*.sql
+    python utils/answer_checker.py --lesson lesson6_joins --jobs 8 --json grades.json submissions/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from sql_runner import (
+    DEFAULT_BASE_DB,
+    DEFAULT_SCRIPTS,
+    clone_database,
+    split_statements,
+)
+
+DEFAULT_CACHE = Path(".answer_fingerprints.json")
+HASH_MODULUS = 2**128
+
+ORDER_BY_PATTERN = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+PARENTHESES_PATTERN = re.compile(r"\([^()]*\)")
+
+# Statements whose result rows are compared
+QUERY_KEYWORDS = ("SELECT", "WITH", "VALUES", "PRAGMA")
+
+
+# ============================================
+# Fingerprinting
+# ============================================
+
+
+def _encode_value(value) -> bytes:
+    """Encode one column value with a type tag, so 1, 1.0 and '1' differ."""
+    if value is None:
+        return b"n"
+    if isinstance(value, float):
+        # Round away floating-point noise from AVG() and friends
+        return b"f" + repr(round(value, 9)).encode()
+    if isinstance(value, int):
+        return b"i" + str(value).encode()
+    if isinstance(value, bytes):
+        return b"b" + value
+    return b"s" + str(value).encode("utf-8")
+
+
+def row_digest(row: Tuple) -> bytes:
+    """Hash one row into 16 bytes."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for value in row:
+        encoded = _encode_value(value)
+        hasher.update(len(encoded).to_bytes(4, "little"))
+        hasher.update(encoded)
+    return hasher.digest()
+
+
+def fingerprint_rows(rows: Iterable[Tuple], ordered: bool = False) -> Tuple[str, int]:
+    """
+    Fingerprint a stream of rows without storing them.
+
+    Args:
+        rows: Rows to fingerprint - usually the cursor itself
+        ordered: True if row order must match
+
+    Returns:
+        (fingerprint hex string, number of rows)
+    """
+    count = 0
+    if ordered:
+        running = hashlib.blake2b(digest_size=16)
+        for row in rows:
+            running.update(row_digest(row))
+            count += 1
+        return running.hexdigest(), count
+
+    total = 0
+    for row in rows:
+        total = (total + int.from_bytes(row_digest(row), "little")) % HASH_MODULUS
+        count += 1
+    return f"{total:032x}", count
+
+
+def _strip_comments(statement: str) -> str:
+    return "\n".join(line.split("--", 1)[0] for line in statement.splitlines())
+
+
+def is_query(statement: str) -> bool:
+    """Return True if the statement returns rows (SELECT, WITH, ...)."""
+    words = _strip_comments(statement).split(None, 1)
+    return bool(words) and words[0].upper() in QUERY_KEYWORDS
+
+
+def is_ordered_query(statement: str) -> bool:
+    """Return True if the OUTERMOST query has an ORDER BY (not just a subquery)."""
+    code = _strip_comments(statement)
+    # Remove parenthesised subqueries and function calls, innermost first
+    while True:
+        stripped = PARENTHESES_PATTERN.sub(" ", code)
+        if stripped == code:
+            break
+        code = stripped
+    return bool(ORDER_BY_PATTERN.search(code))
+
+
+def diff_rows(expected: List[Tuple], actual: List[Tuple], limit: int = 5) -> dict:
+    """
+    Explain how two result sets differ (used only after a fingerprint mismatch).
+
+    Returns:
+        Dictionary with missing / unexpected rows (up to limit of each)
+    """
+    expected_counts = Counter(expected)
+    actual_counts = Counter(actual)
+    missing = list((expected_counts - actual_counts).elements())
+    unexpected = list((actual_counts - expected_counts).elements())
+    result = {
+        "expected_rows": len(expected),
+        "actual_rows": len(actual),
+        "missing": [list(row) for row in missing[:limit]],
+        "unexpected": [list(row) for row in unexpected[:limit]],
+    }
+    if not missing and not unexpected:
+        result["note"] = "Same rows in a different order"
+    return result
+
+
+# ============================================
+# Checker
+# ============================================
+
+
+class AnswerChecker:
+    """Grades submitted SQL files against one lesson's solution script."""
+
+    def __init__(
+        self,
+        lesson: str,
+        base_path: Optional[Path] = DEFAULT_BASE_DB,
+        scripts: List[Path] = DEFAULT_SCRIPTS,
+        cache_path: Optional[Path] = DEFAULT_CACHE,
+        ordering: str = "auto",
+    ):
+        """
+        Args:
+            lesson: Solution script name, e.g. "lesson2_queries"
+            base_path: Database to start from (None for an empty database)
+            scripts: Lesson scripts in order; earlier ones prepare the clone
+            cache_path: JSON file for solution fingerprints (None disables it)
+            ordering: "auto" (ORDER BY decides), "always" or "never"
+        """
+        if ordering not in ("auto", "always", "never"):
+            raise ValueError("ordering must be 'auto', 'always' or 'never'")
+
+        names = [script.stem for script in scripts]
+        if lesson not in names:
+            raise ValueError(f"Unknown lesson {lesson!r}; expected one of {names}")
+
+        self.lesson = lesson
+        self.base_path = base_path
+        self.ordering = ordering
+        self.cache_path = cache_path
+        self.solution_path = scripts[names.index(lesson)]
+        self.prepare_paths = scripts[: names.index(lesson)]
+
+        self._template = self._build_template()
+        self.solution_statements = split_statements(
+            self.solution_path.read_text(encoding="utf-8")
+        )
+        self.fingerprints = self._load_fingerprints()
+
+    def _build_template(self) -> sqlite3.Connection:
+        """Clone the base database and run the earlier lessons on it once."""
+        template = clone_database(self.base_path)
+        for path in self.prepare_paths:
+            for statement in split_statements(path.read_text(encoding="utf-8")):
+                try:
+                    template.execute(statement).fetchall()
+                except sqlite3.Error:
+                    pass
+            if template.in_transaction:
+                template.rollback()
+        return template
+
+    def fresh_clone(self) -> sqlite3.Connection:
+        """Copy the prepared template (fast: an in-memory page copy)."""
+        clone = sqlite3.connect(":memory:", isolation_level=None)
+        self._template.backup(clone)
+        return clone
+
+    def _ordered(self, solution_statement: str) -> bool:
+        if self.ordering == "auto":
+            return is_ordered_query(solution_statement)
+        return self.ordering == "always"
+
+    # ============================================
+    # Solution Fingerprints (cached)
+    # ============================================
+
+    def _cache_key(self) -> str:
+        """Identify the inputs the solution fingerprints depend on."""
+        hasher = hashlib.sha256(self.ordering.encode())
+        for path in self.prepare_paths + [self.solution_path]:
+            hasher.update(path.read_bytes())
+        if self.base_path is not None:
+            stat = self.base_path.stat()
+            hasher.update(
+                f"{self.base_path}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+            )
+        return hasher.hexdigest()
+
+    def _load_fingerprints(self) -> List[dict]:
+        """Return cached solution fingerprints, computing them if stale."""
+        key = self._cache_key()
+        cache = {}
+        if self.cache_path is not None and self.cache_path.exists():
+            try:
+                cache = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                cache = {}
+
+        entry = cache.get(self.lesson)
+        if entry and entry.get("key") == key:
+            return entry["queries"]
+
+        queries = self._fingerprint_statements(self.solution_statements, solution=True)
+        if self.cache_path is not None:
+            cache[self.lesson] = {"key": key, "queries": queries}
+            self.cache_path.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+        return queries
+
+    def _fingerprint_statements(
+        self, statements: List[str], solution: bool = False
+    ) -> List[dict]:
+        """Run statements on a fresh clone and fingerprint each result set."""
+        conn = self.fresh_clone()
+        results = []
+        try:
+            for index, statement in enumerate(statements):
+                try:
+                    cursor = conn.execute(statement)
+                except sqlite3.Error as e:
+                    # A failed query still uses up its slot in the submission
+                    if not solution and is_query(statement):
+                        results.append({"statement": index, "error": str(e)})
+                    continue
+                if cursor.description is None:
+                    continue
+
+                query_number = len(results)
+                if solution:
+                    ordered = self._ordered(statement)
+                elif query_number < len(self.fingerprints):
+                    ordered = self.fingerprints[query_number]["ordered"]
+                else:
+                    ordered = False
+
+                digest, count = fingerprint_rows(cursor, ordered)
+                results.append(
+                    {
+                        "statement": index,
+                        "ordered": ordered,
+                        "fingerprint": digest,
+                        "rows": count,
+                    }
+                )
+        finally:
+            conn.close()
+        return results
+
+    def _rows_at(self, statements: List[str], target: int) -> List[Tuple]:
+        """Replay statements up to target on a fresh clone and return its rows."""
+        conn = self.fresh_clone()
+        try:
+            for statement in statements[:target]:
+                try:
+                    conn.execute(statement).fetchall()
+                except sqlite3.Error:
+                    pass
+            try:
+                return conn.execute(statements[target]).fetchall()
+            except sqlite3.Error:
+                return []
+        finally:
+            conn.close()
+
+    # ============================================
+    # Grading
+    # ============================================
+
+    def check_sql(self, script: str, name: str = "<submission>") -> dict:
+        """
+        Grade one submitted SQL script.
+
+        Args:
+            script: Submitted SQL text
+            name: Label for the report
+
+        Returns:
+            Dictionary with score, total and per-query results
+        """
+        statements = split_statements(script)
+        submitted = self._fingerprint_statements(statements)
+
+        queries = []
+        for number, expected in enumerate(self.fingerprints):
+            actual = submitted[number] if number < len(submitted) else None
+            result = {"query": number + 1, "correct": False}
+
+            if actual is None:
+                result["detail"] = "No matching query in submission"
+            elif "error" in actual:
+                result["detail"] = f"Error: {actual['error']}"
+            elif actual["fingerprint"] == expected["fingerprint"]:
+                result["correct"] = True
+            else:
+                # Only now pay for materialising both result sets
+                result["detail"] = diff_rows(
+                    self._rows_at(self.solution_statements, expected["statement"]),
+                    self._rows_at(statements, actual["statement"]),
+                )
+                if expected["ordered"] and "note" in result["detail"]:
+                    result["detail"]["note"] = "Correct rows, wrong order"
+            queries.append(result)
+
+        score = sum(1 for query in queries if query["correct"])
+        return {
+            "submission": name,
+            "score": score,
+            "total": len(queries),
+            "queries": queries,
+        }
+
+    def check_file(self, path: Path) -> dict:
+        """Grade one submitted .sql file."""
+        return self.check_sql(path.read_text(encoding="utf-8"), str(path))
+
+
+# ============================================
+# Parallel Grading
+# ============================================
+
+_worker_checker: Optional[AnswerChecker] = None
+
+
+def _init_worker(options: dict) -> None:
+    """Build one checker per worker process (solution fingerprints come from cache)."""
+    global _worker_checker
+    _worker_checker = AnswerChecker(**options)
+
+
+def _check_in_worker(path: str) -> dict:
+    return _worker_checker.check_file(Path(path))
+
+
+def check_files(paths: List[Path], options: dict, jobs: int = 0) -> List[dict]:
+    """
+    Grade many submission files, in parallel when jobs != 1.
+
+    Args:
+        paths: Submission files
+        options: Keyword arguments for AnswerChecker
+        jobs: Worker processes (0 = one per CPU)
+
+    Returns:
+        One grade dictionary per file, in the order given
+    """
+    # Build (and cache) the solution fingerprints once before forking workers
+    checker = AnswerChecker(**options)
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(paths) < 2:
+        return [checker.check_file(path) for path in paths]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(options,)
+    ) as pool:
+        return list(pool.map(_check_in_worker, map(str, paths), chunksize=16))
+
+
+def expand_paths(inputs: List[str]) -> List[Path]:
+    """Turn files and directories into a sorted list of .sql files."""
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(sorted(path.rglob("*.sql")))
+        else:
+            paths.append(path)
+    return paths
+
+
+def main():
+    """Handle command line arguments and grade the submissions."""
+    lessons = [script.stem for script in DEFAULT_SCRIPTS]
+    parser = argparse.ArgumentParser(
+        description="Grade SQL submissions against a solution using result fingerprints"
+    )
+    parser.add_argument(
+        "submissions", nargs="+", help="Submission .sql files or folders"
+    )
+    parser.add_argument(
+        "--lesson",
+        required=True,
+        choices=lessons,
+        help="Solution script to mark against",
+    )
+    parser.add_argument(
+        "--base",
+        type=str,
+        default=str(DEFAULT_BASE_DB),
+        help=f"Base database (default: {DEFAULT_BASE_DB.as_posix()})",
+    )
+    parser.add_argument(
+        "--empty-base",
+        action="store_true",
+        help="Start from an empty database and build it from the earlier lessons",
+    )
+    parser.add_argument(
+        "--ordering",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="Row order check: auto (when the solution uses ORDER BY), always or never",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=str(DEFAULT_CACHE),
+        help=f"Solution fingerprint cache (default: {DEFAULT_CACHE})",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=0, help="Worker processes (default: one per CPU)"
+    )
+    parser.add_argument("--json", type=str, help="Write full results to a JSON file")
+    args = parser.parse_args()
+
+    paths = expand_paths(args.submissions)
+    missing = [path for path in paths if not path.exists()]
+    if missing:
+        print(f"❌ Submission not found: {', '.join(map(str, missing))}")
+        sys.exit(1)
+
+    options = {
+        "lesson": args.lesson,
+        "base_path": None if args.empty_base else Path(args.base),
+        "cache_path": Path(args.cache),
+        "ordering": args.ordering,
+    }
+
+    started = time.perf_counter()
+    grades = check_files(paths, options, args.jobs)
+    elapsed = time.perf_counter() - started
+
+    for grade in grades:
+        print(
+            f"{'✓' if grade['score'] == grade['total'] else '✗'} "
+            f"{grade['submission']}: {grade['score']}/{grade['total']}"
+        )
+
+    rate = len(grades) / elapsed * 60 if elapsed else 0
+    print(f"\n📊 Graded {len(grades)} submissions in {elapsed:.2f} s ({rate:,.0f}/min)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(grades, f, indent=2, default=str)
+        print(f"📁 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
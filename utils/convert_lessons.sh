@@ -6,14 +6,31 @@ echo "Converting SQL Lessons from Markdown to PDF"
 echo "=================================================="
 echo ""
 
-# Check if dependencies are installed
-if ! python3 -c "import weasyprint" 2>/dev/null; then
+# Navigate to project root if script is run from utils/
+if [ "$(basename "$PWD")" = "utils" ]; then
+    cd ..
+fi
+
+# The converter imports WeasyPrint only when a PDF needs rebuilding, so an
+# up-to-date run never pays for it. It exits with status 3 if a package it
+# needs is missing.
+convert() {
+    python3 utils/md_to_pdf.py --directory "other_formats/markdown_lessons" --output-dir "other_formats/pdf_lessons"
+}
+
+convert
+status=$?
+
+if [ "$status" -eq 3 ]; then
+    echo ""
     echo "⚠️  Dependencies not installed!"
     echo ""
     echo "Would you like to install them now? (y/n)"
     read -r response
     if [[ "$response" =~ ^[Yy]$ ]]; then
         bash utils/install_dependencies.sh
+        convert
+        status=$?
     else
         echo "❌ Cannot proceed without dependencies."
         echo "Run: bash utils/install_dependencies.sh"
@@ -21,14 +38,10 @@ if ! python3 -c "import weasyprint" 2>/dev/null; then
     fi
 fi
 
-# Navigate to project root if script is run from utils/
-if [ "$(basename "$PWD")" = "utils" ]; then
-    cd ..
+if [ "$status" -ne 0 ]; then
+    exit "$status"
 fi
 
-# Run the conversion
-python3 utils/md_to_pdf.py --directory "other_formats/markdown_lessons" --output-dir "other_formats/pdf_lessons" --verbose
-
 echo ""
 echo "=================================================="
 echo "✓ Conversion Complete!"
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Database Compaction - Free Pages, Fragmentation and Page Size
+
+Deleting rows (lesson 7, delete_characters_by_affiliation...) does not make
+a SQLite file smaller. The freed pages go on a "freelist" to be reused, and
+the pages still in use end up scattered through the file, so full table
+scans read more of the disk than they need to.
+
+This tool measures that and fixes it:
+
+    1. Report: file size, free pages, and per table/index size and
+       fragmentation (from the dbstat virtual table)
+    2. Compact, one of:
+         --incremental   PRAGMA incremental_vacuum - hands free pages back
+                         to the filesystem (needs auto_vacuum=INCREMENTAL)
+         --vacuum        full VACUUM in place - rewrites every table in order
+         --vacuum-into   VACUUM INTO a new file - the original is untouched
+    3. Optionally change the page size while rewriting (--page-size)
+    4. Report again, with full-scan timings before and after
+
+Fragmentation is the share of leaf pages in a table or index that do not
+directly follow the previous leaf - a freshly vacuumed table is close to 0%.
+
+Usage:
+    python utils/db_compact.py                          # report only
+    python utils/db_compact.py --vacuum-into database/starwars_compact.db
+    python utils/db_compact.py --vacuum --page-size 8192
+    python utils/db_compact.py --enable-incremental     # one-off VACUUM
+    python utils/db_compact.py --incremental
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB = Path("database/starwars.db")
+
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+# ============================================
+# Measuring
+# ============================================
+
+
+def object_stats(conn: sqlite3.Connection) -> Optional[List[Dict]]:
+    """
+    Size and fragmentation of every table and index, from dbstat.
+
+    Returns:
+        List of dictionaries (largest first), or None if this SQLite build
+        does not include the dbstat virtual table
+    """
+    try:
+        rows = conn.execute(
+            "SELECT name, pageno, pagetype, pgsize, unused FROM dbstat "
+            "ORDER BY name, path"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+
+    objects: Dict[str, Dict] = {}
+    previous: Dict[str, int] = {}
+    for name, pageno, pagetype, pgsize, unused in rows:
+        stats = objects.setdefault(
+            name,
+            {
+                "name": name,
+                "pages": 0,
+                "leaves": 0,
+                "bytes": 0,
+                "unused": 0,
+                "jumps": 0,
+            },
+        )
+        stats["pages"] += 1
+        stats["bytes"] += pgsize
+        stats["unused"] += unused
+        if pagetype != "leaf":
+            continue
+        # Leaves are listed in key order - the order a full scan reads them -
+        # so count every leaf that does not directly follow the previous one
+        stats["leaves"] += 1
+        if name in previous and pageno != previous[name] + 1:
+            stats["jumps"] += 1
+        previous[name] = pageno
+
+    for stats in objects.values():
+        stats["fill"] = 1 - stats["unused"] / stats["bytes"] if stats["bytes"] else 0
+        stats["fragmentation"] = (
+            stats["jumps"] / (stats["leaves"] - 1) if stats["leaves"] > 1 else 0.0
+        )
+    return sorted(objects.values(), key=lambda s: s["bytes"], reverse=True)
+
+
+def scan_time(db_path: Path, repeat: int = 5) -> float:
+    """
+    Median seconds to read every row of every table on a new connection.
+
+    A new connection each time means SQLite's page cache starts empty (the
+    operating system's file cache does not).
+    """
+    samples = []
+    for _ in range(repeat):
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            tables = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                )
+            ]
+            started = time.perf_counter()
+            for table in tables:
+                for _ in conn.execute(f'SELECT * FROM "{table}"'):
+                    pass
+            samples.append(time.perf_counter() - started)
+        finally:
+            conn.close()
+    return statistics.median(samples)
+
+
+def storage_report(db_path: Path, repeat: int = 5) -> Dict:
+    """
+    Measure a database file.
+
+    Returns:
+        Dictionary with file size, page counts, auto_vacuum mode, per-object
+        statistics and the full-scan time
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        objects = object_stats(conn)
+    finally:
+        conn.close()
+
+    return {
+        "path": str(db_path),
+        "file_size": db_path.stat().st_size,
+        "page_size": page_size,
+        "page_count": page_count,
+        "free_pages": free_pages,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+        "objects": objects,
+        "scan_seconds": scan_time(db_path, repeat),
+    }
+
+
+def print_report(report: Dict, title: str) -> None:
+    """Print a storage report."""
+    free_share = (
+        report["free_pages"] / report["page_count"] if report["page_count"] else 0
+    )
+    print(f"\n📊 {title}: {report['path']}")
+    print(
+        f"   File size:   {report['file_size'] / 1024:,.1f} KiB "
+        f"({report['page_count']:,} pages of {report['page_size']:,} bytes)"
+    )
+    print(f"   Free pages:  {report['free_pages']:,} ({free_share:.1%})")
+    print(f"   auto_vacuum: {report['auto_vacuum']}")
+    print(f"   Full scan:   {report['scan_seconds'] * 1000:.2f} ms")
+
+    if report["objects"] is None:
+        print("   (this SQLite build has no dbstat table - per-object sizes skipped)")
+        return
+    print(f"\n   {'Table / index':<36} {'Pages':>7} {'KiB':>9} {'Fill':>6} {'Frag':>6}")
+    for s in report["objects"]:
+        print(
+            f"   {s['name'][:36]:<36} {s['pages']:>7,} {s['bytes'] / 1024:>9,.1f} "
+            f"{s['fill']:>6.0%} {s['fragmentation']:>6.0%}"
+        )
+
+
+def print_comparison(before: Dict, after: Dict) -> None:
+    """Print the headline before/after numbers side by side."""
+    print(f"\n{'':<14} {'Before':>12} {'After':>12}")
+    print(
+        f"{'File KiB':<14} {before['file_size'] / 1024:>12,.1f} "
+        f"{after['file_size'] / 1024:>12,.1f}"
+    )
+    print(f"{'Free pages':<14} {before['free_pages']:>12,} {after['free_pages']:>12,}")
+    print(f"{'Page size':<14} {before['page_size']:>12,} {after['page_size']:>12,}")
+    print(
+        f"{'Full scan ms':<14} {before['scan_seconds'] * 1000:>12.2f} "
+        f"{after['scan_seconds'] * 1000:>12.2f}"
+    )
+
+
+# ============================================
+# Compacting
+# ============================================
+
+
+def _prepare(conn: sqlite3.Connection, page_size: Optional[int]) -> None:
+    """Apply a new page size; it takes effect when the file is rewritten."""
+    if page_size:
+        if page_size & (page_size - 1) or not 512 <= page_size <= 65536:
+            raise ValueError("Page size must be a power of two from 512 to 65536")
+        conn.execute(f"PRAGMA page_size = {page_size}")
+
+
+def vacuum_in_place(
+    db_path: Path, page_size: Optional[int] = None, auto_vacuum: Optional[str] = None
+) -> None:
+    """
+    Rewrite the database in place with VACUUM.
+
+    Args:
+        db_path: Database to compact
+        page_size: Optional new page size
+        auto_vacuum: Optional new auto_vacuum mode (NONE, FULL, INCREMENTAL)
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        # VACUUM keeps a WAL database's page size, so leave WAL for the rewrite
+        wal = conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        if wal and page_size:
+            conn.execute("PRAGMA journal_mode = DELETE")
+        try:
+            _prepare(conn, page_size)
+            if auto_vacuum:
+                conn.execute(f"PRAGMA auto_vacuum = {auto_vacuum}")
+            conn.execute("VACUUM")
+        finally:
+            if wal and page_size:
+                conn.execute("PRAGMA journal_mode = WAL")
+    finally:
+        conn.close()
+
+
+def vacuum_into(db_path: Path, target: Path, page_size: Optional[int] = None) -> None:
+    """
+    Write a compacted copy of the database to a new file with VACUUM INTO.
+
+    The original file is not changed, so this is safe while others are
+    using it.
+    """
+    if target.exists():
+        raise FileExistsError(f"Target already exists: {target}")
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        _prepare(conn, page_size)
+        conn.execute("VACUUM INTO ?", (str(target),))
+    finally:
+        conn.close()
+
+
+def incremental_vacuum(db_path: Path, pages: int = 0) -> int:
+    """
+    Return free pages to the filesystem without rewriting the tables.
+
+    Args:
+        db_path: Database to shrink (must use auto_vacuum=INCREMENTAL)
+        pages: Free pages to release; 0 releases all of them
+
+    Returns:
+        Number of pages released
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if AUTO_VACUUM_MODES.get(mode) != "INCREMENTAL":
+            raise ValueError(
+                "auto_vacuum is not INCREMENTAL - run once with "
+                "--enable-incremental (a full VACUUM) first"
+            )
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # incremental_vacuum returns a row per step, so read them all
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return before - after
+    finally:
+        conn.close()
+
+
+def _acting(args: argparse.Namespace) -> bool:
+    """True when the command line asks for a change, not just a report."""
+    return bool(
+        args.vacuum
+        or args.vacuum_into
+        or args.enable_incremental
+        or args.incremental is not None
+    )
+
+
+def main():
+    """Handle command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure and compact the Star Wars database file"
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=str(DEFAULT_DB),
+        help=f"Database file (default: {DEFAULT_DB.as_posix()})",
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        "--incremental",
+        nargs="?",
+        type=int,
+        const=0,
+        metavar="PAGES",
+        help="Release free pages (all of them unless PAGES is given)",
+    )
+    action.add_argument("--vacuum", action="store_true", help="Full VACUUM in place")
+    action.add_argument(
+        "--vacuum-into", type=str, metavar="FILE", help="VACUUM INTO a new file"
+    )
+    action.add_argument(
+        "--enable-incremental",
+        action="store_true",
+        help="Switch to auto_vacuum=INCREMENTAL (runs a full VACUUM)",
+    )
+    parser.add_argument(
+        "--page-size", type=int, help="New page size for --vacuum / --vacuum-into"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Full scans to time (median is shown)"
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    db_path = Path(args.db)
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        sys.exit(1)
+    if args.page_size and not (
+        args.vacuum or args.vacuum_into or args.enable_incremental
+    ):
+        print("❌ --page-size needs --vacuum, --vacuum-into or --enable-incremental")
+        sys.exit(1)
+
+    before = storage_report(db_path, args.repeat)
+    print_report(before, "Before" if _acting(args) else "Storage report")
+    if not _acting(args):
+        return
+
+    after_path = db_path
+    started = time.perf_counter()
+    try:
+        if args.vacuum_into:
+            after_path = Path(args.vacuum_into)
+            vacuum_into(db_path, after_path, args.page_size)
+        elif args.vacuum:
+            vacuum_in_place(db_path, args.page_size)
+        elif args.enable_incremental:
+            vacuum_in_place(db_path, args.page_size, auto_vacuum="INCREMENTAL")
+        else:
+            released = incremental_vacuum(db_path, args.incremental)
+            print(f"\n✓ Released {released:,} free pages")
+    except (ValueError, FileExistsError, sqlite3.Error) as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    print(f"\n✓ Compaction took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    after = storage_report(after_path, args.repeat)
+    print_report(after, "After")
+    print_comparison(before, after)
+    if after_path != db_path:
+        print(f"\n💡 Original left unchanged; compacted copy written to {after_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,24 +39,50 @@ Dependencies:
 
 import sys
 import argparse
+import contextlib
+import hashlib
+import json
+import os
 import re
+import time
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 # Project directory conventions
 DEFAULT_SOURCE_DIR = Path("other_formats/markdown_lessons")
 DEFAULT_OUTPUT_DIR = Path("other_formats/pdf_lessons")
 
-# Attempt to import required dependencies with graceful failure
-try:
-    from weasyprint import HTML, CSS
+# Build manifest kept in each output directory for incremental builds
+MANIFEST_NAME = ".md_to_pdf_manifest.json"
 
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
-    weasyprint_error = """
-❌ WeasyPrint not available. This is the preferred PDF generation library.
+# Bump whenever a change to this script alters the PDFs it produces, so
+# incremental builds re-render everything once
+CONVERTER_VERSION = "2"
 
+# Markdown images: ![alt](path "title")
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)(?:\s+"([^"]*)")?\)')
+
+# GitHub-style callouts and the styled <div> each one opens
+CALLOUTS = (
+    ("> **Note:**", '<div class="info">**Note:**'),
+    ("> **Warning:**", '<div class="warning">**Warning:**'),
+    ("> **Important:**", '<div class="warning">**Important:**'),
+)
+
+PAGE_BREAK_DIV = '<div class="page-break"></div>'
+
+# Heavy dependencies are imported on first use (see load_markdown and
+# load_weasyprint), so --help, argument errors and builds where every PDF is
+# up to date never pay for them
+markdown = None
+HTML = None
+CSS = None
+
+# Languages whose lexers are created up front; nearly every code block in the
+# lessons is one of these
+FAST_PATH_LANGUAGES = ("sql", "python")
+
+WEASYPRINT_INSTALL_HELP = """
 🔧 Installation options:
 
 1. Ubuntu/Debian (recommended for Codespaces):
@@ -72,35 +98,303 @@ except ImportError:
     and GitHub-like formatting.
 """
 
-try:
-    import markdown
-    import markdown.extensions.extra
-except ImportError as e:
-    print(f"❌ Missing required markdown dependencies: {e}")
-    print("📦 Install with: pip install markdown")
-    sys.exit(1)
+
+class DependencyError(RuntimeError):
+    """A package needed for conversion is missing or cannot be loaded."""
+
+
+# Exit status when a conversion needs a package that is missing (see
+# convert_lessons.sh, which offers to install the dependencies)
+EXIT_MISSING_DEPENDENCY = 3
+
+
+def load_markdown() -> None:
+    """Import markdown and Pygments, with cached highlighting, on first use."""
+    global markdown
+    if markdown is not None:
+        return
+    try:
+        import md_to_pdf_highlight
+        import markdown as markdown_module
+    except ImportError as e:
+        raise DependencyError(
+            f"❌ Missing required markdown dependencies: {e}\n"
+            "📦 Install with: pip install markdown pygments"
+        ) from e
+    md_to_pdf_highlight.install()
+    markdown = markdown_module
+
+
+def load_weasyprint() -> None:
+    """Import WeasyPrint on first use."""
+    global HTML, CSS
+    if HTML is not None:
+        return
+    try:
+        from weasyprint import CSS as weasyprint_css
+        from weasyprint import HTML as weasyprint_html
+    except (ImportError, OSError) as e:
+        # OSError: installed, but its system libraries (pango...) are missing
+        raise DependencyError(
+            f"❌ WeasyPrint not available ({e}). This is the preferred PDF "
+            f"generation library.\n{WEASYPRINT_INSTALL_HELP}"
+        ) from e
+    HTML, CSS = weasyprint_html, weasyprint_css
+
+
+def package_version(name: str) -> Optional[str]:
+    """Installed version of a package, read without importing it."""
+    from importlib import metadata
+
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+class BuildManifest:
+    """
+    Remembers the build key of every PDF in an output directory.
+
+    A PDF whose recorded key still matches the key of its source (see
+    MarkdownToPdfConverter.build_key) is up to date and is not rebuilt.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.path = output_dir / MANIFEST_NAME
+        self.changed = False
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _entry_name(self, output_file: Path) -> str:
+        try:
+            return output_file.relative_to(self.output_dir).as_posix()
+        except ValueError:
+            return output_file.as_posix()
+
+    def is_current(self, output_file: Path, key: Optional[str]) -> bool:
+        """True if the PDF exists and was built from exactly these inputs."""
+        return (
+            key is not None
+            and output_file.exists()
+            and self.entries.get(self._entry_name(output_file)) == key
+        )
+
+    def record(self, output_file: Path, key: Optional[str]) -> None:
+        """Remember the key of a PDF that was just built."""
+        if key is not None:
+            self.entries[self._entry_name(output_file)] = key
+            self.changed = True
+
+    def save(self) -> None:
+        """Write the manifest (atomically) if anything was recorded."""
+        if not self.changed:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(
+            json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8"
+        )
+        os.replace(temp_path, self.path)
+        self.changed = False
+
+
+class ConversionProfiler:
+    """
+    Records wall time, CPU time and peak memory for each conversion stage.
+
+    Stages, in order:
+
+        read        load the markdown file
+        preprocess  image paths, callouts and page breaks
+        markdown    markdown to HTML (including syntax highlighting)
+        layout      WeasyPrint parses the HTML and lays out the pages
+        write       WeasyPrint writes the PDF file
+
+    Peak memory is the most Python memory allocated during a stage, from
+    tracemalloc. Tracing slows Python code down, so profiled times are
+    higher than in a normal run; compare stages with each other.
+    """
+
+    STAGES = ("read", "preprocess", "markdown", "layout", "write")
+
+    def __init__(self):
+        import tracemalloc  # only profiled runs pay for the import
+
+        self.files: List[dict] = []
+        self.current: Optional[dict] = None
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+    def begin_file(self, input_file: Path, output_file: Path) -> None:
+        """Start recording the stages of one file."""
+        import tracemalloc
+
+        self.current = {
+            "file": str(input_file),
+            "output": str(output_file),
+            "success": False,
+            "stages": {},
+            "_started": (time.perf_counter(), time.process_time()),
+            "_base": tracemalloc.get_traced_memory()[0],
+            "_peak": 0,
+        }
+
+    def end_file(self, success: bool) -> None:
+        """Finish the current file and add it to the results."""
+        record = self.current
+        wall, cpu = record.pop("_started")
+        record.pop("_base")
+        record["success"] = success
+        record["total"] = {
+            "wall_ms": (time.perf_counter() - wall) * 1000,
+            "cpu_ms": (time.process_time() - cpu) * 1000,
+            "peak_kib": record.pop("_peak") / 1024,
+        }
+        self.files.append(record)
+        self.current = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure one stage of the current file."""
+        import tracemalloc
+
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.current["stages"][name] = {
+                "wall_ms": (time.perf_counter() - wall) * 1000,
+                "cpu_ms": (time.process_time() - cpu) * 1000,
+                "peak_kib": (peak - memory_before) / 1024,
+            }
+            self.current["_peak"] = max(
+                self.current["_peak"], peak - self.current["_base"]
+            )
+
+    def slowest(self, count: int) -> List[dict]:
+        """The `count` slowest successfully converted files."""
+        converted = [record for record in self.files if record["success"]]
+        converted.sort(key=lambda record: record["total"]["wall_ms"], reverse=True)
+        return converted[:count]
+
+    def report(self, **details) -> dict:
+        """
+        Build the JSON report.
+
+        Args:
+            details: Extra fields to include (page break mode...)
+
+        Returns:
+            Dictionary with per-file stages and per-stage totals
+        """
+        totals = {
+            name: {
+                "wall_ms": sum(
+                    record["stages"].get(name, {}).get("wall_ms", 0)
+                    for record in self.files
+                ),
+                "cpu_ms": sum(
+                    record["stages"].get(name, {}).get("cpu_ms", 0)
+                    for record in self.files
+                ),
+            }
+            for name in self.STAGES
+        }
+        return {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            **details,
+            "stage_totals": totals,
+            "files": self.files,
+        }
+
+    def print_table(self) -> None:
+        """Print wall ms per stage, total CPU ms and peak memory per file."""
+        if not self.files:
+            return
+        names = [Path(record["file"]).name for record in self.files]
+        width = max(len("File"), *(len(name) for name in names))
+        print("\n📊 Time per stage (wall ms), CPU ms and peak Python memory")
+        print(
+            f"{'File':<{width}} "
+            + " ".join(f"{name:>10}" for name in self.STAGES)
+            + f" {'Total':>10} {'CPU':>10} {'Peak MiB':>9}"
+        )
+        for name, record in zip(names, self.files):
+            cells = [
+                (
+                    f"{record['stages'][stage]['wall_ms']:>10.1f}"
+                    if stage in record["stages"]
+                    else f"{'-':>10}"
+                )
+                for stage in self.STAGES
+            ]
+            total = record["total"]
+            print(
+                f"{name:<{width}} "
+                + " ".join(cells)
+                + f" {total['wall_ms']:>10.1f} {total['cpu_ms']:>10.1f}"
+                + f" {total['peak_kib'] / 1024:>9.1f}"
+                + ("" if record["success"] else "  ❌")
+            )
+
+        totals = self.report()["stage_totals"]
+        overall = sum(stage["wall_ms"] for stage in totals.values()) or 1
+        print(
+            f"{'Share':<{width}} "
+            + " ".join(
+                f"{totals[stage]['wall_ms'] / overall:>10.1%}" for stage in self.STAGES
+            )
+        )
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        import tracemalloc
+
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
 
 
 class MarkdownToPdfConverter:
     """Converts Markdown documents to PDF with GitHub-style formatting."""
 
-    def __init__(self, verbose: bool = False, page_break_mode: str = "sections"):
+    # Parsed WeasyPrint stylesheets, one per page break mode. The CSS is the
+    # same for every file, so it is parsed once per process, not per file.
+    _stylesheet_cache: Dict[str, "CSS"] = {}
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        page_break_mode: str = "sections",
+        force: bool = False,
+    ):
         self.verbose = verbose
+        self.force = force  # rebuild even when the manifest says up to date
         self.converted_count = 0
+        self.skipped_count = 0
         self.page_break_mode = page_break_mode  # "sections" or "continuous"
+        self.timings: List[Tuple[Path, float]] = []  # (input file, seconds)
+        self.failures: List[Tuple[Path, str]] = []  # (input file, error)
+        self._markdown_parser: Optional["markdown.Markdown"] = None
+        self.profiler: Optional[ConversionProfiler] = None  # set for --profile
 
         # Validate page break mode
         if page_break_mode not in ["sections", "continuous"]:
             raise ValueError("page_break_mode must be 'sections' or 'continuous'")
 
-        # Check for WeasyPrint availability
-        if not WEASYPRINT_AVAILABLE:
-            print(weasyprint_error)
-            print(
-                "❌ Cannot proceed without WeasyPrint. "
-                "Please install dependencies first."
-            )
-            sys.exit(1)
+    def stage(self, name: str) -> contextlib.AbstractContextManager:
+        """Time a conversion stage when a profiler is attached."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(name)
 
     def log(self, message: str) -> None:
         """Print verbose log messages with British English styling."""
@@ -380,8 +674,49 @@ class MarkdownToPdfConverter:
         }}
         """
 
-    def setup_markdown_parser(self) -> markdown.Markdown:
+    def get_stylesheet(self) -> "CSS":
+        """Return the parsed GitHub stylesheet for this page break mode."""
+        stylesheet = self._stylesheet_cache.get(self.page_break_mode)
+        if stylesheet is None:
+            load_weasyprint()
+            self.log(f"🎨 Parsing stylesheet ({self.page_break_mode} mode)")
+            stylesheet = CSS(string=self.get_github_css())
+            self._stylesheet_cache[self.page_break_mode] = stylesheet
+        return stylesheet
+
+    def measure_stylesheet_cache(self, runs: int = 20) -> Dict[str, float]:
+        """
+        Measure the time the stylesheet cache saves for each file.
+
+        Before the cache, every file parsed the stylesheet twice: once from
+        the inline <style> block and once from CSS(string=...).
+
+        Returns:
+            Dictionary with parse_ms (one parse), cached_ms (one cache
+            lookup) and saved_per_file_ms
+        """
+        load_weasyprint()
+        css = self.get_github_css()
+        started = time.perf_counter()
+        for _ in range(runs):
+            CSS(string=css)
+        parse_ms = (time.perf_counter() - started) * 1000 / runs
+
+        self.get_stylesheet()
+        started = time.perf_counter()
+        for _ in range(runs):
+            self.get_stylesheet()
+        cached_ms = (time.perf_counter() - started) * 1000 / runs
+
+        return {
+            "parse_ms": parse_ms,
+            "cached_ms": cached_ms,
+            "saved_per_file_ms": 2 * parse_ms - cached_ms,
+        }
+
+    def setup_markdown_parser(self) -> "markdown.Markdown":
         """Configure markdown parser with extensions for educational content."""
+        load_markdown()
         extensions = [
             "markdown.extensions.extra",  # Tables, fenced code, etc.
             "markdown.extensions.codehilite",  # Syntax highlighting
@@ -407,131 +742,173 @@ class MarkdownToPdfConverter:
             output_format="html5",
         )
 
-    def preprocess_markdown(self, content: str, input_file: Path) -> str:
-        """Preprocess markdown content for better PDF conversion."""
-        # Fix relative image paths to be absolute paths
-        content = self.fix_image_paths(content, input_file)
-
-        # Replace GitHub-style alerts with custom classes
-        content = re.sub(
-            r"> \*\*Note:\*\*(.*?)(?=\n\n|\n$|\Z)",
-            r'<div class="info">**Note:**\1</div>',
-            content,
-            flags=re.DOTALL | re.MULTILINE,
-        )
+    def get_markdown_parser(self) -> "markdown.Markdown":
+        """
+        Return this converter's Markdown parser, reset for a new document.
 
-        content = re.sub(
-            r"> \*\*Warning:\*\*(.*?)(?=\n\n|\n$|\Z)",
-            r'<div class="warning">**Warning:**\1</div>',
-            content,
-            flags=re.DOTALL | re.MULTILINE,
-        )
+        Building a parser loads and configures five extensions, so one parser
+        is built per converter and reset between documents. The first build
+        also loads the lexers for FAST_PATH_LANGUAGES, and highlights an
+        untagged block so guess_lang imports every lexer it tries up front.
+        """
+        if self._markdown_parser is None:
+            self._markdown_parser = self.setup_markdown_parser()
+            for language in FAST_PATH_LANGUAGES + ("",):
+                self._markdown_parser.convert(f"```{language}\npass\n```")
+                self._markdown_parser.reset()
+        else:
+            self._markdown_parser.reset()
+        return self._markdown_parser
 
-        content = re.sub(
-            r"> \*\*Important:\*\*(.*?)(?=\n\n|\n$|\Z)",
-            r'<div class="warning">**Important:**\1</div>',
-            content,
-            flags=re.DOTALL | re.MULTILINE,
-        )
+    def preprocess_markdown(self, content: str, input_file: Path) -> str:
+        """
+        Preprocess markdown content for better PDF conversion.
 
-        # Add page breaks before major sections (## headings) based on mode
-        if self.page_break_mode == "sections":
-            lines = content.split("\n")
-            processed_lines = []
-
-            for i, line in enumerate(lines):
-                # Don't add page break before the first heading
-                if line.startswith("## ") and i > 0:
-                    # Check if previous line isn't already a page break
-                    page_break_div = '<div class="page-break"></div>'
-                    if (
-                        processed_lines
-                        and not processed_lines[-1].strip() == page_break_div
-                    ):
-                        processed_lines.append(page_break_div)
-                        processed_lines.append("")
+        A single pass over the lines does all three jobs, so the work grows
+        linearly with the document:
 
-                processed_lines.append(line)
+            - image paths become file:// URLs (see rewrite_image)
+            - "> **Note:**", "> **Warning:**" and "> **Important:**" open a
+              styled <div> that closes at the end of the paragraph (the next
+              empty line); each kind is wrapped once per paragraph
+            - in sections mode, a page break goes before every "## " heading
+              except one on the first line
 
-            content = "\n".join(processed_lines)
+        Image markup must sit on one line to be rewritten.
+        """
+        section_breaks = self.page_break_mode == "sections"
+        processed_lines: List[str] = []
+        open_callouts: List[str] = []  # callouts opened in this paragraph
+        images_changed = False
+
+        for i, line in enumerate(content.split("\n")):
+            if not line:
+                # An empty line ends the paragraph and its callouts
+                if open_callouts:
+                    processed_lines[-1] += "</div>" * len(open_callouts)
+                    open_callouts = []
+                processed_lines.append(line)
+                continue
+
+            # Fix relative image paths to be absolute paths
+            if "![" in line:
+                rewritten = IMAGE_PATTERN.sub(
+                    lambda match: self.rewrite_image(match, input_file), line
+                )
+                images_changed = images_changed or rewritten != line
+                line = rewritten
+
+            # Replace GitHub-style alerts with custom classes
+            if "> **" in line:
+                for marker, opening in CALLOUTS:
+                    if marker not in open_callouts and marker in line:
+                        line = line.replace(marker, opening, 1)
+                        open_callouts.append(marker)
+
+            # Add page breaks before major sections (## headings)
+            if (
+                line.startswith("## ")
+                and section_breaks
+                and i > 0
+                and processed_lines
+                and processed_lines[-1].strip() != PAGE_BREAK_DIV
+            ):
+                processed_lines.append(PAGE_BREAK_DIV)
+                processed_lines.append("")
+
+            processed_lines.append(line)
+
+        if open_callouts:
+            processed_lines[-1] += "</div>" * len(open_callouts)
+
+        if images_changed:
+            self.log("📝 Image paths were modified in the content")
+        else:
+            self.log("📝 No image paths were found or modified")
+        if section_breaks:
             self.log("📄 Applied section page breaks (Mode 1: Sections)")
         else:
             self.log("📄 Continuous layout mode (Mode 2: No section breaks)")
 
-        return content
+        return "\n".join(processed_lines)
 
-    def fix_image_paths(self, content: str, input_file: Path) -> str:
-        """Fix relative image paths to be absolute paths for PDF generation."""
+    def image_source_path(self, image_path: str, input_file: Path) -> Path:
+        """Return where an image referenced from a markdown file lives on disk."""
+        if image_path.startswith("/"):
+            # Project-relative path (starts with / but relative to project root)
+            return Path.cwd() / image_path.lstrip("/")
+        # Relative path from current file
+        return input_file.parent / image_path
 
-        def replace_image_path(match):
-            alt_text = match.group(1)
-            image_path = match.group(2)
-            title = match.group(3) if match.group(3) else ""
+    def rewrite_image(self, match: "re.Match", input_file: Path) -> str:
+        """
+        Return an IMAGE_PATTERN match with its path as an absolute file:// URL.
 
-            self.log(f"🖼️  Processing image: {image_path}")
+        Web URLs, file:// URLs and images that cannot be found are left as
+        they are.
+        """
+        alt_text = match.group(1)
+        image_path = match.group(2)
+        title = match.group(3) if match.group(3) else ""
 
-            # Skip if already HTTP/HTTPS URL or file:// URL
-            if image_path.startswith(("http://", "https://", "file://")):
-                self.log(f"📌 Skipping (web/file URL): {image_path}")
-                return match.group(0)
+        self.log(f"🖼️  Processing image: {image_path}")
 
-            # Calculate absolute path relative to the input file
-            input_dir = input_file.parent
+        # Skip if already HTTP/HTTPS URL or file:// URL
+        if image_path.startswith(("http://", "https://", "file://")):
+            self.log(f"📌 Skipping (web/file URL): {image_path}")
+            return match.group(0)
 
-            # Handle different relative path formats
-            if image_path.startswith("/"):
-                # Project-relative path (starts with / but relative to project root)
-                absolute_path = Path.cwd() / image_path.lstrip("/")
-                self.log(f"📁 Project root path: {absolute_path}")
-            else:
-                # Relative path from current file
-                absolute_path = input_dir / image_path
-                self.log(f"📁 Relative path: {absolute_path}")
+        absolute_path = self.image_source_path(image_path, input_file)
+        self.log(f"📁 Image path: {absolute_path}")
 
-            # Resolve to get canonical path
-            try:
-                resolved_path = absolute_path.resolve()
-                self.log(f"🔍 Resolved to: {resolved_path}")
-                if resolved_path.exists():
-                    # Convert to file:// URL for WeasyPrint
-                    file_url = resolved_path.as_uri()
-                    self.log(f"🔗 File URL: {file_url}")
-                    if title:
-                        result = f"![{alt_text}]({file_url} {title})"
-                    else:
-                        result = f"![{alt_text}]({file_url})"
-                    self.log(f"✅ Image path converted: {result}")
-                    return result
+        # Resolve to get canonical path
+        try:
+            resolved_path = absolute_path.resolve()
+            self.log(f"🔍 Resolved to: {resolved_path}")
+            if resolved_path.exists():
+                # Convert to file:// URL for WeasyPrint
+                file_url = resolved_path.as_uri()
+                self.log(f"🔗 File URL: {file_url}")
+                if title:
+                    result = f"![{alt_text}]({file_url} {title})"
                 else:
-                    self.log(f"⚠️  Image not found: {absolute_path}")
-                    return match.group(0)  # Return original if not found
-            except Exception as e:
-                self.log(f"⚠️  Error resolving image path {image_path}: {e}")
-                return match.group(0)  # Return original on error
-
-        # Pattern to match markdown images: ![alt](path "title")
-        pattern = r'!\[([^\]]*)\]\(([^)\s]+)(?:\s+"([^"]*)")?\)'
-        original_content = content
-        processed_content = re.sub(pattern, replace_image_path, content)
-
-        if original_content != processed_content:
-            self.log("📝 Image paths were modified in the content")
-        else:
-            self.log("📝 No image paths were found or modified")
-
-        return processed_content
+                    result = f"![{alt_text}]({file_url})"
+                self.log(f"✅ Image path converted: {result}")
+                return result
+            else:
+                self.log(f"⚠️  Image not found: {absolute_path}")
+                return match.group(0)  # Return original if not found
+        except Exception as e:
+            self.log(f"⚠️  Error resolving image path {image_path}: {e}")
+            return match.group(0)  # Return original on error
 
-    def convert_markdown_to_html(self, markdown_content: str, input_file: Path) -> str:
-        """Convert markdown content to HTML with GitHub-style formatting."""
+    def convert_markdown_to_html(
+        self, markdown_content: str, input_file: Path, inline_css: bool = True
+    ) -> str:
+        """
+        Convert markdown content to HTML with GitHub-style formatting.
+
+        Args:
+            markdown_content: Markdown source
+            input_file: File the markdown came from (for image paths)
+            inline_css: Include the stylesheet in a <style> block. PDF
+                conversion passes the cached stylesheet to WeasyPrint
+                instead, so the CSS is not parsed again for every file.
+        """
         # Preprocess the markdown (now includes image path fixing)
         processed_content = self.preprocess_markdown(markdown_content, input_file)
+        return self.render_html(processed_content, inline_css)
 
-        # Setup markdown parser
-        md_parser = self.setup_markdown_parser()
+    def render_html(self, processed_content: str, inline_css: bool = True) -> str:
+        """Convert preprocessed markdown to a complete HTML document."""
+        # Reuse the warm markdown parser
+        md_parser = self.get_markdown_parser()
 
         # Convert to HTML
         html_content = md_parser.convert(processed_content)
 
+        style = f"<style>{self.get_github_css()}</style>" if inline_css else ""
+
         # Wrap in full HTML document
         full_html = f"""
         <!DOCTYPE html>
@@ -540,9 +917,7 @@ class MarkdownToPdfConverter:
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Converted Document</title>
-            <style>
-                {self.get_github_css()}
-            </style>
+            {style}
         </head>
         <body>
             {html_content}
@@ -552,37 +927,154 @@ class MarkdownToPdfConverter:
 
         return full_html
 
+    def render_pdf(self, input_file: Path, output_file: Path) -> None:
+        """
+        Run every stage of converting one markdown file to a PDF.
+
+        Raises:
+            Exception: Whatever the failing stage raised
+        """
+        # Read markdown content
+        with self.stage("read"):
+            with open(input_file, "r", encoding="utf-8") as f:
+                markdown_content = f.read()
+
+        # Image paths, callouts and page breaks
+        with self.stage("preprocess"):
+            processed_content = self.preprocess_markdown(markdown_content, input_file)
+
+        # Convert to HTML; the stylesheet is supplied to WeasyPrint below,
+        # already parsed
+        with self.stage("markdown"):
+            html_content = self.render_html(processed_content, inline_css=False)
+
+        # Create output directory if it doesn't exist
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # Lay out the pages, then write them, using WeasyPrint
+        with self.stage("layout"):
+            document = HTML(string=html_content).render(
+                stylesheets=[self.get_stylesheet()]
+            )
+        with self.stage("write"):
+            document.write_pdf(str(output_file))
+
     def convert_file_to_pdf(self, input_file: Path, output_file: Path) -> bool:
         """Convert a single markdown file to PDF."""
+        # A missing dependency stops the run rather than failing every file
+        load_markdown()
+        load_weasyprint()
+        started = time.perf_counter()
+        if self.profiler:
+            # One-off set-up is not charged to the first file's stages
+            self.get_markdown_parser()
+            self.get_stylesheet()
+            self.profiler.begin_file(input_file, output_file)
         try:
             mode_desc = (
                 "sections" if self.page_break_mode == "sections" else "continuous"
             )
             self.log(f"Converting {input_file.name} to PDF " f"(mode: {mode_desc})...")
 
-            # Read markdown content
-            with open(input_file, "r", encoding="utf-8") as f:
-                markdown_content = f.read()
-
-            # Convert to HTML (now includes image path fixing)
-            html_content = self.convert_markdown_to_html(markdown_content, input_file)
-
-            # Create output directory if it doesn't exist
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Convert HTML to PDF using WeasyPrint
-            html_doc = HTML(string=html_content)
-            html_doc.write_pdf(
-                str(output_file), stylesheets=[CSS(string=self.get_github_css())]
-            )
+            self.render_pdf(input_file, output_file)
 
             self.log(f"✅ Successfully converted {input_file.name}")
             self.converted_count += 1
-            return True
+            self.timings.append((input_file, time.perf_counter() - started))
+            success = True
 
         except Exception as e:
             print(f"❌ Failed to convert {input_file}: {e}")
-            return False
+            self.failures.append((input_file, str(e)))
+            success = False
+
+        if self.profiler:
+            self.profiler.end_file(success)
+        return success
+
+    def build_key(self, input_file: Path) -> Optional[str]:
+        """
+        Hash everything that affects a file's PDF.
+
+        Covers the markdown source, every local image it references, the
+        stylesheet, the page break mode and the converter and library
+        versions.
+
+        Returns:
+            Hex digest, or None if the source cannot be read (the file is
+            then always converted, and the error reported by the conversion)
+        """
+        try:
+            source = input_file.read_bytes()
+            content = source.decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        digest = hashlib.sha256(source)
+        for match in IMAGE_PATTERN.finditer(content):
+            image_path = match.group(2)
+            if image_path.startswith(("http://", "https://", "file://")):
+                continue
+            image_file = self.image_source_path(image_path, input_file)
+            digest.update(image_path.encode("utf-8"))
+            try:
+                digest.update(hashlib.sha256(image_file.read_bytes()).digest())
+            except OSError:
+                # A missing image changes the key again once it appears
+                digest.update(b"<missing>")
+
+        digest.update(self.get_github_css().encode("utf-8"))
+        options = {
+            "page_break_mode": self.page_break_mode,
+            "converter": CONVERTER_VERSION,
+            "markdown": package_version("markdown"),
+            "weasyprint": package_version("weasyprint"),
+        }
+        digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def convert_files(
+        self, conversions: List[Tuple[Path, Path]], output_dir: Path, jobs: int = 1
+    ) -> None:
+        """
+        Convert (input, output) pairs, skipping PDFs that are up to date.
+
+        Args:
+            conversions: Markdown files and the PDF paths to write
+            output_dir: Directory whose build manifest is used
+            jobs: Worker processes (1 = convert here, 0 = one per CPU)
+        """
+        manifest = BuildManifest(output_dir)
+        keys = {}
+        pending = []
+        for md_file, output_path in conversions:
+            key = self.build_key(md_file)
+            if not self.force and manifest.is_current(output_path, key):
+                self.skipped_count += 1
+                self.log(f"⏭️  Up to date: {output_path.name}")
+                continue
+            keys[output_path] = key
+            pending.append((md_file, output_path))
+
+        if pending:
+            # Fail before starting any work (or workers) if a package is missing
+            load_markdown()
+            load_weasyprint()
+
+        jobs = jobs or os.cpu_count() or 1
+        try:
+            if jobs == 1 or len(pending) < 2:
+                for md_file, output_path in pending:
+                    if self.convert_file_to_pdf(md_file, output_path):
+                        manifest.record(output_path, keys[output_path])
+            else:
+                for output_path in self.convert_in_parallel(
+                    pending, min(jobs, len(pending))
+                ):
+                    manifest.record(output_path, keys[output_path])
+        finally:
+            # Keep what was built even if the batch is interrupted
+            manifest.save()
 
     def find_markdown_files(self, directory: Path) -> List[Path]:
         """Find all markdown files in a directory and its subdirectories."""
@@ -599,8 +1091,17 @@ class MarkdownToPdfConverter:
 
         return sorted(markdown_files)
 
-    def convert_all_in_directory(self, input_dir: Path, output_dir: Path) -> None:
-        """Convert all markdown files in a directory to PDF."""
+    def convert_all_in_directory(
+        self, input_dir: Path, output_dir: Path, jobs: int = 1
+    ) -> None:
+        """
+        Convert all markdown files in a directory to PDF.
+
+        Args:
+            input_dir: Directory to search for .md files
+            output_dir: Directory for the PDFs (sub-folders are kept)
+            jobs: Worker processes (1 = convert here, 0 = one per CPU)
+        """
         markdown_files = self.find_markdown_files(input_dir)
 
         if not markdown_files:
@@ -609,14 +1110,64 @@ class MarkdownToPdfConverter:
 
         print(f"📄 Found {len(markdown_files)} markdown files to convert")
 
+        conversions = []
         for md_file in markdown_files:
             # Calculate relative path to maintain directory structure
             relative_path = md_file.relative_to(input_dir)
 
             # Create output path with .pdf extension
             output_path = output_dir / relative_path.with_suffix(".pdf")
+            conversions.append((md_file, output_path))
+
+        self.convert_files(conversions, output_dir, jobs)
+
+    def convert_in_parallel(
+        self, conversions: List[Tuple[Path, Path]], jobs: int
+    ) -> List[Path]:
+        """
+        Convert files across a pool of worker processes.
 
-            self.convert_file_to_pdf(md_file, output_path)
+        WeasyPrint layout is CPU-bound, so separate processes (each with its
+        own converter) use all cores. Results are collected here, so
+        converted_count, timings and failures cover every worker, and one
+        failed file never stops the rest of the batch.
+
+        Returns:
+            Output paths of the PDFs that were written
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        written = []
+        print(f"⚙️  Converting with {jobs} worker processes")
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(self.verbose, self.page_break_mode),
+        ) as pool:
+            futures = {
+                pool.submit(_convert_in_worker, md_file, output_path): (
+                    md_file,
+                    output_path,
+                )
+                for md_file, output_path in conversions
+            }
+            for future in as_completed(futures):
+                md_file, output_path = futures[future]
+                try:
+                    success, seconds, error = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. out of memory)
+                    success, seconds, error = False, 0.0, f"worker failed: {e}"
+                    print(f"❌ Failed to convert {md_file}: {error}")
+
+                if success:
+                    self.converted_count += 1
+                    self.timings.append((md_file, seconds))
+                    written.append(output_path)
+                    print(f"✅ {md_file.name} ({seconds:.2f} s)")
+                else:
+                    self.failures.append((md_file, error))
+        return written
 
     def convert_single_file(self, input_file: Path, output_dir: Path) -> None:
         """Convert a single markdown file to PDF."""
@@ -631,7 +1182,358 @@ class MarkdownToPdfConverter:
         # Create output filename
         output_file = output_dir / input_file.with_suffix(".pdf").name
 
-        self.convert_file_to_pdf(input_file, output_file)
+        self.convert_files([(input_file, output_file)], output_dir)
+
+    def print_summary(self) -> None:
+        """Print rebuilt/skipped counts, per-file timings and any failures."""
+        print(
+            f"🔁 Rebuilt: {self.converted_count}, "
+            f"up to date (skipped): {self.skipped_count}"
+        )
+        if len(self.timings) == 1:
+            print(f"⏱️  Conversion time: {self.timings[0][1]:.2f} s")
+        elif self.timings:
+            total = sum(seconds for _, seconds in self.timings)
+            print(f"⏱️  Time per file (sum {total:.2f} s):")
+            for input_file, seconds in sorted(
+                self.timings, key=lambda item: item[1], reverse=True
+            ):
+                print(f"   {seconds:>7.2f} s  {input_file.name}")
+
+        if self.failures:
+            print(f"❌ Files failed: {len(self.failures)}")
+            for input_file, error in self.failures:
+                print(f"   {input_file}: {error}")
+
+
+class SourceWatcher:
+    """
+    Re-renders PDFs while their markdown sources and images are edited.
+
+    The source directory and every local image its markdown files reference
+    are polled with os.stat, which needs no extra packages and costs little
+    for a directory of lessons. A burst of saves (editors often write a file
+    several times) is collected until nothing has changed for `debounce`
+    seconds, then only the affected PDFs are rebuilt on the same warm
+    converter.
+    """
+
+    def __init__(
+        self,
+        converter: MarkdownToPdfConverter,
+        input_dir: Path,
+        output_dir: Path,
+        interval: float = 0.5,
+        debounce: float = 0.3,
+    ):
+        self.converter = converter
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.interval = interval
+        self.debounce = debounce
+        self.images: Dict[Path, Set[Path]] = {}  # markdown file -> its images
+
+    def scan_images(self, md_file: Path) -> Set[Path]:
+        """Return the local image files a markdown file references."""
+        try:
+            content = md_file.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return set()
+        images = set()
+        for match in IMAGE_PATTERN.finditer(content):
+            image_path = match.group(2)
+            if not image_path.startswith(("http://", "https://", "file://")):
+                images.add(self.converter.image_source_path(image_path, md_file))
+        return images
+
+    def snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        """Modification time and size of every watched file."""
+        state = {}
+        watched = set(self.converter.find_markdown_files(self.input_dir))
+        for md_file in watched:
+            if md_file not in self.images:
+                self.images[md_file] = self.scan_images(md_file)
+        for md_file in list(self.images):
+            if md_file not in watched:
+                del self.images[md_file]  # deleted or renamed
+        for images in self.images.values():
+            watched |= images
+        for path in watched:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # missing image: noticed when it appears
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def affected(self, changed: Set[Path]) -> List[Path]:
+        """Markdown files to rebuild for a set of changed paths."""
+        for md_file in changed:
+            if md_file in self.images:
+                self.images[md_file] = self.scan_images(md_file)
+        return sorted(
+            md_file
+            for md_file, images in self.images.items()
+            if md_file in changed or images & changed
+        )
+
+    def wait_for_changes(
+        self, state: Dict[Path, Tuple[int, int]]
+    ) -> Tuple[Dict[Path, Tuple[int, int]], Set[Path]]:
+        """
+        Poll until something changes, then until it has been quiet.
+
+        Returns:
+            The new snapshot and every path that changed in the burst
+        """
+        while True:
+            time.sleep(self.interval)
+            current = self.snapshot()
+            if current != state:
+                break
+
+        changed = set()
+        while current != state:
+            changed |= {
+                path
+                for path in state.keys() | current.keys()
+                if state.get(path) != current.get(path)
+            }
+            state = current
+            time.sleep(self.debounce)
+            current = self.snapshot()
+        return current, changed
+
+    def render(self, md_files: List[Path], saved_at: float) -> None:
+        """Rebuild the PDFs for md_files and report how long it took."""
+        started = time.perf_counter()
+        timings_before = len(self.converter.timings)
+        failures_before = len(self.converter.failures)
+        conversions = [
+            (
+                md_file,
+                self.output_dir
+                / md_file.relative_to(self.input_dir).with_suffix(".pdf"),
+            )
+            for md_file in md_files
+        ]
+        self.converter.convert_files(conversions, self.output_dir)
+
+        rendered = self.converter.timings[timings_before:]
+        failed = self.converter.failures[failures_before:]
+        if not rendered and not failed:
+            print("⏭️  Contents unchanged - PDFs already up to date")
+            return
+        for md_file, seconds in rendered:
+            print(f"🔄 {md_file.name} rendered in {seconds:.2f} s")
+        for md_file, _ in failed:
+            print(f"❌ {md_file.name} not rendered (see the error above)")
+        latency = time.time() - saved_at
+        print(
+            f"⏱️  Render latency: {time.perf_counter() - started:.2f} s "
+            f"({latency:.2f} s after the last save)"
+        )
+
+    def run(self) -> None:
+        """Build everything once, then watch until interrupted."""
+        self.converter.convert_all_in_directory(self.input_dir, self.output_dir)
+        state = self.snapshot()
+        print(
+            f"👀 Watching {self.input_dir} ({len(self.images)} markdown files, "
+            f"{len(state) - len(self.images)} images) - press Ctrl+C to stop"
+        )
+        try:
+            while True:
+                state, changed = self.wait_for_changes(state)
+                md_files = self.affected(changed)
+                if not md_files:
+                    continue
+                names = ", ".join(path.name for path in sorted(changed))
+                print(f"\n✏️  Changed: {names}")
+                saved_at = max(
+                    (state[path][0] / 1e9 for path in changed if path in state),
+                    default=time.time(),
+                )
+                self.render(md_files, saved_at)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+
+# Converter used by each worker process in convert_in_parallel()
+_worker_converter: Optional[MarkdownToPdfConverter] = None
+
+
+def _init_worker(verbose: bool, page_break_mode: str) -> None:
+    """Build one converter per worker process."""
+    global _worker_converter
+    _worker_converter = MarkdownToPdfConverter(
+        verbose=verbose, page_break_mode=page_break_mode
+    )
+
+
+def _convert_in_worker(input_file: Path, output_file: Path) -> Tuple[bool, float, str]:
+    """Convert one file in a worker; returns (success, seconds, error)."""
+    started = time.perf_counter()
+    failures_before = len(_worker_converter.failures)
+    success = _worker_converter.convert_file_to_pdf(input_file, output_file)
+    error = ""
+    if len(_worker_converter.failures) > failures_before:
+        error = _worker_converter.failures[-1][1]
+    return success, time.perf_counter() - started, error
+
+
+# Packages that must never be imported just to start the CLI
+HEAVY_PACKAGES = ("markdown", "pygments", "weasyprint")
+
+
+def parse_importtime(report: str) -> List[Tuple[str, int, float]]:
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        (module, nesting depth, cumulative ms) for every import
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(cumulative) / 1000))
+    return imports
+
+
+def measure_startup(runs: int = 5, top: int = 8) -> Dict:
+    """
+    Measure how long the CLI takes to start, and what it imports.
+
+    Runs `md_to_pdf.py --help` in fresh interpreters, then compares
+    `import md_to_pdf` with and without loading the conversion packages.
+
+    Returns:
+        Dictionary with help_ms (median wall time), help_imports_ms,
+        slowest_imports, heavy_at_startup (HEAVY_PACKAGES imported by
+        --help), dependencies_ms and dependency_imports
+    """
+    # Imported here so they do not add to the start-up being measured
+    import statistics
+    import subprocess
+
+    script = str(Path(__file__).resolve())
+
+    def run(arguments: List[str]) -> "subprocess.CompletedProcess":
+        return subprocess.run(
+            [sys.executable, *arguments], capture_output=True, text=True
+        )
+
+    wall = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run([script, "--help"])
+        wall.append((time.perf_counter() - started) * 1000)
+
+    help_imports = parse_importtime(run(["-X", "importtime", script, "--help"]).stderr)
+    top_level = [(name, ms) for name, depth, ms in help_imports if depth == 0]
+
+    setup = f"import sys; sys.path.insert(0, {str(Path(script).parent)!r}); "
+    setup += "import md_to_pdf"
+    load = (
+        "\nfor load in (md_to_pdf.load_markdown, md_to_pdf.load_weasyprint):"
+        "\n    try:\n        load()\n    except md_to_pdf.DependencyError:"
+        "\n        pass"
+    )
+    module_only = parse_importtime(run(["-X", "importtime", "-c", setup]).stderr)
+    loaded = parse_importtime(run(["-X", "importtime", "-c", setup + load]).stderr)
+    already = {name for name, _, _ in module_only}
+    dependencies = [
+        (name, ms) for name, depth, ms in loaded if depth == 0 and name not in already
+    ]
+
+    return {
+        "help_ms": statistics.median(wall),
+        "help_imports_ms": sum(ms for _, ms in top_level),
+        "slowest_imports": sorted(top_level, key=lambda item: -item[1])[:top],
+        "heavy_at_startup": sorted(
+            {
+                name.split(".")[0]
+                for name, _, _ in help_imports
+                if name.split(".")[0] in HEAVY_PACKAGES
+            }
+        ),
+        "dependencies_ms": sum(ms for _, ms in dependencies),
+        "dependency_imports": sorted(dependencies, key=lambda item: -item[1])[:top],
+    }
+
+
+def print_startup_report(result: Dict, budget_ms: float = 0) -> bool:
+    """
+    Print measure_startup() results.
+
+    Returns:
+        True if startup imports no HEAVY_PACKAGES and fits the budget
+        (0 = no time budget)
+    """
+    print(
+        f"⏱️  Startup (--help): {result['help_ms']:.1f} ms median, "
+        f"of which imports {result['help_imports_ms']:.1f} ms"
+    )
+    for name, ms in result["slowest_imports"]:
+        print(f"   {ms:>8.1f} ms  {name}")
+    print(
+        "📦 Loaded only when converting: "
+        f"{result['dependencies_ms']:.1f} ms of imports"
+    )
+    for name, ms in result["dependency_imports"]:
+        print(f"   {ms:>8.1f} ms  {name}")
+
+    passed = True
+    if result["heavy_at_startup"]:
+        print(f"❌ Imported at startup: {', '.join(result['heavy_at_startup'])}")
+        passed = False
+    else:
+        print("✅ No conversion packages imported at startup")
+    if budget_ms and result["help_ms"] > budget_ms:
+        print(f"❌ Startup exceeds the {budget_ms:.0f} ms budget")
+        passed = False
+    return passed
+
+
+def write_profile(
+    converter: MarkdownToPdfConverter, path: Path, dumps: int = 0
+) -> None:
+    """
+    Print the --profile table, save the JSON report and any cProfile dumps.
+
+    The dumps come from converting each of the `dumps` slowest files again
+    under cProfile, so the profiler's overhead is kept out of the stage
+    timings. They are written next to the report as <report>.<file>.prof.
+    """
+    import cProfile
+
+    profiler = converter.profiler
+    profiler.print_table()
+
+    dump_files = []
+    converter.profiler = None  # keep the re-runs out of the stage timings
+    try:
+        for record in profiler.slowest(dumps):
+            dump_file = path.with_name(f"{path.stem}.{Path(record['file']).stem}.prof")
+            profile = cProfile.Profile()
+            profile.runcall(
+                converter.render_pdf, Path(record["file"]), Path(record["output"])
+            )
+            profile.dump_stats(str(dump_file))
+            dump_files.append(str(dump_file))
+    finally:
+        converter.profiler = profiler
+
+    report = profiler.report(
+        page_break_mode=converter.page_break_mode, cprofile_dumps=dump_files
+    )
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\n✓ Profile written to {path}")
+    for dump_file in dump_files:
+        print(f"✓ cProfile dump: {dump_file}")
 
 
 def main():
@@ -647,6 +1549,7 @@ Examples:
   %(prog)s --file docs/setup-guide.md --verbose    # Verbose output
   %(prog)s --file README.md --page-break-mode sections     # Mode 1 (default)
   %(prog)s --file README.md --page-break-mode continuous   # Mode 2
+  %(prog)s --all --watch            # Re-render lessons as they are edited
 
 Page Break Modes:
   Mode 1 (sections): Each ## heading starts a new page - good for exercises
@@ -673,6 +1576,19 @@ educational content styling.
         type=str,
         help="Convert all markdown files in a specific directory",
     )
+    input_group.add_argument(
+        "--measure-css",
+        action="store_true",
+        help="Measure the per-file time saved by the stylesheet cache",
+    )
+    input_group.add_argument(
+        "--startup-benchmark",
+        action="store_true",
+        help=(
+            "Measure CLI start-up and its imports (-X importtime); fails if "
+            "conversion packages load at startup or --startup-budget is exceeded"
+        ),
+    )
 
     # Output options
     parser.add_argument(
@@ -688,6 +1604,71 @@ educational content styling.
     # Utility options
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every PDF, even those the build manifest says are up to date",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for --all / --directory (default: 1, 0 = one per CPU)",
+    )
+
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=0,
+        help="Maximum --help start-up time in ms for --startup-benchmark (0 = none)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="md_to_pdf_profile.json",
+        metavar="JSON",
+        help=(
+            "Record wall/CPU time and peak memory per stage for every file and "
+            "save them as JSON (default: md_to_pdf_profile.json)"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile-dumps",
+        type=int,
+        default=0,
+        metavar="N",
+        help="With --profile: save cProfile dumps for the N slowest files",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "With --all / --directory: keep running and re-render PDFs "
+            "whenever their markdown or images change"
+        ),
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between checks for changes in --watch mode (default: 0.5)",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help=(
+            "Seconds without further changes before re-rendering in --watch "
+            "mode (default: 0.3)"
+        ),
+    )
+
     parser.add_argument(
         "--page-break-mode",
         type=str,
@@ -700,12 +1681,28 @@ educational content styling.
     )
 
     args = parser.parse_args()
+    if args.watch and not (args.all or args.directory):
+        parser.error("--watch needs --all or --directory")
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 (one per CPU) or more")
+
+    if args.startup_benchmark:
+        if not print_startup_report(measure_startup(), args.startup_budget):
+            sys.exit(1)
+        return
 
     # Initialize converter with page break mode
     converter = MarkdownToPdfConverter(
-        verbose=args.verbose, page_break_mode=args.page_break_mode
+        verbose=args.verbose, page_break_mode=args.page_break_mode, force=args.force
     )
 
+    if args.profile:
+        converter.profiler = ConversionProfiler()
+        if args.jobs != 1:
+            # Stage timings are only meaningful in this process, one at a time
+            print("ℹ️  --profile converts one file at a time (ignoring --jobs)")
+            args.jobs = 1
+
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -728,6 +1725,27 @@ educational content styling.
     print()
 
     # Process based on arguments
+    if args.measure_css:
+        result = converter.measure_stylesheet_cache()
+        print(f"🎨 Stylesheet parse: {result['parse_ms']:.2f} ms")
+        print(f"🎨 Cached lookup:    {result['cached_ms']:.4f} ms")
+        print(
+            f"⚡ Saved per file:   {result['saved_per_file_ms']:.2f} ms "
+            "(previously parsed twice per file)"
+        )
+        return
+
+    if args.watch:
+        input_dir = Path(args.directory) if args.directory else DEFAULT_SOURCE_DIR
+        SourceWatcher(
+            converter, input_dir, output_dir, args.interval, args.debounce
+        ).run()
+        if args.profile:
+            write_profile(converter, Path(args.profile), args.profile_dumps)
+            converter.profiler.close()
+        converter.print_summary()
+        return
+
     if args.all:
         # Convert markdown lessons directory
         directories_to_search = [DEFAULT_SOURCE_DIR]
@@ -735,7 +1753,7 @@ educational content styling.
         for directory in directories_to_search:
             if directory.exists():
                 print(f"🔍 Searching {directory}...")
-                converter.convert_all_in_directory(directory, output_dir)
+                converter.convert_all_in_directory(directory, output_dir, args.jobs)
                 print()
             else:
                 print(f"ℹ️  Skipping missing directory: {directory}")
@@ -750,11 +1768,16 @@ educational content styling.
 
     elif args.directory:
         input_dir = Path(args.directory)
-        converter.convert_all_in_directory(input_dir, output_dir)
+        converter.convert_all_in_directory(input_dir, output_dir, args.jobs)
+
+    if args.profile:
+        write_profile(converter, Path(args.profile), args.profile_dumps)
+        converter.profiler.close()
 
     # Summary
     print("✅ Conversion complete!")
     print(f"📊 Files converted: {converter.converted_count}")
+    converter.print_summary()
     print(f"📁 Output location: {output_dir.absolute()}")
 
     if converter.converted_count > 0:
@@ -765,4 +1788,8 @@ educational content styling.
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except DependencyError as e:
+        print(e)
+        sys.exit(EXIT_MISSING_DEPENDENCY)
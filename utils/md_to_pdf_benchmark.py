@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+MD to PDF Benchmark - Synthetic Corpus and Timing Harness
+
+The ten lesson files are too few and too small to show how the converter
+scales. This tool generates markdown documents of increasing size and
+feature density, then times the two halves of the pipeline separately:
+
+    convert_markdown_to_html   markdown -> HTML (preprocessing, parsing,
+                               syntax highlighting)
+    convert_file_to_pdf        the whole file -> PDF conversion, including
+                               WeasyPrint layout and writing
+
+Each document is converted in both page break modes (sections and
+continuous). Documents are built from a fixed random seed, so the same
+options always produce the same corpus.
+
+Densities (features per ## section, on average):
+
+    prose    mostly paragraphs, the odd code block
+    mixed    about what the lessons contain
+    dense    several code blocks, a table, an image and a callout each
+
+HTML timings are reported twice: the first conversion of a document, with
+the highlighting caches emptied beforehand (so no document benefits from
+one converted before it, though Pygments' modules stay imported), and the
+median of the repeats after it. PDF timings are the median of the repeats.
+
+Results are saved as JSON; --history appends one line per run to a .jsonl
+file and --compare prints the change against an earlier JSON file.
+
+Usage:
+    python utils/md_to_pdf_benchmark.py
+    python utils/md_to_pdf_benchmark.py --sections 10 40 160 --densities mixed dense
+    python utils/md_to_pdf_benchmark.py --html-only --compare md_to_pdf_benchmark.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import md_to_pdf
+import md_to_pdf_highlight
+
+# Expected number of each feature per section
+DENSITIES = {
+    "prose": {
+        "paragraphs": 4,
+        "code": 0.3,
+        "tables": 0.1,
+        "images": 0.05,
+        "callouts": 0.1,
+    },
+    "mixed": {
+        "paragraphs": 2,
+        "code": 1.5,
+        "tables": 0.4,
+        "images": 0.2,
+        "callouts": 0.3,
+    },
+    "dense": {"paragraphs": 1, "code": 4, "tables": 1, "images": 1, "callouts": 1},
+}
+
+DEFAULT_SECTIONS = [10, 40, 160]
+
+PAGE_BREAK_MODES = ["sections", "continuous"]
+
+WORDS = (
+    "database query table column row index join select filter planet "
+    "character vehicle species height affiliation result order group count "
+    "average rebel empire galaxy jedi pilot starship value key schema"
+).split()
+
+SPECIES = ["Human", "Droid", "Wookiee", "Twi'lek", "Rodian", "Hutt"]
+
+
+# ============================================
+# Corpus Generation
+# ============================================
+
+
+def write_png(path: Path, width: int = 320, height: int = 160) -> None:
+    """Write a small greyscale gradient PNG (standard library only)."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    rows = b"".join(
+        b"\x00" + bytes((x * 255 // width) for x in range(width)) for _ in range(height)
+    )
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _count(rng: random.Random, expected: float) -> int:
+    """Whole number of features averaging `expected`."""
+    whole = int(expected)
+    return whole + (1 if rng.random() < expected - whole else 0)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(8, 18))
+    return " ".join(words).capitalize() + "."
+
+
+def _code_block(rng: random.Random, number: int) -> str:
+    """A code block; random values keep every block different."""
+    kind = rng.choices(["sql", "python", ""], weights=[6, 2, 1])[0]
+    if kind == "sql":
+        body = (
+            f"SELECT c.name, c.height, p.name AS homeworld\n"
+            f"FROM characters c\n"
+            f"LEFT JOIN planets p ON c.planet_id = p.id\n"
+            f"WHERE c.species = '{rng.choice(SPECIES)}'\n"
+            f"  AND c.height > {rng.randint(50, 250)}\n"
+            f"ORDER BY c.height DESC\n"
+            f"LIMIT {rng.randint(1, 50)};"
+        )
+    elif kind == "python":
+        body = (
+            f"def query_{number}(conn):\n"
+            f'    """Characters taller than {rng.randint(50, 250)} cm."""\n'
+            f"    cursor = conn.execute(\n"
+            f'        "SELECT name FROM characters WHERE height > ?",\n'
+            f"        ({rng.randint(50, 250)},),\n"
+            f"    )\n"
+            f"    return [row[0] for row in cursor.fetchall()]"
+        )
+    else:
+        body = "\n".join(
+            f"{rng.choice(SPECIES):<10} {rng.randint(50, 250):>5}" for _ in range(5)
+        )
+    return f"```{kind}\n{body}\n```"
+
+
+def _table(rng: random.Random) -> str:
+    rows = [
+        f"| {rng.choice(WORDS).title()} {n} | {rng.choice(SPECIES)} "
+        f"| {rng.randint(50, 250)} |"
+        for n in range(rng.randint(4, 12))
+    ]
+    return "\n".join(
+        ["| Name | Species | Height |", "|------|---------|--------|", *rows]
+    )
+
+
+def generate_document(sections: int, density: str, seed: int = 0) -> str:
+    """
+    Build one synthetic markdown document.
+
+    Args:
+        sections: Number of ## sections
+        density: Key of DENSITIES
+        seed: Random seed (the same arguments give the same document)
+    """
+    rng = random.Random(f"{sections}-{density}-{seed}")
+    features = DENSITIES[density]
+    parts = [f"# Benchmark: {sections} sections ({density})", _sentence(rng)]
+    code_number = 0
+
+    for section in range(1, sections + 1):
+        parts.append(f"## Section {section}: {rng.choice(WORDS).title()}")
+        for _ in range(max(1, _count(rng, features["paragraphs"]))):
+            parts.append(" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))))
+        for _ in range(_count(rng, features["code"])):
+            code_number += 1
+            parts.append(_code_block(rng, code_number))
+        for _ in range(_count(rng, features["tables"])):
+            parts.append(_table(rng))
+        for _ in range(_count(rng, features["images"])):
+            parts.append(
+                f'![Diagram {section}](images/diagram.png "Section {section}")'
+            )
+        for _ in range(_count(rng, features["callouts"])):
+            kind = rng.choice(["Note", "Warning", "Important"])
+            parts.append(f"> **{kind}:** {_sentence(rng)}\n> {_sentence(rng)}")
+
+    return "\n\n".join(parts) + "\n"
+
+
+def build_corpus(
+    directory: Path, sections: List[int], densities: List[str]
+) -> List[Path]:
+    """
+    Write the benchmark documents (and the image they use) to a directory.
+
+    Returns:
+        Markdown files, smallest first
+    """
+    (directory / "images").mkdir(parents=True, exist_ok=True)
+    write_png(directory / "images" / "diagram.png")
+    files = []
+    for count in sections:
+        for density in densities:
+            path = directory / f"bench_{count:04d}_{density}.md"
+            path.write_text(generate_document(count, density), encoding="utf-8")
+            files.append(path)
+    return files
+
+
+# ============================================
+# Timing
+# ============================================
+
+
+def time_document(
+    converter: md_to_pdf.MarkdownToPdfConverter,
+    md_file: Path,
+    output_dir: Path,
+    repeat: int,
+    pdf: bool,
+) -> Dict:
+    """
+    Time one document in the converter's page break mode.
+
+    Returns:
+        Dictionary of results for the report table
+    """
+    content = md_file.read_text(encoding="utf-8")
+    result = {
+        "document": md_file.stem,
+        "mode": converter.page_break_mode,
+        "bytes": len(content.encode("utf-8")),
+        "code_blocks": sum(1 for line in content.splitlines() if line.startswith("```"))
+        // 2,
+    }
+
+    # Cold start: nothing highlighted by an earlier document or mode
+    md_to_pdf_highlight.CachedCodeHilite.clear_caches()
+    started = time.perf_counter()
+    converter.convert_markdown_to_html(content, md_file)
+    result["html_first_ms"] = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        converter.convert_markdown_to_html(content, md_file)
+        samples.append((time.perf_counter() - started) * 1000)
+    result["html_ms"] = statistics.median(samples)
+
+    result["pdf_ms"] = None
+    if pdf:
+        output_file = output_dir / f"{md_file.stem}_{converter.page_break_mode}.pdf"
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            if not converter.convert_file_to_pdf(md_file, output_file):
+                break
+            samples.append((time.perf_counter() - started) * 1000)
+        else:
+            result["pdf_ms"] = statistics.median(samples)
+    return result
+
+
+def run_benchmark(
+    files: List[Path], output_dir: Path, repeat: int, pdf: bool
+) -> List[Dict]:
+    """Time every document in both page break modes."""
+    # Import the Pygments lexer modules once; later documents would not pay
+    # for that, so neither should the first document timed
+    md_to_pdf.MarkdownToPdfConverter().convert_markdown_to_html(
+        files[-1].read_text(encoding="utf-8"), files[-1]
+    )
+
+    results = []
+    for mode in PAGE_BREAK_MODES:
+        converter = md_to_pdf.MarkdownToPdfConverter(page_break_mode=mode)
+        converter.get_markdown_parser()  # built once per converter, not per file
+        for md_file in files:
+            result = time_document(converter, md_file, output_dir, repeat, pdf)
+            results.append(result)
+            pdf_text = f"{result['pdf_ms']:.0f} ms" if result["pdf_ms"] else "-"
+            print(
+                f"✓ {md_file.stem} ({mode}): HTML {result['html_ms']:.1f} ms, "
+                f"PDF {pdf_text}"
+            )
+    return results
+
+
+# ============================================
+# Reporting
+# ============================================
+
+
+def print_results(results: List[Dict], previous: Optional[Dict] = None) -> None:
+    """Print a results table; with `previous`, also the ratio to that run."""
+    earlier = {}
+    if previous:
+        earlier = {(r["document"], r["mode"]): r for r in previous["results"]}
+
+    def ratio(result: Dict, column: str) -> str:
+        before = earlier.get((result["document"], result["mode"]), {}).get(column)
+        if not before or result[column] is None:
+            return ""
+        return f"x{result[column] / before:.2f}"
+
+    print(
+        f"\n{'Document':<22} {'Mode':<11} {'KiB':>7} {'Code':>5} "
+        f"{'HTML 1st ms':>12} {'HTML ms':>9} {'PDF ms':>9}"
+        + (f" {'HTML vs':>8} {'PDF vs':>8}" if previous else "")
+    )
+    for r in results:
+        pdf_ms = f"{r['pdf_ms']:>9.0f}" if r["pdf_ms"] is not None else f"{'-':>9}"
+        print(
+            f"{r['document']:<22} {r['mode']:<11} {r['bytes'] / 1024:>7.1f} "
+            f"{r['code_blocks']:>5} {r['html_first_ms']:>12.1f} {r['html_ms']:>9.1f} "
+            f"{pdf_ms}"
+            + (f" {ratio(r, 'html_ms'):>8} {ratio(r, 'pdf_ms'):>8}" if previous else "")
+        )
+
+
+def summary(results: List[Dict], **details) -> Dict:
+    """Results plus what is needed to compare runs over time."""
+    return {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "converter_version": md_to_pdf.CONVERTER_VERSION,
+        "markdown": md_to_pdf.package_version("markdown"),
+        "pygments": md_to_pdf.package_version("pygments"),
+        "weasyprint": md_to_pdf.package_version("weasyprint"),
+        **details,
+        "results": results,
+    }
+
+
+def main():
+    """Handle command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Markdown to PDF pipeline on a synthetic corpus"
+    )
+    parser.add_argument(
+        "--sections",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SECTIONS,
+        help=f"Document sizes in ## sections (default: {DEFAULT_SECTIONS})",
+    )
+    parser.add_argument(
+        "--densities",
+        nargs="+",
+        choices=list(DENSITIES),
+        default=list(DENSITIES),
+        help="Feature densities to generate (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs each")
+    parser.add_argument(
+        "--html-only",
+        action="store_true",
+        help="Only time convert_markdown_to_html (no WeasyPrint needed)",
+    )
+    parser.add_argument(
+        "--corpus-dir", help="Keep the generated corpus and PDFs in this directory"
+    )
+    parser.add_argument(
+        "--output", default="md_to_pdf_benchmark.json", help="Results JSON file"
+    )
+    parser.add_argument("--history", help="Append the results to this .jsonl file")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    previous = None
+    if args.compare:
+        try:
+            previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"✗ Cannot read {args.compare}: {e}")
+            sys.exit(1)
+
+    pdf = not args.html_only
+    try:
+        md_to_pdf.load_markdown()
+        if pdf:
+            md_to_pdf.load_weasyprint()
+    except md_to_pdf.DependencyError as e:
+        print(e)
+        if pdf:
+            print("ℹ️  Use --html-only to time markdown to HTML without WeasyPrint")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="md_to_pdf_bench_") as scratch:
+        directory = Path(args.corpus_dir) if args.corpus_dir else Path(scratch)
+        files = build_corpus(directory, args.sections, args.densities)
+        print(f"📄 Generated {len(files)} documents in {directory}")
+        results = run_benchmark(files, directory / "pdf", args.repeat, pdf)
+
+    print_results(results, previous)
+
+    report = summary(results, repeat=args.repeat, html_only=args.html_only)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    if args.history:
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
+    print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+MD to PDF Daemon - Warm Converter Behind a Unix Socket
+
+Every run of md_to_pdf.py imports WeasyPrint and markdown, discovers fonts
+and parses the stylesheet before it converts anything. For one file that
+start-up is most of the time.
+
+This tool keeps a MarkdownToPdfConverter loaded in a background process
+and takes conversion jobs over a local Unix socket:
+
+    serve     start the daemon (imports and warms the converter once)
+    convert   thin client: send files to the daemon, print the results
+    status    show the daemon's pid, uptime and jobs done
+    stop      shut the daemon down
+
+The client only uses the standard library, so it starts in milliseconds.
+Jobs run one at a time in the daemon, in the client's working directory,
+and use the build manifest like md_to_pdf.py does (--force rebuilds).
+
+Protocol: one JSON object per line in each direction, e.g.
+
+    {"command": "convert", "file": "lesson1.md", "cwd": "/repo", ...}
+    {"ok": true, "status": "converted", "output": "/repo/...pdf", ...}
+
+Usage:
+    python utils/md_to_pdf_daemon.py serve &
+    python utils/md_to_pdf_daemon.py convert other_formats/markdown_lessons/lesson1_instructions.md
+    python utils/md_to_pdf_daemon.py stop
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List
+
+if TYPE_CHECKING:
+    from md_to_pdf import MarkdownToPdfConverter
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / f"md_to_pdf-{os.getuid()}.sock"
+
+# Markdown used to warm the converter when the daemon starts
+WARM_UP_MARKDOWN = """# Warm up
+
+Loads the markdown extensions, **fonts** and `code` styles.
+
+```sql
+SELECT name FROM characters;
+```
+"""
+
+
+# ============================================
+# Client
+# ============================================
+
+
+def send_requests(socket_path: Path, requests: List[dict]) -> Iterator[dict]:
+    """
+    Send requests to the daemon over one connection, yielding each reply.
+
+    Raises:
+        ConnectionError: If no daemon is listening on socket_path
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            client.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ConnectionError(f"no daemon listening on {socket_path}") from e
+        with client.makefile("rw", encoding="utf-8") as stream:
+            for request in requests:
+                stream.write(json.dumps(request) + "\n")
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError("daemon closed the connection")
+                yield json.loads(line)
+    finally:
+        client.close()
+
+
+def daemon_running(socket_path: Path) -> bool:
+    """True if a daemon answers on socket_path."""
+    try:
+        list(send_requests(socket_path, [{"command": "status"}]))
+        return True
+    except (ConnectionError, OSError, ValueError):
+        return False
+
+
+# ============================================
+# Daemon
+# ============================================
+
+
+@contextlib.contextmanager
+def working_directory(path: str) -> Iterator[None]:
+    """Run a job in the client's directory (image paths are relative to it)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Reads JSON requests from one client connection and answers each."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                reply = self.server.answer(request)
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if reply.get("stopping"):
+                # shutdown() waits for serve_forever(), so call it elsewhere
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class ConversionDaemon(socketserver.UnixStreamServer):
+    """Unix socket server that runs conversion jobs on warm converters."""
+
+    def __init__(self, socket_path: Path, verbose: bool = False):
+        self.socket_path = socket_path
+        self.verbose = verbose
+        self.started = time.time()
+        self.jobs = 0
+        self.converters: Dict[str, "MarkdownToPdfConverter"] = {}
+
+        # Only the daemon loads the converter; warm_up() imports its packages
+        import md_to_pdf
+
+        self.md_to_pdf = md_to_pdf
+        super().__init__(str(socket_path), _JobHandler)
+        os.chmod(socket_path, 0o600)  # only this user may submit jobs
+
+    def converter(self, page_break_mode: str) -> "MarkdownToPdfConverter":
+        """Return the warm converter for a page break mode."""
+        converter = self.converters.get(page_break_mode)
+        if converter is None:
+            converter = self.md_to_pdf.MarkdownToPdfConverter(
+                verbose=self.verbose, page_break_mode=page_break_mode
+            )
+            self.converters[page_break_mode] = converter
+        return converter
+
+    def warm_up(self, page_break_mode: str = "sections") -> float:
+        """
+        Load everything the first real job would otherwise wait for.
+
+        Imports markdown and WeasyPrint, builds the markdown parser, parses
+        the stylesheet and lays out a small page, which makes WeasyPrint
+        discover fonts.
+
+        Raises:
+            md_to_pdf.DependencyError: If a package is missing
+
+        Returns:
+            Seconds taken
+        """
+        started = time.perf_counter()
+        self.md_to_pdf.load_markdown()
+        self.md_to_pdf.load_weasyprint()
+        converter = self.converter(page_break_mode)
+        html = converter.convert_markdown_to_html(
+            WARM_UP_MARKDOWN, Path("warm_up.md"), inline_css=False
+        )
+        self.md_to_pdf.HTML(string=html).write_pdf(
+            stylesheets=[converter.get_stylesheet()]
+        )
+        return time.perf_counter() - started
+
+    def answer(self, request: dict) -> dict:
+        """Answer one request from a client."""
+        command = request.get("command")
+        if command == "convert":
+            return self.convert(request)
+        if command == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "jobs": self.jobs,
+            }
+        if command == "stop":
+            return {"ok": True, "stopping": True}
+        return {"ok": False, "error": f"unknown command: {command!r}"}
+
+    def convert(self, request: dict) -> dict:
+        """
+        Convert one markdown file, as md_to_pdf.py --file would.
+
+        Request fields: file, cwd, output_dir, page_break_mode, force.
+        """
+        started = time.perf_counter()
+        page_break_mode = request.get("page_break_mode", "sections")
+        converter = self.converter(page_break_mode)
+        converter.force = bool(request.get("force"))
+
+        with working_directory(request.get("cwd") or os.getcwd()):
+            input_file = Path(request["file"])
+            if not input_file.exists():
+                fallback_file = self.md_to_pdf.DEFAULT_SOURCE_DIR / request["file"]
+                if fallback_file.exists():
+                    input_file = fallback_file
+            if not input_file.exists() or input_file.suffix.lower() != ".md":
+                return {"ok": False, "error": f"not a markdown file: {input_file}"}
+
+            output_dir = Path(
+                request.get("output_dir") or self.md_to_pdf.DEFAULT_OUTPUT_DIR
+            ).absolute()
+            output_file = output_dir / input_file.with_suffix(".pdf").name
+            converted = converter.converted_count
+            failures = len(converter.failures)
+
+            converter.convert_single_file(input_file.absolute(), output_dir)
+
+        self.jobs += 1
+        seconds = time.perf_counter() - started
+        if len(converter.failures) > failures:
+            status = "failed"
+        elif converter.converted_count > converted:
+            status = "converted"
+        else:
+            status = "up to date"
+        print(f"📨 {input_file.name}: {status} ({seconds:.2f} s)")
+        return {
+            "ok": status != "failed",
+            "status": status,
+            "output": str(output_file),
+            "seconds": round(seconds, 3),
+            "error": converter.failures[-1][1] if status == "failed" else None,
+        }
+
+
+def serve(socket_path: Path, verbose: bool = False) -> None:
+    """Run the daemon until it is stopped (stop command, Ctrl+C or SIGTERM)."""
+    if daemon_running(socket_path):
+        print(f"❌ A daemon is already listening on {socket_path}")
+        sys.exit(1)
+    if socket_path.exists():
+        socket_path.unlink()  # left behind by a daemon that did not exit cleanly
+
+    server = ConversionDaemon(socket_path, verbose=verbose)
+    try:
+        warm_seconds = server.warm_up()
+    except server.md_to_pdf.DependencyError as e:
+        server.server_close()
+        socket_path.unlink()
+        print(e)
+        sys.exit(1)
+    print(f"🔥 Converter ready in {warm_seconds:.2f} s (imports and warm-up)")
+    print(f"🔌 Listening on {socket_path} (pid {os.getpid()})")
+
+    # Let SIGTERM unwind through the finally below, like Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        print(f"👋 Daemon stopped after {server.jobs} jobs")
+
+
+# ============================================
+# Command Line
+# ============================================
+
+
+def main():
+    """Handle command line arguments for the daemon and its client."""
+    parser = argparse.ArgumentParser(
+        description="Keep the Markdown to PDF converter warm in a daemon"
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=DEFAULT_SOCKET,
+        help=f"Unix socket path (default: {DEFAULT_SOCKET})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Start the daemon")
+    serve_parser.add_argument(
+        "--verbose", action="store_true", help="Verbose converter output"
+    )
+
+    convert_parser = commands.add_parser("convert", help="Convert files")
+    convert_parser.add_argument("files", nargs="+", help="Markdown files")
+    convert_parser.add_argument(
+        "--output-dir", help="Output directory (default: other_formats/pdf_lessons)"
+    )
+    convert_parser.add_argument(
+        "--page-break-mode",
+        choices=["sections", "continuous"],
+        default="sections",
+        help="Page break mode (default: sections)",
+    )
+    convert_parser.add_argument(
+        "--force", action="store_true", help="Rebuild even if up to date"
+    )
+
+    commands.add_parser("status", help="Show whether the daemon is running")
+    commands.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.verbose)
+        return
+
+    if args.command == "convert":
+        output_dir = os.path.abspath(args.output_dir) if args.output_dir else None
+        requests = [
+            {
+                "command": "convert",
+                "file": file,
+                "cwd": os.getcwd(),
+                "output_dir": output_dir,
+                "page_break_mode": args.page_break_mode,
+                "force": args.force,
+            }
+            for file in args.files
+        ]
+    else:
+        requests = [{"command": args.command}]
+
+    failed = False
+    try:
+        for request, reply in zip(requests, send_requests(args.socket, requests)):
+            if args.command == "convert":
+                name = Path(request["file"]).name
+                if reply["ok"]:
+                    icon = "✅" if reply["status"] == "converted" else "⏭️ "
+                    print(f"{icon} {name}: {reply['status']} ({reply['seconds']} s)")
+                else:
+                    print(f"❌ {name}: {reply['error']}")
+            elif args.command == "status":
+                print(
+                    f"✓ Daemon running: pid {reply['pid']}, up {reply['uptime_s']} s, "
+                    f"{reply['jobs']} jobs"
+                )
+            else:
+                print("✓ Daemon stopping")
+            failed = failed or not reply["ok"]
+    except ConnectionError as e:
+        print(f"✗ {e}")
+        print(f"   Start it with: python {sys.argv[0]} serve &")
+        sys.exit(1)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cached Syntax Highlighting for md_to_pdf.py
+
+Stock CodeHilite looks up a lexer and builds a new HtmlFormatter (which
+generates its whole style table) for every code block, and runs language
+detection on every block without a language tag. CachedCodeHilite keeps
+lexers, formatters and highlighted output between blocks and documents.
+
+md_to_pdf.py imports this module (and with it markdown and Pygments) only
+when it first converts markdown, then calls install().
+"""
+
+import hashlib
+from typing import Dict, Tuple
+
+from markdown.extensions import codehilite, fenced_code
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
+
+# Highlighted code blocks kept in memory before the cache is emptied
+HIGHLIGHT_CACHE_SIZE = 4096
+
+
+class CachedCodeHilite(codehilite.CodeHilite):
+    """
+    CodeHilite that reuses Pygments objects and highlighted output.
+
+    It keeps:
+
+        - one lexer per language and one formatter per set of options
+        - the HTML for every block it has highlighted, keyed by a hash of
+          the code and its options, so an unchanged block costs a lookup
+
+    The HTML produced is identical to CodeHilite's.
+    """
+
+    _lexers: Dict[Tuple[str, str], object] = {}
+    _formatters: Dict[str, "HtmlFormatter"] = {}
+    _highlighted: Dict[str, str] = {}
+
+    @classmethod
+    def lexer(cls, language: str, options: dict):
+        """Return the cached lexer for a language (ClassNotFound if unknown)."""
+        key = (language.lower(), repr(sorted(options.items())))
+        lexer = cls._lexers.get(key)
+        if lexer is None:
+            lexer = get_lexer_by_name(language, **options)
+            cls._lexers[key] = lexer
+        return lexer
+
+    @classmethod
+    def formatter(cls, options: dict) -> "HtmlFormatter":
+        """Return the cached HTML formatter for a set of options."""
+        key = repr(sorted(options.items()))
+        formatter = cls._formatters.get(key)
+        if formatter is None:
+            formatter = HtmlFormatter(**options)
+            cls._formatters[key] = formatter
+        return formatter
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """Forget every cached lexer, formatter and highlighted block."""
+        cls._lexers.clear()
+        cls._formatters.clear()
+        cls._highlighted.clear()
+
+    def hilite(self, shebang: bool = True) -> str:
+        """Return highlighted HTML for the block, from the cache if possible."""
+        settings = (
+            self.lang,
+            shebang,
+            self.guess_lang,
+            self.use_pygments,
+            self.lang_prefix,
+            self.pygments_formatter,
+            sorted(self.options.items()),
+        )
+        key = hashlib.sha256(
+            f"{settings!r}\0{self.src}".encode("utf-8", "surrogatepass")
+        ).hexdigest()
+        html = self._highlighted.get(key)
+        if html is None:
+            html = self._highlight(shebang)
+            if len(self._highlighted) >= HIGHLIGHT_CACHE_SIZE:
+                self._highlighted.clear()
+            self._highlighted[key] = html
+        return html
+
+    def _highlight(self, shebang: bool) -> str:
+        # Fast path: a tagged block highlighted with Pygments' HTML formatter
+        if self.lang and self.use_pygments and self.pygments_formatter == "html":
+            try:
+                lexer = self.lexer(self.lang, self.options)
+            except ClassNotFound:
+                pass  # unknown tag: let CodeHilite fall back as usual
+            else:
+                source = self.src.strip("\n")
+                return highlight(source, lexer, self.formatter(self.options))
+        # Untagged blocks need language detection: its result is cached above
+        return super().hilite(shebang)
+
+
+def install() -> None:
+    """Highlight fenced and indented code blocks with CachedCodeHilite."""
+    codehilite.CodeHilite = CachedCodeHilite
+    fenced_code.CodeHilite = CachedCodeHilite
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Parallel SQL Solution Runner - Isolated Database Clones
+
+Runs the solutions/*.sql scripts statement by statement, the way they are
+run in the editor, but WITHOUT touching database/starwars.db. Each script
+gets its own in-memory clone of the base database (made with SQLite's
+backup API), so scripts that ALTER, INSERT, UPDATE or DELETE (lessons 5
+and 7) cannot affect each other or the real file.
+
+Scripts run in parallel across worker processes. For every statement the
+runner reports how long it took and how many rows it returned (SELECT /
+PRAGMA) or changed (INSERT / UPDATE / DELETE).
+
+Because later lessons build on earlier ones (lesson 3 adds the height
+column, lesson 5 adds planets), --cumulative prepares each clone by first
+running all earlier scripts in the list (untimed).
+
+Usage:
+    python utils/sql_runner.py
+    python utils/sql_runner.py --cumulative --jobs 4
+    python utils/sql_runner.py --script solutions/lesson6_joins.sql --verbose
+    python utils/sql_runner.py --base database/starwars.db --json results.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_BASE_DB = Path("database/starwars.db")
+SOLUTIONS_DIR = Path("solutions")
+
+# Lesson order matters: lesson5_schema must run before lesson5_data
+DEFAULT_SCRIPTS = [
+    SOLUTIONS_DIR / name
+    for name in [
+        "lesson1_setup.sql",
+        "lesson2_queries.sql",
+        "lesson3_sorting.sql",
+        "lesson4_aggregates.sql",
+        "lesson5_schema.sql",
+        "lesson5_data.sql",
+        "lesson6_joins.sql",
+        "lesson7_modifications.sql",
+        "lesson8_advanced.sql",
+    ]
+]
+
+
+def split_statements(script: str) -> List[str]:
+    """
+    Split a SQL script into individual statements.
+
+    Lines are gathered until sqlite3.complete_statement() says the buffer
+    ends a full statement, so semicolons inside strings, CASE ... END blocks
+    and trailing comments are handled the same way SQLite handles them.
+    Comment-only text at the end of the script is dropped.
+
+    Args:
+        script: Contents of a .sql file
+
+    Returns:
+        List of statements, each still including its leading comments
+    """
+    statements = []
+    buffer: List[str] = []
+
+    for line in script.splitlines(keepends=True):
+        buffer.append(line)
+        text = "".join(buffer)
+        if sqlite3.complete_statement(text):
+            statements.append(text.strip())
+            buffer = []
+
+    return statements
+
+
+def statement_summary(statement: str, width: int = 60) -> str:
+    """Return the first non-comment line of a statement, shortened for display."""
+    for line in statement.splitlines():
+        line = line.strip()
+        if line and not line.startswith("--"):
+            return line if len(line) <= width else line[: width - 3] + "..."
+    return statement[:width]
+
+
+def clone_database(base_path: Optional[Path]) -> sqlite3.Connection:
+    """
+    Make a private in-memory copy of the base database.
+
+    Args:
+        base_path: Database file to copy, or None for an empty database
+
+    Returns:
+        Connection to the clone (autocommit, so scripts control transactions)
+    """
+    clone = sqlite3.connect(":memory:", isolation_level=None)
+    if base_path is not None:
+        source = sqlite3.connect(f"file:{base_path}?mode=ro", uri=True)
+        try:
+            source.backup(clone)
+        finally:
+            source.close()
+    return clone
+
+
+def execute_statement(conn: sqlite3.Connection, statement: str) -> dict:
+    """
+    Run one statement and measure it.
+
+    Returns:
+        Dictionary with the statement summary, time, row count and any error
+    """
+    result = {"statement": statement_summary(statement), "rows": 0, "error": None}
+    started = time.perf_counter()
+    try:
+        cursor = conn.execute(statement)
+        if cursor.description is not None:
+            result["rows"] = len(cursor.fetchall())
+        else:
+            result["rows"] = max(cursor.rowcount, 0)
+    except sqlite3.Error as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_script(script_path: str, base_path: Optional[str], prepare: List[str]) -> dict:
+    """
+    Run one script on its own clone (executed inside a worker process).
+
+    Args:
+        script_path: Script to run and time
+        base_path: Base database to clone (None for an empty database)
+        prepare: Scripts to run first, untimed, to build up the clone
+
+    Returns:
+        Dictionary with the script name, per-statement results and totals
+    """
+    started = time.perf_counter()
+    conn = clone_database(Path(base_path) if base_path else None)
+    clone_seconds = time.perf_counter() - started
+
+    try:
+        for path in prepare:
+            for statement in split_statements(Path(path).read_text(encoding="utf-8")):
+                execute_statement(conn, statement)
+            if conn.in_transaction:
+                conn.rollback()
+
+        script = Path(script_path).read_text(encoding="utf-8")
+        statements = [execute_statement(conn, s) for s in split_statements(script)]
+        if conn.in_transaction:
+            conn.rollback()
+    finally:
+        conn.close()
+
+    return {
+        "script": script_path,
+        "clone_seconds": clone_seconds,
+        "statements": statements,
+        "total_seconds": sum(s["seconds"] for s in statements),
+        "errors": sum(1 for s in statements if s["error"]),
+    }
+
+
+def run_scripts(
+    scripts: List[Path],
+    base_path: Optional[Path],
+    jobs: int = 0,
+    cumulative: bool = False,
+) -> List[dict]:
+    """
+    Run several scripts in parallel, each on its own clone.
+
+    Args:
+        scripts: Scripts to run, in lesson order
+        base_path: Base database to clone (None for an empty database)
+        jobs: Worker processes (0 = one per CPU)
+        cumulative: Prepare each clone with all earlier scripts first
+
+    Returns:
+        One result dictionary per script, in the order given
+    """
+    jobs = jobs or os.cpu_count() or 1
+    base = str(base_path) if base_path else None
+    prepares = [
+        [str(p) for p in scripts[:i]] if cumulative else [] for i in range(len(scripts))
+    ]
+
+    if jobs == 1:
+        return [run_script(str(s), base, p) for s, p in zip(scripts, prepares)]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(scripts))) as pool:
+        futures = [
+            pool.submit(run_script, str(s), base, p) for s, p in zip(scripts, prepares)
+        ]
+        return [future.result() for future in futures]
+
+
+def print_report(results: List[dict], verbose: bool = False) -> None:
+    """Print a per-script summary, and every statement when verbose."""
+    for result in results:
+        name = Path(result["script"]).name
+        print(
+            f"📄 {name}: {len(result['statements'])} statements, "
+            f"{result['total_seconds'] * 1000:.2f} ms, "
+            f"{result['errors']} errors "
+            f"(clone {result['clone_seconds'] * 1000:.2f} ms)"
+        )
+        for number, statement in enumerate(result["statements"], start=1):
+            if not (verbose or statement["error"]):
+                continue
+            status = f"✗ {statement['error']}" if statement["error"] else "✓"
+            print(
+                f"   {number:3d}. {statement['seconds'] * 1000:8.3f} ms "
+                f"{statement['rows']:6d} rows  {status}  {statement['statement']}"
+            )
+
+
+def main():
+    """Handle command line arguments and run the scripts."""
+    parser = argparse.ArgumentParser(
+        description="Run SQL solution scripts in parallel on isolated database clones"
+    )
+    parser.add_argument(
+        "--script",
+        action="append",
+        help="Script to run (repeatable; default: lesson1_setup to lesson8_advanced)",
+    )
+    parser.add_argument(
+        "--base",
+        type=str,
+        default=str(DEFAULT_BASE_DB),
+        help=f"Base database to clone (default: {DEFAULT_BASE_DB.as_posix()})",
+    )
+    parser.add_argument(
+        "--empty-base",
+        action="store_true",
+        help="Start every clone from an empty database instead of --base",
+    )
+    parser.add_argument(
+        "--cumulative",
+        action="store_true",
+        help="Prepare each clone by running all earlier scripts first",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=0, help="Worker processes (default: one per CPU)"
+    )
+    parser.add_argument("--json", type=str, help="Also write results to a JSON file")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show every statement, not just errors"
+    )
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 (one per CPU) or more")
+
+    scripts = [Path(s) for s in args.script] if args.script else DEFAULT_SCRIPTS
+    missing = [s for s in scripts if not s.exists()]
+    if missing:
+        print(f"❌ Script not found: {', '.join(str(s) for s in missing)}")
+        sys.exit(1)
+
+    base_path = None if args.empty_base else Path(args.base)
+    if base_path is not None and not base_path.exists():
+        print(f"❌ Base database does not exist: {base_path}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    results = run_scripts(scripts, base_path, args.jobs, args.cumulative)
+    elapsed = time.perf_counter() - started
+
+    print_report(results, args.verbose)
+    print(f"\n✅ Ran {len(results)} scripts in {elapsed:.2f} s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()